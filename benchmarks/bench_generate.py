@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""Time each stage of TBGenerator.generate() on synthetic DUTs.
+
+Usage:
+    python benchmarks/bench_generate.py [--ports 10 1000 10000] [--repeat 3]
+        [--output results.json] [--compare baseline.json [--threshold 1.2]]
+
+Every case generates a full testbench from a DUT made by ``synth.py`` (ANSI
+and non-ANSI headers, parameterized widths with heavy comments, and a file
+with many modules). The fastest of ``--repeat`` runs is reported, split
+into parse, context analysis, rendering per template, writing and the
+remainder (manifest and hashing). Templates are streamed to disk, so time
+spent producing chunks counts as rendering and the rest of the streaming
+write as writing. Peak Python memory is measured in a
+separate run under tracemalloc.
+
+``--output`` writes the results as JSON. ``--compare`` prints the ratio of
+each stage to an earlier results file; with ``--threshold`` the script
+exits non-zero if any case's total got slower by more than that factor.
+"""
+import argparse
+from collections import defaultdict
+import contextlib
+import datetime
+import gc
+import itertools
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synth import TOP, make_dut  # noqa: E402
+from uvm_tbgen import generator  # noqa: E402
+from uvm_tbgen.generator import TBGenerator, precompile_templates  # noqa: E402
+
+# name -> synth.make_dut keyword arguments
+CASES = {
+    "ansi": dict(ansi=True),
+    "non-ansi": dict(ansi=False),
+    "params-comments": dict(ansi=True, params=True, comments=True),
+    "many-modules": dict(ansi=True, params=True, modules=500),
+}
+
+
+class TimedGenerator(TBGenerator):
+    """TBGenerator that records the time spent in each stage."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.times = defaultdict(float)
+        self.render = {}
+
+    def _parse_dut(self, dut_src, digest=None):
+        start = time.perf_counter()
+        try:
+            return super()._parse_dut(dut_src, digest)
+        finally:
+            self.times["parse"] += time.perf_counter() - start
+
+    def _build_context(self, dut_src, digest=None):
+        parsed = self.times["parse"]
+        start = time.perf_counter()
+        try:
+            return super()._build_context(dut_src, digest)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.times["context"] += elapsed - (self.times["parse"] - parsed)
+
+    def _write_component(self, env, template_file, path, context):
+        self.render[template_file] = 0.0
+        self.current = template_file
+        return super()._write_component(env, template_file, path, context)
+
+    def timed_chunks(self, chunks):
+        """Yield from ``chunks``, adding the time spent producing them to the render time."""
+        it = iter(chunks)
+        while True:
+            start = time.perf_counter()
+            batch = list(itertools.islice(it, 4096))
+            self.render[self.current] += time.perf_counter() - start
+            if not batch:
+                return
+            yield from batch
+
+
+@contextlib.contextmanager
+def timed_writes(gen):
+    """Split generator.write_stream_if_changed into render and write time."""
+    original = generator.write_stream_if_changed
+
+    def write(path, chunks):
+        rendered = gen.render[gen.current]
+        start = time.perf_counter()
+        try:
+            return original(path, gen.timed_chunks(chunks))
+        finally:
+            elapsed = time.perf_counter() - start
+            gen.times["write"] += elapsed - (gen.render[gen.current] - rendered)
+
+    generator.write_stream_if_changed = write
+    try:
+        yield
+    finally:
+        generator.write_stream_if_changed = original
+
+
+def generate_once(dut: Path, outdir: Path) -> dict:
+    gen = TimedGenerator(
+        str(dut), str(outdir), "bench_tb", verbose=False, force=True,
+        top_module=TOP, parse_cache=False,
+    )
+    start = time.perf_counter()
+    with timed_writes(gen):
+        gen.generate()
+    total = time.perf_counter() - start
+    stages = {name: gen.times[name] for name in ("parse", "context")}
+    stages["render"] = sum(gen.render.values())
+    stages["write"] = gen.times["write"]
+    stages["other"] = total - sum(stages.values())
+    stages["total"] = total
+    return {"stages": stages, "render": gen.render}
+
+
+def peak_memory(dut: Path, outdir: Path) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        generate_once(dut, outdir)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_case(name: str, ports: int, repeat: int, workdir: Path) -> dict:
+    text = make_dut(ports, **CASES[name])
+    dut = workdir / f"{name}_{ports}.sv"
+    dut.write_text(text)
+    best = None
+    for i in range(repeat):
+        # A fresh directory each time so every file is really written
+        run = generate_once(dut, workdir / f"out_{name}_{ports}_{i}")
+        if best is None or run["stages"]["total"] < best["stages"]["total"]:
+            best = run
+    best["peak_bytes"] = peak_memory(dut, workdir / f"out_{name}_{ports}_mem")
+    return {"case": f"{name}-{ports}", "ports": ports, "dut_bytes": len(text), **best}
+
+
+def git_commit() -> str:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=Path(__file__).resolve().parent, timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return ""
+    return result.stdout.strip()
+
+
+def compare(results: list, baseline_path: str, threshold: float) -> bool:
+    """Print stage ratios against a baseline; return False if a case regressed."""
+    baseline = {r["case"]: r for r in json.loads(Path(baseline_path).read_text())["results"]}
+    ok = True
+    print(f"\ncompared to {baseline_path} (new / old)")
+    print(f"{'case':<24}{'parse':>8}{'context':>9}{'render':>8}{'write':>8}{'total':>8}")
+    for r in results:
+        old = baseline.get(r["case"])
+        if old is None:
+            continue
+        ratios = [
+            r["stages"][s] / old["stages"][s] if old["stages"][s] > 0 else float("nan")
+            for s in ("parse", "context", "render", "write", "total")
+        ]
+        flag = ""
+        if threshold and ratios[-1] > threshold:
+            ok = False
+            flag = "  REGRESSION"
+        widths = (8, 9, 8, 8, 8)
+        print(f"{r['case']:<24}" + "".join(f"{x:>{w}.2f}" for x, w in zip(ratios, widths)) + flag)
+    return ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ports", type=int, nargs="+", default=[10, 1000, 10000])
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.0,
+                        help="With --compare, fail if a total grew by more than this factor")
+    args = parser.parse_args()
+
+    # Template compilation is a one-off cost, so keep it out of the numbers
+    precompile_templates()
+
+    results = []
+    print(f"{'case':<24}{'parse':>8}{'context':>9}{'render':>8}{'write':>8}"
+          f"{'total':>8}{'peak MB':>9}")
+    with tempfile.TemporaryDirectory(prefix="bench_generate-") as tmp:
+        for ports in args.ports:
+            for name in args.cases:
+                r = run_case(name, ports, args.repeat, Path(tmp))
+                s = r["stages"]
+                print(f"{r['case']:<24}{s['parse']:>8.3f}{s['context']:>9.3f}"
+                      f"{s['render']:>8.3f}{s['write']:>8.3f}{s['total']:>8.3f}"
+                      f"{r['peak_bytes'] / 1e6:>9.1f}")
+                results.append(r)
+
+    if args.output:
+        data = {
+            "commit": git_commit(),
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "results": results,
+        }
+        Path(args.output).write_text(json.dumps(data, indent=2) + "\n")
+        print(f"\nresults written to {args.output}")
+    if args.compare and not compare(results, args.compare, args.threshold):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Show that the module header parser scales linearly with port count.
+
+Usage:
+    python benchmarks/bench_parser.py [--max-ports 64000] [--repeat 3]
+
+For each size the best-of-N parse time is printed together with the time per
+port; for a linear parser the last column stays roughly flat as the port
+count doubles.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from uvm_tbgen.verilog import parse_module  # noqa: E402
+
+
+def make_dut(num_ports: int, ansi: bool = True) -> str:
+    """Return a module with ``num_ports`` ports followed by a second module."""
+    dirs = ("input", "output", "inout")
+    if ansi:
+        items = [
+            f"  {dirs[i % 3]} wire [{i % 32}:0] p{i}  // port {i}" for i in range(num_ports)
+        ]
+        header = "module wide (\n" + ",\n".join(items) + "\n);\n"
+        body = ""
+    else:
+        header = "module wide (" + ", ".join(f"p{i}" for i in range(num_ports)) + ");\n"
+        body = "".join(f"  {dirs[i % 3]} [{i % 32}:0] p{i};\n" for i in range(num_ports))
+    return header + body + "endmodule\n\nmodule later(input stray);\nendmodule\n"
+
+
+def best_time(text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse_module(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-ports", type=int, default=64000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'style':<9}{'ports':>8}{'seconds':>12}{'us/port':>10}")
+    for ansi in (True, False):
+        n = 1000
+        while n <= args.max_ports:
+            text = make_dut(n, ansi)
+            elapsed = best_time(text, args.repeat)
+            style = "ansi" if ansi else "non-ansi"
+            print(f"{style:<9}{n:>8}{elapsed:>12.4f}{elapsed / n * 1e6:>10.2f}")
+            n *= 2
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
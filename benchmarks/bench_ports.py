@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Compare the memory footprint of the port models.
+
+Usage:
+    python benchmarks/bench_ports.py [--ports 10000 50000 100000]
+
+"list model" is the previous representation: a list of Port tuples, three
+direction-filtered copies and a list of dicts for the interface template.
+"table model" is a PortTable with its three lazy direction views.
+"""
+import argparse
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from uvm_tbgen.ports import Port, PortTable  # noqa: E402
+
+DIRECTIONS = ("input", "output", "inout")
+
+
+def port_stream(n: int):
+    for i in range(n):
+        width = (i % 64) + 1
+        yield f"sig_{i}", DIRECTIONS[i % 3], width, f"{width - 1}:0" if width > 1 else ""
+
+
+def list_model(n: int):
+    ports = [Port(*p) for p in port_stream(n)]
+    inputs = [p for p in ports if p.direction == "input"]
+    outputs = [p for p in ports if p.direction == "output"]
+    inouts = [p for p in ports if p.direction == "inout"]
+    for_if = [
+        {"name": p.name, "dir": p.direction, "width": f"[{p.width - 1}:0]" if p.width > 1 else ""}
+        for p in ports
+    ]
+    return ports, inputs, outputs, inouts, for_if
+
+
+def table_model(n: int):
+    table = PortTable()
+    for p in port_stream(n):
+        table.append(*p)
+    return table, table.inputs, table.outputs, table.inouts
+
+
+def measure(build, n: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    model = build(n)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del model
+    return current
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ports", type=int, nargs="+", default=[10000, 50000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'ports':>8}{'list model':>14}{'table model':>14}{'ratio':>8}")
+    for n in args.ports:
+        before = measure(list_model, n)
+        after = measure(table_model, n)
+        print(f"{n:>8}{before / 1e6:>12.2f}MB{after / 1e6:>12.2f}MB{before / after:>8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
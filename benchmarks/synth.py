@@ -0,0 +1,79 @@
+"""Synthetic Verilog DUTs for the benchmarks.
+
+:func:`make_dut` writes one file holding ``modules - 1`` filler modules
+followed by the module under test, ``bench_top``. Ports cycle through the
+three directions and include the reset/valid/ready/data names the
+assertion analysis looks for. Widths are either literal ranges or
+parameterized ones (``[DATA_W-1:0]``, ``[$clog2(DEPTH)-1:0]``), and
+``comments`` adds line and block comments around every port.
+"""
+from typing import List
+
+DIRECTIONS = ("input", "output", "inout")
+TOP = "bench_top"
+_ROLES = ("data", "en", "addr", "valid", "ready", "wr", "rd", "status")
+
+
+def _port(i: int, params: bool) -> tuple:
+    """Return (direction, range text, name) of port ``i``."""
+    direction = DIRECTIONS[i % 3]
+    name = f"{_ROLES[i % len(_ROLES)]}_{i}"
+    if params:
+        rng = ("DATA_W-1:0", "$clog2(DEPTH)-1:0", "ADDR_W-1:0", "")[i % 4]
+    else:
+        width = (i % 32) + 1
+        rng = f"{width - 1}:0" if width > 1 else ""
+    return direction, rng, name
+
+
+def _comment(i: int) -> str:
+    if i % 2:
+        return f"  /* port {i}: synthetic signal,\n     spanning two lines */\n"
+    return f"  // port {i}: synthetic signal with a trailing, comment ( ) ;\n"
+
+
+def _header_params(params: bool) -> str:
+    if not params:
+        return ""
+    return (
+        " #(\n  parameter int DATA_W = 32,\n  parameter DEPTH = 512,\n"
+        "  parameter ADDR_W = $clog2(DEPTH) + 2\n)"
+    )
+
+
+def make_module(
+    name: str, ports: int, ansi: bool = True, params: bool = False, comments: bool = False
+) -> str:
+    """Return the text of one module with ``ports`` ports besides clk and rst_n."""
+    specs = [("input", "", "clk"), ("input", "", "rst_n")]
+    specs += [_port(i, params) for i in range(ports)]
+    parts: List[str] = []
+    if comments:
+        parts.append(f"/*\n * {name}: generated for benchmarking.\n * module fake(input x);\n */\n")
+    if ansi:
+        items = []
+        for i, (direction, rng, port) in enumerate(specs):
+            decl = f"  {direction} logic {'[' + rng + '] ' if rng else ''}{port}"
+            items.append((_comment(i) if comments else "") + decl)
+        parts.append(f"module {name}{_header_params(params)} (\n" + ",\n".join(items) + "\n);\n")
+    else:
+        names = ", ".join(port for _, _, port in specs)
+        parts.append(f"module {name}{_header_params(params)} ({names});\n")
+        for i, (direction, rng, port) in enumerate(specs):
+            if comments:
+                parts.append(_comment(i))
+            parts.append(f"  {direction} {'[' + rng + '] ' if rng else ''}{port};\n")
+    parts.append("endmodule\n\n")
+    return "".join(parts)
+
+
+def make_dut(
+    ports: int, ansi: bool = True, params: bool = False, comments: bool = False,
+    modules: int = 1
+) -> str:
+    """Return a file whose last module, ``bench_top``, has ``ports`` ports."""
+    fillers = [
+        make_module(f"filler_{i}", 16, ansi=i % 2 == 0, params=params, comments=comments)
+        for i in range(modules - 1)
+    ]
+    return "".join(fillers) + make_module(TOP, ports, ansi, params, comments)
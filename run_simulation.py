@@ -5,68 +5,65 @@ Supports: VCS, Modelsim, Xcelium, Vivado Simulator
 """
 
 import argparse
+import asyncio
+import contextlib
+import functools
+import json
+import random
+import shutil
+import signal
+import sqlite3
 import subprocess
 import sys
 import os
+import time
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import Callable, List, NamedTuple, Optional, Dict, Sequence
+
+from uvm_tbgen import profiling
+from uvm_tbgen.compile_graph import load_stamps, plan, save_stamps, scan_units
+from uvm_tbgen.filelist import find_filelist, included_files, read_filelist
+from uvm_tbgen.logscan import LogWatcher, failure_signature
+from uvm_tbgen.manifest import Manifest, file_digest, input_key
+from uvm_tbgen.results import ResultStore, RunRecord, default_db_path
+from uvm_tbgen.runcache import (
+    CACHE_FORMAT, DEFAULT_MAX_BYTES, DEFAULT_TTL, RunCache, default_run_cache,
+)
+from uvm_tbgen.simulators import SIMULATORS, detect_simulators, probe_version
+
+# Bump when the snapshot layout changes, to force recompilation
+SNAPSHOT_FORMAT = 2
+# Written into a snapshot directory once compilation has succeeded
+SNAPSHOT_MARKER = 'snapshot.json'
+# Compiled snapshots kept per simulator
+SNAPSHOTS_KEPT = 3
+# Simulators whose work library is updated in place, one compilation unit at a time
+INCREMENTAL_SIMULATORS = ('modelsim', 'vivado')
+# Seconds between SIGTERM and SIGKILL when a process group is stopped
+KILL_GRACE = 5.0
+# Longest output line buffered from a simulator
+_STREAM_LIMIT = 1 << 20
+# Regression runs written to the results store per transaction
+RESULTS_BATCH = 500
+
+
+def _snapshot_key(marker: Path) -> Optional[str]:
+    """Key recorded in a snapshot marker, or None if there is no complete snapshot"""
+    try:
+        return json.loads(marker.read_text()).get('key')
+    except (OSError, ValueError):
+        return None
+
 
 class SimulatorConfig:
     """Simulator configuration and detection"""
     
-    SIMULATORS = {
-        'vcs': {
-            'name': 'VCS (Synopsys)',
-            'commands': ['vcs', 'vlogan'],
-            'compile_cmd': 'vcs',
-            'run_cmd': './simv',
-            'elaboration_flag': '-elaborate',
-            'top_flag': '-top',
-            'source_flag': None,  # Sources listed as arguments
-        },
-        'modelsim': {
-            'name': 'Modelsim (Mentor)',
-            'commands': ['vlog', 'vsim', 'vcom'],
-            'compile_cmd': 'vlog',
-            'run_cmd': 'vsim',
-            'elaboration_flag': None,
-            'top_flag': None,
-            'source_flag': None,
-        },
-        'xcelium': {
-            'name': 'Xcelium (Cadence)',
-            'commands': ['xrun', 'xvlog'],
-            'compile_cmd': 'xrun',
-            'run_cmd': 'xrun',
-            'elaboration_flag': None,
-            'top_flag': '-top',
-            'source_flag': '-sv',
-        },
-        'vivado': {
-            'name': 'Vivado Simulator (Xilinx)',
-            'commands': ['xvlog', 'xsim', 'vivado'],
-            'compile_cmd': 'xvlog',
-            'run_cmd': 'xsim',
-            'elaboration_flag': None,
-            'top_flag': None,
-            'source_flag': '-sv',
-        },
-    }
+    SIMULATORS = SIMULATORS
 
     @classmethod
-    def detect_available_simulators(cls) -> List[str]:
-        """Detect which simulators are installed"""
-        available = []
-        for sim_name, config in cls.SIMULATORS.items():
-            for cmd in config['commands']:
-                try:
-                    result = subprocess.run(['which', cmd], capture_output=True, timeout=5)
-                    if result.returncode == 0:
-                        available.append(sim_name)
-                        break
-                except Exception:
-                    pass
-        return available
+    def detect_available_simulators(cls, refresh: bool = False) -> List[str]:
+        """Detect which simulators are installed (cached, see uvm_tbgen.simulators)"""
+        return list(detect_simulators(refresh))
 
     @classmethod
     def get_simulator_config(cls, simulator: str) -> Dict:
@@ -74,10 +71,42 @@ class SimulatorConfig:
         return cls.SIMULATORS.get(simulator.lower())
 
 
+@functools.lru_cache(maxsize=None)
+def simulator_version(simulator: str) -> str:
+    """Return the simulator's version banner ('unknown' if it cannot be queried)"""
+    info = detect_simulators().get(simulator)
+    if info is not None:
+        return info.version
+    return probe_version(SimulatorConfig.get_simulator_config(simulator)['version_cmd'])
+
+
+class RunResult(NamedTuple):
+    """Outcome of one simulation run"""
+    seed: Optional[int]
+    returncode: int
+    elapsed: float
+    run_dir: str
+    log_file: str
+    status: str  # PASS, FAIL, TIMEOUT or ERROR
+    reason: str = ''
+    uvm_errors: int = 0
+    uvm_fatals: int = 0
+    assertion_failures: int = 0
+    cached: bool = False  # reported from the run cache instead of simulated
+
+    @property
+    def passed(self) -> bool:
+        return self.status == 'PASS'
+
+
 class TestbenchSimulator:
     """Run UVM testbenches with different simulators"""
 
-    def __init__(self, simulator: str, dut_path: str, testbench_dir: str, top_module: str = 'tb'):
+    def __init__(self, simulator: str, dut_path: str, testbench_dir: str, top_module: str = 'tb',
+                 run_dir: Optional[str] = None, snapshot_dir: Optional[str] = None,
+                 recompile: bool = False, timeouts: Optional[Dict[str, float]] = None,
+                 on_line: Optional[Callable[[str], None]] = None,
+                 max_errors: Optional[int] = None, abort_on_fatal: bool = False):
         self.simulator = simulator.lower()
         self.config = SimulatorConfig.get_simulator_config(self.simulator)
         if not self.config:
@@ -86,178 +115,805 @@ class TestbenchSimulator:
         self.dut_path = Path(dut_path)
         self.testbench_dir = Path(testbench_dir)
         self.top_module = top_module
-        self.work_dir = self.testbench_dir / 'work'
-        self.log_file = self.testbench_dir / f'{self.simulator}_simulation.log'
+        # Simulator commands run in run_dir; regressions give every seed its own
+        self.run_dir = Path(run_dir) if run_dir else self.testbench_dir
+        self.log_file = self.run_dir / f'{self.simulator}_simulation.log'
+        # Console output of all phases, captured by run_seed()
+        self.console_log = self.run_dir / 'run.log'
+        # Compiled snapshots, shared by all runs of this testbench
+        self.snapshot_dir = Path(snapshot_dir) if snapshot_dir else self.testbench_dir / 'snapshots'
+        self.recompile = recompile
+        # Wall-clock limit in seconds per phase ('compile', 'run')
+        self.timeouts = dict(timeouts or {})
+        # Called with every line of simulator output
+        self.on_line = on_line
+        self._console = None
+        self.error = ''
+        # (status, reason) overriding the exit-status verdict, e.g. after a timeout
+        self.outcome = None
+        # Early-abort limits, applied to the run phase output
+        self.max_errors = max_errors
+        self.abort_on_fatal = abort_on_fatal
+        self.watcher: Optional[LogWatcher] = None
+        # Include directories from the testbench filelist, set by collect_sources()
+        self.incdirs: List[str] = []
+        # Seconds spent in the last compile_async()
+        self.compile_time = 0.0
+
+    def _log(self, message: str):
+        """Print a message, or append it to the run log while capturing"""
+        if self._console is None:
+            print(message)
+        else:
+            self._console.write(message + '\n')
+
+    @contextlib.contextmanager
+    def capture(self, path: Path):
+        """Send messages and simulator output to ``path`` instead of the terminal"""
+        with open(path, 'w') as console:
+            self._console = console
+            try:
+                yield console
+            finally:
+                self._console = None
+
+    def _emit(self, line: str):
+        if self._console is None:
+            sys.stdout.write(line)
+            sys.stdout.flush()
+        else:
+            self._console.write(line)
+        if self.on_line is not None:
+            self.on_line(line)
+
+    async def _exec(self, cmd: List[str], phase: str = 'run', cwd: Optional[Path] = None) -> int:
+        """Run one simulator command (in the run directory by default) and return its exit status.
+
+        Output is streamed line by line to the log and ``on_line``. The
+        command runs in its own process group, which is killed when the
+        phase exceeds its timeout or the calling task is cancelled.
+        """
+        self._log(f"Command: {' '.join(cmd)}")
+        if self._console is not None:
+            self._console.flush()
+        kwargs = {'start_new_session': True} if os.name == 'posix' else {}
+        with profiling.span(Path(cmd[0]).name, phase, simulator=self.simulator) as info:
+            before = profiling.child_usage() if profiling.active() else {}
+            proc = await asyncio.create_subprocess_exec(
+                *cmd, cwd=cwd or self.run_dir, stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, limit=_STREAM_LIMIT, **kwargs
+            )
+            timeout = self.timeouts.get(phase)
+            try:
+                await asyncio.wait_for(self._stream(proc), timeout)
+            except asyncio.TimeoutError:
+                self._log(f"\n[TIMEOUT] {phase} phase exceeded {timeout:g}s; killing process group")
+                self.outcome = ('TIMEOUT', f'{phase} phase timed out after {timeout:g}s')
+                await self._kill(proc)
+            except asyncio.CancelledError:
+                await self._kill(proc)
+                raise
+            finally:
+                if before:
+                    after = profiling.child_usage()
+                    info['cpu_user'] = after['cpu_user'] - before['cpu_user']
+                    info['cpu_sys'] = after['cpu_sys'] - before['cpu_sys']
+                    info['maxrss_kb'] = after['maxrss_kb']
+            info['returncode'] = proc.returncode
+        return proc.returncode
+
+    async def _stream(self, proc):
+        while True:
+            try:
+                line = await proc.stdout.readline()
+            except ValueError:
+                # Line longer than the buffer limit; it has been discarded
+                self._emit('[TRUNCATED] overlong output line dropped\n')
+                continue
+            if not line:
+                break
+            text = line.decode('utf-8', errors='replace')
+            self._emit(text)
+            reason = self.watcher.feed(text) if self.watcher is not None else None
+            if reason:
+                self._log(f"\n[ABORT] {reason}; stopping simulation")
+                self.outcome = ('FAIL', f'aborted: {reason}')
+                await self._kill(proc)
+                break
+        await proc.wait()
+
+    async def _kill(self, proc):
+        """Stop the command's whole process group: SIGTERM, then SIGKILL after a grace period"""
+        for sig in (signal.SIGTERM, getattr(signal, 'SIGKILL', signal.SIGTERM)):
+            if proc.returncode is not None:
+                return
+            try:
+                if hasattr(os, 'killpg'):
+                    os.killpg(proc.pid, sig)
+                else:
+                    proc.kill()
+            except ProcessLookupError:
+                pass
+            try:
+                await asyncio.wait_for(asyncio.shield(proc.wait()), KILL_GRACE)
+            except asyncio.TimeoutError:
+                continue
 
     def prepare(self):
         """Prepare for simulation"""
-        self.work_dir.mkdir(exist_ok=True)
-        print(f"[{self.simulator.upper()}] Simulator Configuration:")
-        print(f"  DUT: {self.dut_path}")
-        print(f"  Testbench: {self.testbench_dir}")
-        print(f"  Work Directory: {self.work_dir}")
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        self._log(f"[{self.simulator.upper()}] Simulator Configuration:")
+        self._log(f"  DUT: {self.dut_path}")
+        self._log(f"  Testbench: {self.testbench_dir}")
+        self._log(f"  Run Directory: {self.run_dir}")
+        self._log(f"  Snapshot Directory: {self.snapshot_dir}")
 
     def collect_sources(self) -> List[str]:
-        """Collect all SystemVerilog source files"""
-        sources = []
+        """Collect all SystemVerilog source files in compile order
+
+        The generated filelist (``<top>.f``, or the only ``.f`` file in the
+        testbench directory) gives the order and include directories; the
+        DUT given on the command line replaces its copy. Testbenches without
+        a filelist compile every ``*.sv`` file after the DUT.
+        """
+        # Absolute paths, as commands run in the run directory
+        dut = self.dut_path.resolve()
+        sources = [str(dut)]
+        self.incdirs = []
         
-        # Add DUT
-        sources.append(str(self.dut_path))
+        filelist_path = find_filelist(self.testbench_dir, self.top_module)
+        if filelist_path is not None:
+            filelist = read_filelist(filelist_path)
+            self.incdirs = [str(d.resolve()) for d in filelist.incdirs]
+            copied_dut = self.testbench_dir.resolve() / dut.name
+            for path in filelist.files:
+                path = path.resolve()
+                if path != dut and path != copied_dut:
+                    sources.append(str(path))
+            return sources
         
         # Add generated testbench files
         for sv_file in sorted(self.testbench_dir.glob('*.sv')):
-            sources.append(str(sv_file))
+            sources.append(str(sv_file.resolve()))
         
         return sources
 
-    def run_vcs(self, sources: List[str], gui: bool = False, seed: Optional[int] = None) -> int:
-        """Run simulation with VCS"""
-        print(f"\n[VCS] Compiling and elaborating design...")
+    def incdir_args(self) -> List[str]:
+        """Include directory options for the compiler"""
+        if self.simulator == 'vivado':
+            return [arg for d in self.incdirs for arg in ('-i', d)]
+        return [f'+incdir+{d}' for d in self.incdirs]
+
+    def snapshot_key(self, sources: List[str], gui: bool = False) -> str:
+        """Hash of everything that affects the compiled snapshot"""
+        return input_key(
+            SNAPSHOT_FORMAT,
+            self.simulator,
+            simulator_version(self.simulator),
+            self.top_module,
+            self.compile_flags(gui),
+            self.incdirs,
+            [[str(src), file_digest(Path(src))]
+             for src in sources + included_files(map(Path, sources), map(Path, self.incdirs))],
+        )[:16]
+
+    def run_key(self, snapshot_key: str, seed: Optional[int], plusargs: Sequence[str]) -> str:
+        """Hash of everything that determines the result of a batch run
+
+        ``snapshot_key`` (see :meth:`snapshot_key`) covers the sources, the
+        simulator version and the compile options; the run options, plusargs
+        and seed are added to it.
+        """
+        return input_key(
+            CACHE_FORMAT,
+            snapshot_key,
+            seed,
+            list(plusargs),
+            self.max_errors,
+            self.abort_on_fatal,
+            self.timeouts.get('run'),
+        )
+
+    def cacheable(self, result: RunResult) -> bool:
+        """Whether a rerun would repeat ``result``: a pass, or failures seen in the output"""
+        return result.passed or (result.status == 'FAIL' and self.watcher is not None
+                                 and self.watcher.failed)
+
+    def library_key(self, gui: bool = False) -> str:
+        """Hash of everything that affects a work library except the sources"""
+        return input_key(
+            SNAPSHOT_FORMAT,
+            self.simulator,
+            simulator_version(self.simulator),
+            self.top_module,
+            self.compile_flags(gui),
+            self.incdirs,
+        )[:16]
+
+    def compile_flags(self, gui: bool = False) -> List[str]:
+        """Compile/elaborate options that end up in the snapshot"""
+        flags = list(self.config['compile_flags'])
+        if gui and self.simulator == 'vcs':
+            flags.append('-debug_access+all')
+        return flags
+
+    async def snapshot(self, sources: List[str], gui: bool = False) -> Optional[Path]:
+        """Return a compiled snapshot for ``sources``, compiling only if needed.
+
+        Snapshots live in ``<snapshot_dir>/<simulator>-<key>`` and are reused
+        by every run that only changes the seed or plusargs. Any change to a
+        source file, the compile flags or the simulator version yields a new
+        key. Modelsim and Vivado instead keep one work library per
+        :meth:`library_key` and recompile only the changed compilation units
+        into it (see :mod:`uvm_tbgen.compile_graph`). Returns None if
+        compilation failed.
+        """
+        key = self.snapshot_key(sources, gui)
+        incremental = self.simulator in INCREMENTAL_SIMULATORS
+        snap = self.snapshot_dir / f'{self.simulator}-{self.library_key(gui) if incremental else key}'
+        marker = snap / SNAPSHOT_MARKER
+        if not self.recompile and _snapshot_key(marker) == key:
+            self._log(f"\n[{self.simulator.upper()}] Reusing compiled snapshot {snap}")
+            os.utime(marker)
+            return snap
+
+        # Compile in place; the marker is only written once compilation succeeded
+        if incremental and not self.recompile:
+            with contextlib.suppress(FileNotFoundError):
+                marker.unlink()
+        else:
+            shutil.rmtree(snap, ignore_errors=True)
+        snap.mkdir(parents=True, exist_ok=True)
+        compile_backend = getattr(self, f'compile_{self.simulator}')
+        returncode = await compile_backend(sources, snap, gui)
+        if returncode != 0:
+            self._log(f"[ERROR] Compilation failed with exit status {returncode}")
+            if not incremental:
+                shutil.rmtree(snap, ignore_errors=True)
+            return None
+        marker.write_text(json.dumps({
+            'key': key,
+            'simulator': self.simulator,
+            'version': simulator_version(self.simulator),
+            'top': self.top_module,
+            'flags': self.compile_flags(gui),
+            'sources': sources,
+        }, indent=2) + '\n')
+        self.prune_snapshots()
+        return snap
+
+    def prune_snapshots(self, keep: int = SNAPSHOTS_KEPT):
+        """Delete all but the ``keep`` most recently used snapshots of this simulator"""
+        snaps = []
+        for path in self.snapshot_dir.glob(f'{self.simulator}-*'):
+            marker = path / SNAPSHOT_MARKER
+            if marker.exists():
+                snaps.append((marker.stat().st_mtime_ns, path))
+        for _, path in sorted(snaps, reverse=True)[keep:]:
+            shutil.rmtree(path, ignore_errors=True)
+
+    async def compile_vcs(self, sources: List[str], snap: Path, gui: bool = False) -> int:
+        """Compile and elaborate with VCS into ``snap/simv``"""
+        self._log(f"\n[VCS] Compiling and elaborating design...")
         
-        cmd = [
-            'vcs',
-            '-full64',
-            '-sverilog',
-            '-assert', 'svaext',
-            '-timescale=1ns/1ps',
-            '+v2k',
+        cmd = ['vcs'] + self.compile_flags(gui) + [
             '-top', self.top_module,
-        ]
-        
-        if gui:
-            cmd.append('-gui')
-        
-        if seed:
-            cmd.extend(['+ntb_random_seed', str(seed)])
-        
+            '-Mdir=' + str(snap / 'csrc'),
+            '-o', str(snap / 'simv'),
+        ] + self.incdir_args()
         cmd.extend(sources)
         
-        print(f"Command: {' '.join(cmd)}")
-        result = subprocess.run(cmd, cwd=self.testbench_dir, capture_output=False)
-        
-        if result.returncode == 0:
-            print(f"\n[VCS] Running simulation...")
-            run_cmd = ['./simv', f'-l', str(self.log_file)]
-            if gui:
-                run_cmd.append('-gui')
-            result = subprocess.run(run_cmd, cwd=self.testbench_dir)
+        return await self._exec(cmd, 'compile', cwd=snap)
+
+    async def run_vcs(self, snap: Path, gui: bool = False, seed: Optional[int] = None,
+                plusargs: Sequence[str] = ()) -> int:
+        """Run a compiled VCS snapshot"""
+        self._log(f"\n[VCS] Running simulation...")
+        run_cmd = [str(snap / 'simv'), '-l', str(self.log_file)]
+        if gui:
+            run_cmd.append('-gui')
+        if seed is not None:
+            run_cmd.append(f'+ntb_random_seed={seed}')
+        run_cmd.extend(plusargs)
         
-        return result.returncode
+        return await self._exec(run_cmd)
+
+    async def compile_units(self, compiler: List[str], sources: List[str], library: Path,
+                            cwd: Path) -> int:
+        """Run ``compiler`` on the sources that changed since the last compile into ``library``
 
-    def run_modelsim(self, sources: List[str], gui: bool = False, seed: Optional[int] = None) -> int:
-        """Run simulation with Modelsim"""
-        print(f"\n[MODELSIM] Compiling design...")
+        A source is recompiled when it or a file it includes changed, or
+        when a package or interface it uses was recompiled. Digests of the
+        compiled units are stamped into ``library``.
+        """
+        units = scan_units(sources, [Path(d) for d in self.incdirs])
+        todo = plan(units, load_stamps(library))
+        tag = self.simulator.upper()
+        if not todo:
+            self._log(f"[{tag}] All {len(units)} compilation units are up to date")
+            return 0
+        self._log(f"[{tag}] Compiling {len(todo)} of {len(units)} compilation units")
+        returncode = await self._exec(compiler + [u.path for u in todo], 'compile', cwd=cwd)
+        save_stamps(library, units, todo, returncode == 0)
+        return returncode
+
+    async def compile_modelsim(self, sources: List[str], snap: Path, gui: bool = False) -> int:
+        """Compile with Modelsim into the ``snap/work`` library, incrementally"""
+        self._log(f"\n[MODELSIM] Compiling design...")
         
-        # Create modelsim.ini if needed
-        modelsim_ini = self.work_dir / 'modelsim.ini'
-        if not modelsim_ini.exists():
-            subprocess.run(['vlib', str(self.work_dir)], cwd=self.testbench_dir)
+        library = snap / 'work'
+        if not (library / '_info').exists():
+            returncode = await self._exec(['vlib', str(library)], 'compile', cwd=snap)
+            if returncode != 0:
+                return returncode
         
         # Compile SystemVerilog files
-        cmd = ['vlog', '-sv', '-work', str(self.work_dir)]
-        cmd.extend(sources)
-        
-        print(f"Command: {' '.join(cmd)}")
-        result = subprocess.run(cmd, cwd=self.testbench_dir, capture_output=False)
+        cmd = ['vlog'] + self.compile_flags(gui) + ['-work', str(library)] + self.incdir_args()
+        return await self.compile_units(cmd, sources, library, snap)
+
+    async def run_modelsim(self, snap: Path, gui: bool = False, seed: Optional[int] = None,
+                     plusargs: Sequence[str] = ()) -> int:
+        """Run a compiled Modelsim library"""
+        self._log(f"\n[MODELSIM] Running simulation...")
+        run_cmd = ['vsim', '-work', str(snap / 'work'), self.top_module]
         
-        if result.returncode == 0:
-            print(f"\n[MODELSIM] Running simulation...")
-            run_cmd = ['vsim', '-work', str(self.work_dir), self.top_module]
-            
-            if gui:
-                run_cmd.append('-gui')
-            
-            if seed:
-                run_cmd.extend(['-sv_seed', str(seed)])
-            
-            run_cmd.extend(['-l', str(self.log_file)])
-            
-            result = subprocess.run(run_cmd, cwd=self.testbench_dir)
+        if gui:
+            run_cmd.append('-gui')
+        else:
+            run_cmd.extend(['-c', '-do', 'run -all; quit -f'])
         
-        return result.returncode
+        if seed is not None:
+            run_cmd.extend(['-sv_seed', str(seed)])
 
-    def run_xcelium(self, sources: List[str], gui: bool = False, seed: Optional[int] = None) -> int:
-        """Run simulation with Xcelium"""
-        print(f"\n[XCELIUM] Compiling and running design...")
+        run_cmd.extend(['-l', str(self.log_file)])
+        run_cmd.extend(plusargs)
+
+        return await self._exec(run_cmd)
+
+    async def compile_xcelium(self, sources: List[str], snap: Path, gui: bool = False) -> int:
+        """Compile and elaborate with Xcelium into a snapshot under ``snap``"""
+        self._log(f"\n[XCELIUM] Compiling and elaborating design...")
         
-        cmd = [
-            'xrun',
-            '-elaborate',
-            '-64bit',
-            '-sv',
+        cmd = ['xrun', '-elaborate'] + self.compile_flags(gui) + [
             '-top', self.top_module,
-            '-timescale', '1ns/1ps',
-        ]
+            '-xmlibdirpath', str(snap),
+            '-snapshot', self.top_module,
+            '-l', str(snap / 'xrun_compile.log'),
+        ] + self.incdir_args()
+        cmd.extend(sources)
+
+        return await self._exec(cmd, 'compile', cwd=snap)
+
+    async def run_xcelium(self, snap: Path, gui: bool = False, seed: Optional[int] = None,
+                    plusargs: Sequence[str] = ()) -> int:
+        """Run a compiled Xcelium snapshot"""
+        self._log(f"\n[XCELIUM] Running simulation...")
+
+        run_cmd = ['xrun', '-R', '-xmlibdirpath', str(snap), '-snapshot', self.top_module]
         
         if gui:
-            cmd.append('-gui')
-        
-        if seed:
-            cmd.extend(['-random_seed', str(seed)])
+            run_cmd.append('-gui')
         
-        cmd.extend(['-l', str(self.log_file)])
-        cmd.extend(sources)
+        if seed is not None:
+            run_cmd.extend(['-svseed', str(seed)])
         
-        print(f"Command: {' '.join(cmd)}")
-        result = subprocess.run(cmd, cwd=self.testbench_dir, capture_output=False)
+        run_cmd.extend(['-l', str(self.log_file)])
+        run_cmd.extend(plusargs)
         
-        return result.returncode
+        return await self._exec(run_cmd)
 
-    def run_vivado(self, sources: List[str], gui: bool = False, seed: Optional[int] = None) -> int:
-        """Run simulation with Vivado Simulator"""
-        print(f"\n[VIVADO] Compiling design...")
-        
-        # Compile with xvlog
-        compile_cmd = ['xvlog', '-sv', '--work', str(self.work_dir)]
-        compile_cmd.extend(sources)
+    async def compile_vivado(self, sources: List[str], snap: Path, gui: bool = False) -> int:
+        """Compile incrementally and elaborate with xvlog/xelab into ``snap/xsim.dir``"""
+        self._log(f"\n[VIVADO] Compiling design...")
         
-        print(f"Command: {' '.join(compile_cmd)}")
-        result = subprocess.run(compile_cmd, cwd=self.testbench_dir, capture_output=False)
+        # Compile with xvlog into the default library, xsim.dir/work
+        compile_cmd = ['xvlog'] + self.compile_flags(gui) + self.incdir_args()
+        returncode = await self.compile_units(compile_cmd, sources, snap / 'xsim.dir' / 'work', snap)
         
-        if result.returncode == 0:
-            print(f"\n[VIVADO] Elaborating design...")
-            elab_cmd = ['xelab', '--work', str(self.work_dir), self.top_module]
-            result = subprocess.run(elab_cmd, cwd=self.testbench_dir, capture_output=False)
+        if returncode == 0:
+            self._log(f"\n[VIVADO] Elaborating design...")
+            elab_cmd = ['xelab', self.top_module, '-s', self.top_module]
+            returncode = await self._exec(elab_cmd, 'compile', cwd=snap)
         
-        if result.returncode == 0:
-            print(f"\n[VIVADO] Running simulation...")
-            run_cmd = ['xsim', f'{self.work_dir}/{self.top_module}']
-            
-            if gui:
-                run_cmd.append('-gui')
-            
-            run_cmd.extend(['-l', str(self.log_file)])
-            
-            result = subprocess.run(run_cmd, cwd=self.testbench_dir)
-        
-        return result.returncode
+        return returncode
+
+    async def run_vivado(self, snap: Path, gui: bool = False, seed: Optional[int] = None,
+                   plusargs: Sequence[str] = ()) -> int:
+        """Run a compiled xsim snapshot"""
+        self._log(f"\n[VIVADO] Running simulation...")
+
+        # xsim looks for xsim.dir in its working directory
+        link = self.run_dir / 'xsim.dir'
+        if link.is_symlink() and Path(os.readlink(link)) != snap / 'xsim.dir':
+            link.unlink()
+        if not link.exists():
+            try:
+                link.symlink_to(snap / 'xsim.dir', target_is_directory=True)
+            except OSError:
+                shutil.copytree(snap / 'xsim.dir', link)
+
+        run_cmd = ['xsim', self.top_module]
+
+        if gui:
+            run_cmd.append('-gui')
+        else:
+            run_cmd.append('-R')
+
+        if seed is not None:
+            run_cmd.extend(['-sv_seed', str(seed)])
 
-    def run(self, gui: bool = False, seed: Optional[int] = None) -> int:
-        """Run simulation with appropriate simulator"""
+        run_cmd.extend(['-l', str(self.log_file)])
+        for plusarg in plusargs:
+            run_cmd.extend(['-testplusarg', plusarg.lstrip('+')])
+
+        return await self._exec(run_cmd)
+
+    def compile(self, gui: bool = False) -> Optional[Path]:
+        """Prepare the work area and return a compiled snapshot (None on failure)"""
+        return asyncio.run(self.compile_async(gui))
+
+    async def compile_async(self, gui: bool = False) -> Optional[Path]:
+        """Coroutine version of :meth:`compile`"""
         self.prepare()
         sources = self.collect_sources()
         
-        print(f"\n[INFO] Using {self.config['name']}")
-        print(f"[INFO] Sources found: {len(sources)}")
+        self._log(f"\n[INFO] Using {self.config['name']}")
+        self._log(f"[INFO] Sources found: {len(sources)}")
         
+        start = time.perf_counter()
         try:
-            if self.simulator == 'vcs':
-                return self.run_vcs(sources, gui, seed)
-            elif self.simulator == 'modelsim':
-                return self.run_modelsim(sources, gui, seed)
-            elif self.simulator == 'xcelium':
-                return self.run_xcelium(sources, gui, seed)
-            elif self.simulator == 'vivado':
-                return self.run_vivado(sources, gui, seed)
+            with profiling.span('compile', 'compile', simulator=self.simulator, sources=len(sources)):
+                return await self.snapshot(sources, gui)
+        except Exception as e:
+            self._log(f"[ERROR] Compilation failed: {e}")
+            self.error = str(e)
+            return None
+        finally:
+            self.compile_time = time.perf_counter() - start
+
+    def run(self, gui: bool = False, seed: Optional[int] = None,
+            plusargs: Sequence[str] = (), snapshot: Optional[Path] = None) -> int:
+        """Run simulation with appropriate simulator.
+
+        The design is compiled into a reusable snapshot first unless a
+        ``snapshot`` from :meth:`compile` is passed in.
+        """
+        try:
+            return asyncio.run(self.run_async(gui, seed, plusargs, snapshot))
         except KeyboardInterrupt:
             print(f"\n[INTERRUPTED] Simulation cancelled by user")
             return 1
+
+    async def run_async(self, gui: bool = False, seed: Optional[int] = None,
+                        plusargs: Sequence[str] = (), snapshot: Optional[Path] = None) -> int:
+        """Coroutine version of :meth:`run`; cancelling it kills the running command"""
+        try:
+            if snapshot is None:
+                snapshot = await self.compile_async(gui)
+                if snapshot is None:
+                    return 1
+            else:
+                self.prepare()
+            run_backend = getattr(self, f'run_{self.simulator}')
+            self.watcher = LogWatcher(self.max_errors, self.abort_on_fatal)
+            returncode = await run_backend(snapshot, gui, seed, plusargs)
+            self.watcher.close()
+            if self.watcher.failed:
+                self._log(f"\n[INFO] Simulation reported {self.watcher.summary()}")
+                # Simulators often exit 0 despite UVM errors
+                returncode = returncode or 1
+            return returncode
+        except asyncio.CancelledError:
+            self._log(f"\n[INTERRUPTED] Simulation cancelled")
+            self.error = 'cancelled'
+            raise
         except Exception as e:
-            print(f"[ERROR] Simulation failed: {e}")
+            self._log(f"[ERROR] Simulation failed: {e}")
+            self.error = str(e)
             return 1
 
+    def run_seed(self, seed: Optional[int] = None, plusargs: Sequence[str] = (),
+                 snapshot: Optional[Path] = None) -> RunResult:
+        """Run one seed in batch mode, capturing all output into the run log.
+
+        Writes ``result.json`` next to the log and returns the run's result.
+        """
+        return asyncio.run(self.run_seed_async(seed, plusargs, snapshot))
+
+    async def run_seed_async(self, seed: Optional[int] = None, plusargs: Sequence[str] = (),
+                             snapshot: Optional[Path] = None) -> RunResult:
+        """Coroutine version of :meth:`run_seed`"""
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        start = time.perf_counter()
+        with self.capture(self.console_log), profiling.span(f'seed {seed}', 'run', seed=seed):
+            returncode = await self.run_async(seed=seed, plusargs=plusargs, snapshot=snapshot)
+        result = self.make_result(seed, returncode, time.perf_counter() - start,
+                                  str(self.console_log))
+        (self.run_dir / 'result.json').write_text(json.dumps(result._asdict(), indent=2) + '\n')
+        return result
+
+    def make_result(self, seed: Optional[int], returncode: int, elapsed: float,
+                    log_file: str) -> RunResult:
+        """Classify a finished run from its exit status and the failures seen"""
+        if self.error:
+            status, reason = 'ERROR', self.error
+        elif self.outcome:
+            status, reason = self.outcome
+        elif self.watcher is not None and self.watcher.failed:
+            status, reason = 'FAIL', self.watcher.summary()
+        elif returncode != 0:
+            status, reason = 'FAIL', f'exit status {returncode}'
+        else:
+            status, reason = 'PASS', ''
+        counts = (0, 0, 0)
+        if self.watcher is not None:
+            counts = (self.watcher.severities['UVM_ERROR'], self.watcher.severities['UVM_FATAL'],
+                      self.watcher.assertion_failures)
+        return RunResult(seed, returncode, elapsed, str(self.run_dir), log_file,
+                         status, reason, *counts)
+
+    def provenance(self) -> Dict[str, str]:
+        """What is being simulated, as recorded in the results store.
+
+        The template digest and generator version come from the manifest
+        uvm_tbgen leaves in the testbench directory (empty for testbenches
+        it did not generate).
+        """
+        inputs = Manifest.load(self.testbench_dir).inputs
+        templates = inputs.get('templates')
+        return {
+            'dut': str(self.dut_path.resolve()),
+            'dut_sha256': file_digest(self.dut_path) if self.dut_path.is_file() else '',
+            'template_digest': input_key(templates) if templates else '',
+            'generator_version': inputs.get('generator_version', ''),
+            'simulator': self.simulator,
+            'simulator_version': simulator_version(self.simulator),
+        }
+
+    def run_record(self, result: RunResult, started: float, provenance: Dict[str, str],
+                   plusargs: Sequence[str] = (), regression: str = '') -> RunRecord:
+        """Results-store entry for ``result``, a run of this simulator started at ``started``"""
+        failure = self.watcher.failure if self.watcher is not None else ''
+        if not failure and not result.passed:
+            failure = result.reason
+        return RunRecord(
+            started=started, seed=result.seed, plusargs=list(plusargs), status=result.status,
+            returncode=result.returncode, compile_time=self.compile_time,
+            run_time=max(0.0, result.elapsed - self.compile_time), elapsed=result.elapsed,
+            uvm_errors=result.uvm_errors, uvm_fatals=result.uvm_fatals,
+            assertion_failures=result.assertion_failures, reason=result.reason,
+            failure=failure, signature=failure_signature(failure) if failure else '',
+            log_file=result.log_file, regression=regression, **provenance,
+        )
+
+
+def cached_keys(runner: TestbenchSimulator, seeds: Sequence[Optional[int]],
+                plusargs: Sequence[str]) -> Dict[Optional[int], str]:
+    """Run-cache keys of ``seeds`` (empty if the sources cannot be read)"""
+    try:
+        snapshot_key = runner.snapshot_key(runner.collect_sources())
+    except (OSError, ValueError):
+        # Let compilation report the problem
+        return {}
+    return {seed: runner.run_key(snapshot_key, seed, plusargs) for seed in seeds}
+
+
+def store_cached(run_cache: RunCache, key: str, result: RunResult):
+    """Record ``result`` in the run cache; failing to do so only warns"""
+    try:
+        run_cache.put(key, result._asdict(), result.log_file)
+    except OSError as e:
+        print(f"[WARNING] Could not cache the result of seed {result.seed}: {e}")
+
+
+def record_results(db: Optional[str], records: Sequence[RunRecord]):
+    """Add runs to the results store at ``db``; failing to do so only warns"""
+    if not db or not records:
+        return
+    try:
+        with ResultStore(db) as store:
+            store.add_many(records)
+    except (sqlite3.Error, OSError) as e:
+        print(f"[WARNING] Could not record results in {db}: {e}")
+
+
+def parse_seeds(spec: str) -> List[int]:
+    """Parse a seed list such as ``1..1000`` or ``1,5,10..20`` (duplicates dropped)"""
+    seeds: List[int] = []
+    for item in spec.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        try:
+            if '..' in item:
+                first, last = (int(v) for v in item.split('..', 1))
+                if last < first:
+                    raise ValueError
+                seeds.extend(range(first, last + 1))
+            else:
+                seeds.append(int(item))
+        except ValueError:
+            raise ValueError(f"Invalid seed list entry '{item}' (expected N or A..B)") from None
+    return list(dict.fromkeys(seeds))
+
+
+def random_seeds(count: int, base: Optional[int] = None) -> List[int]:
+    """Return ``count`` distinct 31-bit seeds, reproducible when ``base`` is given"""
+    return random.Random(base).sample(range(1, 2 ** 31), count)
+
+
+def regression_workers(runs: int, jobs: Optional[int] = None, licenses: Optional[int] = None) -> int:
+    """Size the worker pool by CPU cores (or ``jobs``) and available licenses"""
+    workers = jobs or os.cpu_count() or 1
+    if licenses:
+        workers = min(workers, licenses)
+    return max(1, min(workers, runs))
 
-def main():
+
+def run_regression(simulator: str, dut_path: str, testbench_dir: str, seeds: List[int],
+                   top_module: str = 'tb', jobs: Optional[int] = None,
+                   licenses: Optional[int] = None, regress_dir: Optional[str] = None,
+                   progress: Optional[Callable[[RunResult, int, int], None]] = None,
+                   plusargs: Sequence[str] = (), snapshot_dir: Optional[str] = None,
+                   recompile: bool = False, timeouts: Optional[Dict[str, float]] = None,
+                   on_line: Optional[Callable[[int, str], None]] = None,
+                   max_errors: Optional[int] = None, abort_on_fatal: bool = False,
+                   results_db: Optional[str] = None, run_cache: Optional[RunCache] = None,
+                   force: bool = False) -> List[RunResult]:
+    """Run every seed with at most ``workers`` in flight and return the results in seed order.
+
+    The design is compiled once (or an up-to-date snapshot is reused, see
+    :meth:`TestbenchSimulator.snapshot`) with output in ``compile.log``; then
+    each seed runs from that snapshot in ``<regress_dir>/seed_<seed>``
+    (default regress_dir: ``<testbench>/regression``) with its own log and
+    ``result.json``. ``progress`` is called with (result, done, total) as
+    runs finish, ``on_line`` with (seed, line) for every line of output.
+    Runs are stopped early once ``max_errors`` failures are seen, or on
+    the first UVM_FATAL with ``abort_on_fatal``. With ``results_db`` every
+    run is also added to that results store, in batches of ``RESULTS_BATCH``.
+
+    With a ``run_cache``, seeds whose inputs are unchanged since a recorded
+    run are not simulated: their recorded result is returned (``cached``
+    set, ``log_file`` pointing at the earlier log). Nothing is compiled if
+    every seed hits. ``force`` and ``recompile`` run every seed and refresh
+    the cache.
+    """
+    return asyncio.run(run_regression_async(
+        simulator, dut_path, testbench_dir, seeds, top_module, jobs, licenses, regress_dir,
+        progress, plusargs, snapshot_dir, recompile, timeouts, on_line, max_errors,
+        abort_on_fatal, results_db, run_cache, force,
+    ))
+
+
+async def run_regression_async(simulator: str, dut_path: str, testbench_dir: str,
+                               seeds: List[int], top_module: str = 'tb',
+                               jobs: Optional[int] = None, licenses: Optional[int] = None,
+                               regress_dir: Optional[str] = None,
+                               progress: Optional[Callable[[RunResult, int, int], None]] = None,
+                               plusargs: Sequence[str] = (), snapshot_dir: Optional[str] = None,
+                               recompile: bool = False,
+                               timeouts: Optional[Dict[str, float]] = None,
+                               on_line: Optional[Callable[[int, str], None]] = None,
+                               max_errors: Optional[int] = None, abort_on_fatal: bool = False,
+                               results_db: Optional[str] = None,
+                               run_cache: Optional[RunCache] = None,
+                               force: bool = False) -> List[RunResult]:
+    """Coroutine version of :func:`run_regression`.
+
+    All runs are driven from the calling event loop; a semaphore bounds how
+    many simulations are in flight. Cancelling the coroutine kills every
+    running simulation.
+    """
+    root = Path(regress_dir) if regress_dir else Path(testbench_dir) / 'regression'
+    workers = regression_workers(len(seeds), jobs, licenses)
+
+    def make_runner(run_dir: Path, seed: Optional[int] = None) -> TestbenchSimulator:
+        callback = functools.partial(on_line, seed) if on_line and seed is not None else None
+        return TestbenchSimulator(simulator, dut_path, testbench_dir, top_module,
+                                  run_dir=str(run_dir), snapshot_dir=snapshot_dir,
+                                  recompile=recompile, timeouts=timeouts, on_line=callback,
+                                  max_errors=max_errors, abort_on_fatal=abort_on_fatal)
+
+    compiler = make_runner(root)
+    root.mkdir(parents=True, exist_ok=True)
+    keys = cached_keys(compiler, seeds, plusargs) if run_cache is not None else {}
+    cached: Dict[int, RunResult] = {}
+    for seed, key in keys.items():
+        entry = None if force or recompile else run_cache.get(key)
+        if entry is not None:
+            with contextlib.suppress(TypeError):
+                cached[seed] = RunResult(**entry)._replace(cached=True)
+    started = time.time()
+    snapshot = None
+    if len(cached) < len(seeds):
+        with compiler.capture(root / 'compile.log'):
+            snapshot = await compiler.compile_async()
+    provenance = compiler.provenance() if results_db else {}
+    # Results-store entries not yet written
+    records: List[RunRecord] = []
+
+    slots = asyncio.Semaphore(workers)
+    # Trace rows for the profiler, one per concurrently running seed
+    lanes = list(range(workers, 0, -1))
+
+    async def run_one(seed: int) -> RunResult:
+        if seed in cached:
+            return cached[seed]
+        if snapshot is None:
+            reason = f"compilation failed, see {root / 'compile.log'}"
+            result = RunResult(seed, 1, 0.0, str(root), str(root / 'compile.log'), 'ERROR', reason)
+            if results_db:
+                records.append(compiler.run_record(result, started, provenance, plusargs, str(root)))
+            return result
+        async with slots:
+            lane = lanes.pop()
+            profiling.set_lane(lane)
+            try:
+                runner = make_runner(root / f'seed_{seed}', seed)
+                run_started = time.time()
+                result = await runner.run_seed_async(seed, plusargs, snapshot)
+                if seed in keys and runner.cacheable(result):
+                    store_cached(run_cache, keys[seed], result)
+                if results_db:
+                    records.append(runner.run_record(result, run_started, provenance, plusargs,
+                                                     str(root)))
+                return result
+            finally:
+                lanes.append(lane)
+
+    results: Dict[int, RunResult] = {}
+    tasks = [asyncio.ensure_future(run_one(seed)) for seed in seeds]
+    try:
+        for future in asyncio.as_completed(tasks):
+            result = await future
+            results[result.seed] = result
+            if progress:
+                progress(result, len(results), len(seeds))
+            if len(records) >= RESULTS_BATCH:
+                record_results(results_db, records)
+                records.clear()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        record_results(results_db, records)
+        if run_cache is not None:
+            with contextlib.suppress(OSError):
+                run_cache.evict()
+    ordered = [results[seed] for seed in seeds]
+
+    summary = {
+        'simulator': simulator,
+        'workers': workers,
+        'passed': sum(r.passed for r in ordered),
+        'failed': sum(not r.passed for r in ordered),
+        'runs': [r._asdict() for r in ordered],
+    }
+    (root / 'summary.json').write_text(json.dumps(summary, indent=2) + '\n')
+    return ordered
+
+
+def print_regression_summary(results: List[RunResult], wall: float):
+    """Print the per-run pass/fail table followed by aggregate timings"""
+    failed = [r for r in results if not r.passed]
+    print(f"\n[REGRESSION] Summary ({len(results)} runs)")
+    print(f"  {'STATUS':<7}{'SEED':>12}{'TIME':>11}  LOG")
+    for r in results:
+        line = f"  {r.status:<7}{r.seed:>12}{r.elapsed:10.3f}s  {r.log_file}"
+        if r.reason:
+            line += f"  ({r.reason})"
+        if r.cached:
+            line += "  [cached]"
+        print(line)
+    ran = [r for r in results if not r.cached]
+    busy = sum(r.elapsed for r in ran)
+    reused = f", {len(results) - len(ran)} cached" if len(ran) < len(results) else ""
+    print(f"[REGRESSION] {len(results) - len(failed)} passed, {len(failed)} failed{reused}; "
+          f"wall {wall:.3f}s, summed run time {busy:.3f}s")
+
+
+def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(
         description='Run UVM testbenches with multiple industry simulators',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -274,6 +930,9 @@ Examples:
 
   # Auto-detect and run with first available simulator
   python3 run_simulation.py --dut dut.v --testbench gen_tb --auto
+
+  # Regression over seeds 1..1000 on 16 workers, at most 8 licenses
+  python3 run_simulation.py --simulator vcs --dut dut.v --testbench gen_tb --seeds 1..1000 -j 16 --licenses 8
         """
     )
     
@@ -285,16 +944,53 @@ Examples:
     parser.add_argument('--seed', type=int, help='Random seed for simulation')
     parser.add_argument('--list', action='store_true', help='List available simulators')
     parser.add_argument('--auto', action='store_true', help='Auto-detect and use first available simulator')
+    seeds_group = parser.add_mutually_exclusive_group()
+    seeds_group.add_argument('--seeds', type=str, help='Regression seed list, e.g. 1..1000 or 1,7,20..30')
+    seeds_group.add_argument('--num-seeds', type=int,
+                             help='Regression over N random seeds (reproducible with --seed)')
+    parser.add_argument('--jobs', '-j', type=int, help='Parallel regression runs (default: CPU count)')
+    parser.add_argument('--licenses', type=int, help='Simulator licenses available to the regression')
+    parser.add_argument('--regress-dir', type=str,
+                        help='Regression run directory (default: <testbench>/regression)')
+    parser.add_argument('--plusarg', action='append', default=[], metavar='+NAME[=VALUE]',
+                        help='Runtime plusarg passed to the simulation (repeatable)')
+    parser.add_argument('--snapshot-dir', type=str,
+                        help='Compiled snapshot directory (default: <testbench>/snapshots)')
+    parser.add_argument('--recompile', action='store_true',
+                        help='Recompile even if an up-to-date snapshot exists (implies --force)')
+    parser.add_argument('--compile-timeout', type=float,
+                        help='Wall-clock limit in seconds for compilation/elaboration')
+    parser.add_argument('--run-timeout', type=float,
+                        help='Wall-clock limit in seconds for each simulation run')
+    parser.add_argument('--max-errors', type=int,
+                        help='Stop a run once this many UVM_ERROR/UVM_FATAL/assertion failures are seen')
+    parser.add_argument('--abort-on-fatal', action='store_true',
+                        help='Stop a run as soon as UVM_FATAL is reported')
+    parser.add_argument('--force', action='store_true',
+                        help='Simulate even if a run with identical inputs has a cached result')
+    parser.add_argument('--run-cache-ttl', type=float, default=DEFAULT_TTL / 3600, metavar='HOURS',
+                        help=f'Rerun seeds whose cached result is older than this '
+                             f'(default: {DEFAULT_TTL // 3600})')
+    parser.add_argument('--run-cache-size', type=int, default=DEFAULT_MAX_BYTES >> 20, metavar='MB',
+                        help='Size limit of the run cache, least recently used results go first '
+                             f'(default: {DEFAULT_MAX_BYTES >> 20})')
+    parser.add_argument('--results-db', metavar='PATH',
+                        help='Results store every run is added to '
+                             '(default: $UVM_TBGEN_RESULTS_DB or <cache dir>/results.db)')
+    parser.add_argument('--no-results', action='store_true',
+                        help='Do not add the runs to the results store')
+    parser.add_argument('--profile', metavar='PATH',
+                        help=f'Write timed compile/run spans to PATH and a Chrome trace next to it '
+                             f'(or set ${profiling.PROFILE_ENV})')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     if args.list:
-        available = SimulatorConfig.detect_available_simulators()
+        available = detect_simulators()
         print("Available simulators:")
         if available:
-            for sim in available:
-                config = SimulatorConfig.get_simulator_config(sim)
-                print(f"  ✓ {config['name']}")
+            for info in available.values():
+                print(f"  ✓ {info.name}: {info.version}")
         else:
             print("  No simulators found. Please install one of:")
             for sim_name, config in SimulatorConfig.SIMULATORS.items():
@@ -321,10 +1017,91 @@ Examples:
             print("[ERROR] Specify --simulator or use --auto")
             return 1
         simulator = args.simulator
-    
+
+    profile_path = profiling.profile_path(args.profile)
+    if not profile_path:
+        return simulate(parser, args, simulator)
+    profiler = profiling.enable()
+    try:
+        return simulate(parser, args, simulator)
+    finally:
+        profiling.disable()
+        trace = profiler.save(profile_path)
+        print(f"[INFO] Profile written to {profile_path} (trace: {trace})")
+
+
+def simulate(parser: argparse.ArgumentParser, args: argparse.Namespace, simulator: str) -> int:
+    """Run the single simulation or regression requested on the command line"""
+    timeouts = {}
+    if args.compile_timeout:
+        timeouts['compile'] = args.compile_timeout
+    if args.run_timeout:
+        timeouts['run'] = args.run_timeout
+
+    results_db = None if args.no_results else str(args.results_db or default_db_path())
+    run_cache = None
+    if not args.gui:
+        run_cache = default_run_cache(args.run_cache_ttl * 3600, args.run_cache_size << 20)
+
+    if args.seeds or args.num_seeds:
+        if args.gui:
+            parser.error("--gui cannot be used with a regression")
+        try:
+            seeds = parse_seeds(args.seeds) if args.seeds else random_seeds(args.num_seeds, args.seed)
+        except ValueError as e:
+            parser.error(str(e))
+        if not seeds:
+            parser.error("no seeds to run")
+        if not SimulatorConfig.get_simulator_config(simulator):
+            print(f"[ERROR] Unknown simulator: {simulator}")
+            return 1
+        workers = regression_workers(len(seeds), args.jobs, args.licenses)
+        print(f"[REGRESSION] {len(seeds)} seeds on {workers} workers")
+
+        def progress(result: RunResult, done: int, total: int):
+            took = 'cached' if result.cached else f'{result.elapsed:.1f}s'
+            print(f"[REGRESSION] [{done}/{total}] seed {result.seed} {result.status} "
+                  f"({took})", flush=True)
+
+        start = time.perf_counter()
+        try:
+            results = run_regression(simulator, args.dut, args.testbench, seeds, args.top,
+                                     args.jobs, args.licenses, args.regress_dir, progress,
+                                     args.plusarg, args.snapshot_dir, args.recompile, timeouts,
+                                     None, args.max_errors, args.abort_on_fatal, results_db,
+                                     run_cache, args.force)
+        except KeyboardInterrupt:
+            print(f"\n[INTERRUPTED] Regression cancelled by user")
+            return 1
+        print_regression_summary(results, time.perf_counter() - start)
+        return 0 if all(r.passed for r in results) else 1
+
     try:
-        runner = TestbenchSimulator(simulator, args.dut, args.testbench, args.top)
-        return runner.run(args.gui, args.seed)
+        runner = TestbenchSimulator(simulator, args.dut, args.testbench, args.top,
+                                    snapshot_dir=args.snapshot_dir, recompile=args.recompile,
+                                    timeouts=timeouts, max_errors=args.max_errors,
+                                    abort_on_fatal=args.abort_on_fatal)
+        key = None
+        if run_cache is not None:
+            key = cached_keys(runner, [args.seed], args.plusarg).get(args.seed)
+            rerun = args.force or args.recompile
+            entry = run_cache.get(key) if key and not rerun else None
+            if entry is not None:
+                print(f"[CACHED] Seed {args.seed} {entry['status']} with unchanged inputs; "
+                      f"log: {entry['log_file']} (use --force to rerun)")
+                return 0 if entry['status'] == 'PASS' else (entry['returncode'] or 1)
+        started = time.time()
+        start = time.perf_counter()
+        returncode = runner.run(args.gui, args.seed, args.plusarg)
+        if not args.gui:
+            result = runner.make_result(args.seed, returncode, time.perf_counter() - start,
+                                        str(runner.log_file))
+            if key and runner.cacheable(result):
+                store_cached(run_cache, key, result)
+            if results_db:
+                record_results(results_db, [runner.run_record(result, started,
+                                                              runner.provenance(), args.plusarg)])
+        return returncode
     except ValueError as e:
         print(f"[ERROR] {e}")
         return 1
@@ -36,11 +36,22 @@ echo "[MODELSIM] Creating work library..."
 vlib work
 vmap work work
 
-# Collect source files
+# Collect source files, in the order of the generated filelist if there is one
 SOURCES="$DUT"
-for sv_file in "$TESTBENCH_DIR"/*.sv; do
-    SOURCES="$SOURCES $sv_file"
-done
+FILELIST=$(ls "$TESTBENCH_DIR"/*.f 2>/dev/null | head -n 1)
+if [ -n "$FILELIST" ]; then
+    for entry in $(sed -e 's://.*$::' "$FILELIST"); do
+        case "$entry" in
+            +incdir+*) SOURCES="$SOURCES +incdir+$TESTBENCH_DIR/${entry#+incdir+}" ;;
+            "$(basename "$DUT")") ;;  # copy of the DUT
+            *) SOURCES="$SOURCES $TESTBENCH_DIR/$entry" ;;
+        esac
+    done
+else
+    for sv_file in "$TESTBENCH_DIR"/*.sv; do
+        SOURCES="$SOURCES $sv_file"
+    done
+fi
 
 echo "[MODELSIM] Compilation Phase..."
 COMPILE_CMD="vlog -sv -work work -timescale=1ns/1ps"
@@ -31,11 +31,22 @@ if [ ! -d "$TESTBENCH_DIR" ]; then
     exit 1
 fi
 
-# Collect source files
+# Collect source files, in the order of the generated filelist if there is one
 SOURCES="$DUT"
-for sv_file in "$TESTBENCH_DIR"/*.sv; do
-    SOURCES="$SOURCES $sv_file"
-done
+FILELIST=$(ls "$TESTBENCH_DIR"/*.f 2>/dev/null | head -n 1)
+if [ -n "$FILELIST" ]; then
+    for entry in $(sed -e 's://.*$::' "$FILELIST"); do
+        case "$entry" in
+            +incdir+*) SOURCES="$SOURCES +incdir+$TESTBENCH_DIR/${entry#+incdir+}" ;;
+            "$(basename "$DUT")") ;;  # copy of the DUT
+            *) SOURCES="$SOURCES $TESTBENCH_DIR/$entry" ;;
+        esac
+    done
+else
+    for sv_file in "$TESTBENCH_DIR"/*.sv; do
+        SOURCES="$SOURCES $sv_file"
+    done
+fi
 
 echo "[XCELIUM] Compilation and Elaboration Phase..."
 
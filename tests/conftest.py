@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path_factory, monkeypatch):
+    """Keep on-disk caches and any running daemon out of the tests."""
+    base = tmp_path_factory.getbasetemp()
+    monkeypatch.setenv("UVM_TBGEN_CACHE_DIR", str(base / "cache"))
+    monkeypatch.setenv("UVM_TBGEN_SOCKET", str(base / "tbgen.sock"))
+
+
+@pytest.fixture
+def run_simulation():
+    """The top-level run_simulation.py script, imported as a module."""
+    import importlib.util
+    from pathlib import Path
+
+    path = Path(__file__).resolve().parent.parent / "run_simulation.py"
+    spec = importlib.util.spec_from_file_location("run_simulation", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def stub_simulator(tmp_path, monkeypatch):
+    """Install stub simulator executables on PATH.
+
+    ``stub_simulator("xrun", body)`` writes a Python script named ``xrun``
+    whose body sees ``args`` (the argument list) and returns the exit status.
+    """
+    import sys
+
+    bindir = tmp_path / "stub_bin"
+    bindir.mkdir()
+    monkeypatch.setenv("PATH", f"{bindir}{os.pathsep}{os.environ['PATH']}")
+
+    def install(name: str, body: str):
+        script = bindir / name
+        lines = ["import sys", "args = sys.argv[1:]", "def main():"]
+        lines += ["    " + line for line in body.strip().splitlines()]
+        lines += ["sys.exit(main())"]
+        script.write_text(f"#!{sys.executable}\n" + "\n".join(lines) + "\n")
+        script.chmod(0o755)
+        return script
+
+    return install
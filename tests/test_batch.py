@@ -0,0 +1,82 @@
+from pathlib import Path
+
+from uvm_tbgen.batch import _output_dirs, collect_duts, generate_batch
+from uvm_tbgen.cli import main
+
+
+def _write_dut(path: Path, name: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        f"module {name}(input clk, input [7:0] din, output [7:0] dout);\nendmodule\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+def test_collect_duts_from_dir_glob_and_manifest(tmp_path: Path):
+    """Directories, globs and manifests resolve to de-duplicated DUT files."""
+    a = _write_dut(tmp_path / "rtl" / "a.v", "a")
+    b = _write_dut(tmp_path / "rtl" / "sub" / "b.sv", "b")
+    (tmp_path / "rtl" / "notes.txt").write_text("not rtl", encoding="utf-8")
+    manifest = tmp_path / "duts.lst"
+    manifest.write_text("# nightly set\nrtl/a.v\n\nrtl/sub/*.sv\n", encoding="utf-8")
+
+    from_dir = collect_duts([str(tmp_path / "rtl")])
+    assert sorted(p.name for p in from_dir) == ["a.v", "b.sv"]
+
+    from_glob = collect_duts([str(tmp_path / "rtl" / "**" / "*.sv")])
+    assert [p.name for p in from_glob] == ["b.sv"]
+
+    mixed = collect_duts([str(a)], manifest=str(manifest))
+    assert [p.name for p in mixed] == ["a.v", "b.sv"]
+    assert b.exists()
+
+
+def test_generate_batch_parallel(tmp_path: Path):
+    """Each DUT gets its own output directory and a success result."""
+    duts = [_write_dut(tmp_path / f"dut{i}.v", f"dut{i}") for i in range(3)]
+    results = generate_batch(duts, str(tmp_path / "out"), jobs=2)
+
+    assert [r.ok for r in results] == [True, True, True]
+    for i, r in enumerate(results):
+        out = Path(r.outdir)
+        assert out == tmp_path / "out" / f"dut{i}"
+        assert (out / f"dut{i}_driver.sv").exists()
+        assert (out / f"dut{i}_tb.sv").exists()
+
+
+def test_generate_batch_reports_failures(tmp_path: Path):
+    """A missing DUT fails on its own without aborting the batch."""
+    good = _write_dut(tmp_path / "good.v", "good")
+    results = generate_batch([good, tmp_path / "missing.v"], str(tmp_path / "out"), jobs=1)
+
+    assert results[0].ok
+    assert not results[1].ok
+    assert "DUT not found" in results[1].error
+
+
+def test_generate_batch_cli(tmp_path: Path, capsys):
+    """The generate-batch command prints a summary and sets the exit code."""
+    _write_dut(tmp_path / "x" / "top.v", "top_x")
+    _write_dut(tmp_path / "y" / "top.v", "top_y")
+
+    rc = main(["generate-batch", str(tmp_path), "--outdir", str(tmp_path / "out"), "-j", "2"])
+
+    assert rc == 0
+    out = capsys.readouterr().out
+    assert "2 succeeded, 0 failed" in out
+    # Colliding stems mirror the source tree instead of overwriting each other
+    assert (tmp_path / "out" / "x" / "top" / "top_x_driver.sv").exists()
+    assert (tmp_path / "out" / "y" / "top" / "top_y_driver.sv").exists()
+
+
+def test_same_stem_in_one_directory_keeps_suffix(tmp_path: Path):
+    """a.v and a.sv side by side get separate output directories."""
+    out = tmp_path / "out"
+    duts = [tmp_path / "rtl" / "a.v", tmp_path / "rtl" / "a.sv", tmp_path / "rtl" / "b.v"]
+    assert _output_dirs(duts, out) == [out / "a_v", out / "a_sv", out / "b"]
+
+    duts.append(tmp_path / "ip" / "b.v")
+    assert _output_dirs(duts, out) == [
+        out / "rtl" / "a_v", out / "rtl" / "a_sv", out / "rtl" / "b", out / "ip" / "b",
+    ]
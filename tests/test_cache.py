@@ -0,0 +1,174 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from uvm_tbgen.cache import ParseCache, template_bytecode_cache
+from uvm_tbgen.cli import main
+from uvm_tbgen.generator import make_environment, precompile_templates
+from uvm_tbgen.ports import Port, PortTable
+from uvm_tbgen.verilog import Module
+
+
+def _cache_entries(cache_dir: Path):
+    return sorted((cache_dir / "templates").glob("*.jinja.cache"))
+
+
+def test_precompile_populates_bytecode_cache(tmp_path: Path):
+    """Every template gets a bytecode entry in the cache directory."""
+    names = precompile_templates(cache_dir=tmp_path)
+
+    assert "seq_item.sv.j2" in names
+    assert "checker.sv.j2" in names
+    assert len(_cache_entries(tmp_path)) == len(names)
+
+
+def test_warm_environment_skips_compilation(tmp_path: Path, monkeypatch):
+    """A fresh environment loads cached bytecode instead of compiling."""
+    precompile_templates(cache_dir=tmp_path)
+    env = make_environment(bytecode_cache=template_bytecode_cache(tmp_path))
+
+    def _no_compile(*args, **kwargs):
+        raise AssertionError("template was recompiled")
+
+    monkeypatch.setattr(env, "compile", _no_compile)
+    assert "extends uvm_driver" in env.get_template("driver.sv.j2").render(
+        module="m", input_ports=[], output_ports=[], ports=[]
+    )
+
+
+def test_edited_template_invalidates_cache(tmp_path: Path, monkeypatch):
+    """Changing template content misses the cache and renders the new text."""
+    templates = tmp_path / "templates_src"
+    templates.mkdir()
+    tpl = templates / "one.sv.j2"
+    tpl.write_text("// v1 {{ module }}\n", encoding="utf-8")
+    bcc = template_bytecode_cache(tmp_path / "cache")
+
+    env = make_environment(templates, bcc)
+    assert env.get_template("one.sv.j2").render(module="m").startswith("// v1 m")
+
+    tpl.write_text("// v2 {{ module }}\n", encoding="utf-8")
+    fresh = make_environment(templates, bcc)
+    assert fresh.get_template("one.sv.j2").render(module="m").startswith("// v2 m")
+    assert len(_cache_entries(tmp_path / "cache")) == 2
+
+
+def test_precompile_cli(tmp_path: Path, capsys):
+    """precompile-templates reports the number of compiled templates."""
+    assert main(["precompile-templates", "--cache-dir", str(tmp_path)]) == 0
+    assert "Precompiled 15 templates" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("value", ["1", "yes"])
+def test_cache_can_be_disabled(tmp_path: Path, monkeypatch, value):
+    """UVM_TBGEN_NO_CACHE turns the bytecode cache off."""
+    from uvm_tbgen.generator import get_environment
+
+    monkeypatch.setenv("UVM_TBGEN_NO_CACHE", value)
+    assert get_environment(cache_dir=tmp_path).bytecode_cache is None
+
+
+DUT_TEXT = "module cached(input clk, input [7:0] d, output [7:0] q);\nendmodule\n"
+
+
+def test_parse_cache_hit_skips_parsing(tmp_path: Path, monkeypatch):
+    """A second lookup of an unchanged file is served without parsing."""
+    import uvm_tbgen.cache as cache_mod
+
+    dut = tmp_path / "cached.v"
+    dut.write_text(DUT_TEXT, encoding="utf-8")
+    cache = ParseCache(tmp_path / "parse")
+    first = cache.parse(dut)
+
+    def _no_parse(*args, **kwargs):
+        raise AssertionError("DUT was re-parsed")
+
+    monkeypatch.setattr(cache_mod, "parse_file", _no_parse)
+    assert cache.parse(dut) == first
+    assert first.ports[1].width == 8
+
+
+def test_parse_cache_keyed_on_content(tmp_path: Path):
+    """Editing the DUT misses the cache; identical content elsewhere hits it."""
+    dut = tmp_path / "cached.v"
+    dut.write_text(DUT_TEXT, encoding="utf-8")
+    cache = ParseCache(tmp_path / "parse")
+    cache.parse(dut)
+
+    dut.write_text(DUT_TEXT.replace("[7:0] q", "[15:0] q"), encoding="utf-8")
+    assert cache.parse(dut).ports[2].width == 16
+
+    copy = tmp_path / "copy.v"
+    copy.write_text(DUT_TEXT, encoding="utf-8")
+    assert cache.get(cache.content_digest(copy)) is not None
+
+
+def test_parse_cache_drops_malformed_entries(tmp_path: Path):
+    """Entries of the wrong shape are misses and are removed, not raised."""
+    dut = tmp_path / "cached.v"
+    dut.write_text(DUT_TEXT, encoding="utf-8")
+    cache = ParseCache(tmp_path / "parse")
+    digest = cache.content_digest(dut)
+    entry = cache._entry(digest, None)
+    good = cache.parse(dut)
+    for bad in (
+        '{"name": "m"}',
+        '{"name": "m", "ports": [1, 2], "params": []}',
+        '{"name": "m", "ports": {"names": ["a", "b"], "dirs": [0], "widths": [1],'
+        ' "ranges": [""]}, "params": []}',
+        '{"name": "m", "ports": {"names": [], "dirs": [], "widths": [], "ranges": []},'
+        ' "params": [["W", "8", false, "extra"]]}',
+        '{"name": "m", "ports": {"names": ["a"], "dirs": [300], "widths": [1],'
+        ' "ranges": [""]}, "params": []}',
+    ):
+        entry.write_text(bad, encoding="utf-8")
+        assert cache.get(digest) is None and not entry.exists()
+        assert cache.parse(dut) == good
+
+    # A truncated stat index entry is recomputed
+    for index in (tmp_path / "parse" / "stat").iterdir():
+        index.write_text(digest[:10], encoding="utf-8")
+    assert cache.content_digest(dut) == digest
+
+
+def test_parse_cache_evicts_least_recently_used(tmp_path: Path):
+    """Entries beyond max_entries are evicted oldest first."""
+    cache = ParseCache(tmp_path / "parse", max_entries=2)
+    module = Module("m", PortTable([Port("a")]))
+    for i, digest in enumerate(("d0", "d1", "d2")):
+        cache.put(digest, None, module)
+        entry = cache._entry(digest, None)
+        os.utime(entry, ns=(i * 10**9, i * 10**9))
+    cache.evict()
+
+    assert cache.get("d0") is None
+    assert cache.get("d1") is not None
+    assert cache.get("d2") is not None
+
+
+def test_parse_cache_scans_only_past_the_limit(tmp_path: Path, monkeypatch):
+    """Puts are counted; the directory is not rescanned for every new entry."""
+    cache = ParseCache(tmp_path / "parse", max_entries=100)
+    scans = []
+    evict = cache.evict
+    monkeypatch.setattr(cache, "evict", lambda: (scans.append(1), evict()))
+    module = Module("m", PortTable([Port("a")]))
+    for i in range(300):
+        cache.put(f"d{i}", None, module)
+
+    assert len(scans) < 30
+    assert len(list((tmp_path / "parse" / "modules").iterdir())) <= 110
+
+
+def test_no_parse_cache_flag(tmp_path: Path, monkeypatch):
+    """--no-parse-cache bypasses the cache entirely."""
+    import uvm_tbgen.generator as generator_mod
+
+    monkeypatch.setattr(generator_mod, "default_parse_cache", lambda: pytest.fail("cache used"))
+    dut = tmp_path / "cached.v"
+    dut.write_text(DUT_TEXT, encoding="utf-8")
+    rc = main([
+        "generate", "--dut", str(dut), "--outdir", str(tmp_path / "out"), "--no-parse-cache",
+    ])
+    assert rc == 0
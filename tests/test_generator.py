@@ -1,5 +1,8 @@
 from pathlib import Path
-from uvm_tbgen.generator import TBGenerator, _extract_module_and_ports
+
+from jinja2 import DictLoader, Environment
+
+from uvm_tbgen.generator import COMPONENTS, TBGenerator, _extract_module_and_ports
 
 
 def test_generator_creates_files(tmp_path: Path):
@@ -395,4 +398,128 @@ endmodule
         file_path = outdir / file
         assert file_path.exists(), f"File {file} not generated"
         content = file_path.read_text(encoding="utf-8")
-        assert len(content) > 0, f"File {file} is empty"
\ No newline at end of file
+        assert len(content) > 0, f"File {file} is empty"
+
+
+def test_top_module_selection(tmp_path: Path):
+    """--top-module picks one module out of a multi-module file."""
+    dut = tmp_path / "lib.v"
+    dut.write_text(
+        """
+module leaf(input a, output y);
+endmodule
+module chip_top(input clk, input [3:0] sel, output [7:0] dout);
+  leaf u_leaf(.a(clk), .y());
+endmodule
+""",
+        encoding="utf-8",
+    )
+
+    outdir = tmp_path / "out"
+    summary = TBGenerator(
+        dut_path=str(dut), outdir=str(outdir), topname="tb", top_module="chip_top"
+    ).generate()
+
+    assert summary.module == "chip_top"
+    seq_item_text = (outdir / "chip_top_seq_item.sv").read_text(encoding="utf-8")
+    assert "rand logic [3:0] sel" in seq_item_text
+
+
+def test_top_module_after_conditional_header(tmp_path: Path):
+    """A module declared after an `ifdef'd header can still be selected."""
+    dut = tmp_path / "lib.sv"
+    dut.write_text(
+        """
+module a(
+`ifdef WIDE
+  input [7:0] d, output [7:0] q);
+`else
+  input [3:0] d, output [3:0] q);
+`endif
+endmodule
+module b(input clk, input [5:0] cmd, output ready);
+endmodule
+""",
+        encoding="utf-8",
+    )
+
+    outdir = tmp_path / "out"
+    summary = TBGenerator(
+        dut_path=str(dut), outdir=str(outdir), topname="tb", top_module="b"
+    ).generate()
+
+    assert summary.module == "b"
+    seq_item_text = (outdir / "b_seq_item.sv").read_text(encoding="utf-8")
+    assert "rand logic [5:0] cmd" in seq_item_text
+    assert " d;" not in seq_item_text
+
+
+def test_package_and_filelist(tmp_path: Path):
+    """Classes are compiled through one package; the filelist gives the compile order."""
+    dut = tmp_path / "fifo.sv"
+    dut.write_text("module fifo(input clk, input [7:0] d, output [7:0] q);\nendmodule\n")
+    outdir = tmp_path / "out"
+    TBGenerator(str(dut), str(outdir), "fifo_tb", verbose=False).generate()
+
+    pkg = (outdir / "fifo_pkg.sv").read_text(encoding="utf-8")
+    includes = [line.split('"')[1] for line in pkg.splitlines() if "`include \"fifo_" in line]
+    assert includes == [
+        "fifo_seq_item.sv", "fifo_sequencer.sv", "fifo_driver.sv", "fifo_monitor.sv",
+        "fifo_coverage.sv", "fifo_scoreboard.sv", "fifo_agent.sv", "fifo_env.sv", "fifo_test.sv",
+    ]
+    assert "package fifo_pkg;" in pkg and "import uvm_pkg::*;" in pkg
+    top = (outdir / "fifo_tb.sv").read_text(encoding="utf-8")
+    # Rendered from templates/tb_top.sv.j2, not the built-in fallback
+    assert "import fifo_pkg::*;" in top and "(fallback)" not in top
+
+    from uvm_tbgen.filelist import included_files, read_filelist
+
+    filelist = read_filelist(outdir / "fifo_tb.f")
+    assert [p.name for p in filelist.files] == [
+        "fifo.sv", "fifo_if.sv", "fifo_pkg.sv", "fifo_assertions.sv", "fifo_checker.sv",
+        "fifo_tb.sv",
+    ]
+    assert filelist.incdirs == [outdir.resolve() / "."]
+    assert [p.name for p in included_files(filelist.files, filelist.incdirs)] == includes
+
+
+def test_parallel_rendering_is_deterministic(tmp_path: Path):
+    """Thread and process workers write exactly what a serial run writes."""
+    dut = tmp_path / "par_dut.v"
+    ports = ",\n".join(f"  input [{i % 8}:0] data_in_{i}" for i in range(40))
+    dut.write_text(f"module par_dut(\n  input clk,\n  input rst_n,\n{ports},\n  output valid\n);\nendmodule\n")
+
+    outputs = {}
+    for jobs, executor in ((1, "thread"), (4, "thread"), (3, "process")):
+        outdir = tmp_path / f"out_{jobs}_{executor}"
+        summary = TBGenerator(
+            str(dut), str(outdir), "tb", verbose=False, jobs=jobs, executor=executor
+        ).generate()
+        assert summary.ok and len(summary.written) == len(COMPONENTS) + 1
+        outputs[jobs, executor] = (
+            summary.written,
+            {p.name: p.read_bytes() for p in outdir.iterdir() if p.suffix == ".sv"},
+        )
+    serial = outputs[1, "thread"]
+    assert all(result == serial for result in outputs.values())
+
+
+def test_component_failures_are_reported(tmp_path: Path, capsys):
+    """A broken template fails only its component, and the failure is returned."""
+    dut = tmp_path / "f_dut.v"
+    dut.write_text("module f_dut(input clk, output [3:0] q);\nendmodule\n")
+    templates = {name: "// {{ module }}" for name, _ in COMPONENTS}
+    templates["coverage.sv.j2"] = "{{ ports | no_such_filter }}"
+    templates["checker.sv.j2"] = "{{ 1 // 0 }}"
+    env = Environment(loader=DictLoader(templates))
+
+    summary = TBGenerator(str(dut), str(tmp_path / "out"), "tb", env=env, jobs=4).generate()
+
+    assert not summary.ok
+    assert [(f.component, f.file) for f in summary.failed] == [
+        ("coverage.sv.j2", "f_dut_coverage.sv"),
+        ("checker.sv.j2", "f_dut_checker.sv"),
+    ]
+    assert "by zero" in summary.failed[1].error
+    assert "f_dut_driver.sv" in summary.written
+    assert "Error: failed to generate f_dut_checker.sv" in capsys.readouterr().out
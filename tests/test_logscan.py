@@ -0,0 +1,169 @@
+import json
+from pathlib import Path
+
+from uvm_tbgen.cli import main
+from uvm_tbgen.logscan import LogWatcher, analyze_log, failure_signature
+
+
+def _feed(watcher, text):
+    reasons = [watcher.feed(line + "\n") for line in text.strip("\n").splitlines()]
+    watcher.close()
+    return [r for r in reasons if r]
+
+
+def test_counts_severities_and_ignores_report_summary():
+    watcher = LogWatcher()
+    _feed(watcher, """
+UVM_INFO @ 0: reporter [RNTST] Running test base_test...
+# UVM_WARNING tb.sv(10) @ 5: uvm_test_top [CFG] odd config
+UVM_ERROR env.sv(42) @ 100: uvm_test_top.env.sb [MISMATCH] expected 1 got 0
+UVM_INFO tb.sv(3) @ 110: uvm_test_top [ECHO] message mentions UVM_ERROR in text
+--- UVM Report Summary ---
+UVM_ERROR :    1
+UVM_ERROR env.sv(42) @ 100: ignored after the summary [X] x
+""")
+    assert watcher.severities == {
+        "UVM_INFO": 2, "UVM_WARNING": 1, "UVM_ERROR": 1, "UVM_FATAL": 0,
+    }
+    assert watcher.failed and watcher.summary() == "1 UVM_ERROR"
+
+
+def test_assertion_failures_in_simulator_formats():
+    watcher = LogWatcher()
+    _feed(watcher, """
+"tb_assertions.sv", 21: tb.u_chk.a_reset_propagation: started at 15ns failed at 25ns
+xmsim: *E,ASRTST (./m_assertions.sv,30): (time 40 NS) Assertion tb.u_chk.a_valid_not_stuck has failed
+# ** Error: [m_assertions] Reset did not propagate properly
+#    Time: 55 ns Started: 45 ns  Scope: tb.u_chk.a_reset_propagation File: m.sv Line: 21
+Error: [m_assertions] Signals wr and rd active simultaneously
+Time: 60 ns  Iteration: 0  Process: /tb/u_chk/a_wr_and_rd_mutually_exclusive  File: m.sv
+# ** Error: (vsim-3601) Iteration limit reached
+# ** Note: done
+""")
+    assert watcher.assertions == {
+        "a_reset_propagation": 2,
+        "a_valid_not_stuck": 1,
+        "a_wr_and_rd_mutually_exclusive": 1,
+    }
+    assert watcher.sim_errors == 1
+    assert watcher.summary() == "4 assertion failures, 1 simulator error"
+
+
+def test_abort_thresholds():
+    fatal = LogWatcher(abort_on_fatal=True)
+    reasons = _feed(fatal, "UVM_INFO @ 0: r [A] a\nUVM_FATAL @ 9: r [NOVIF] no vif\n")
+    assert reasons and reasons[0].startswith("UVM_FATAL")
+
+    limited = LogWatcher(max_errors=3)
+    reasons = _feed(limited, "\n".join(f"UVM_ERROR @ {t}: r [E] e" for t in range(5)))
+    assert limited.reason == "error limit reached (3 UVM_ERROR)"
+    assert len(reasons) == 3  # every later line repeats the reason
+
+
+LONG_LOG = """\
+UVM_INFO @ 0: reporter [RNTST] Running test base_test...
+UVM_INFO tb.sv(3) @ 10: uvm_test_top [SEQ] item 0
+UVM_WARNING tb.sv(10) @ 20: uvm_test_top [CFG] odd config
+UVM_INFO tb.sv(3) @ 30: uvm_test_top [SEQ] item 1
+UVM_ERROR env.sv(42) @ 40: uvm_test_top.env.sb [MISMATCH] expected 1 got 0
+UVM_INFO tb.sv(3) @ 50: uvm_test_top [SEQ] item 2
+"tb_assertions.sv", 21: tb.u_chk.a_reset_propagation: started at 55ns failed at 60ns
+UVM_ERROR env.sv(42) @ 70: uvm_test_top.env.sb [MISMATCH] expected 0 got 1
+--- UVM Report Summary ---
+UVM_ERROR :    2
+$finish called from file "uvm_root.svh", line 527.
+$finish at simulation time                  100
+"""
+
+
+def test_analyze_log_ids_context_and_end_time(tmp_path):
+    log = tmp_path / "sim.log"
+    log.write_text(LONG_LOG)
+    for use_mmap in (False, True):
+        summary = analyze_log(str(log), context=2, use_mmap=use_mmap)
+        assert summary.lines == 12
+        assert summary.ids == {
+            "UVM_INFO": {"RNTST": 1, "SEQ": 3},
+            "UVM_WARNING": {"CFG": 1},
+            "UVM_ERROR": {"MISMATCH": 2},
+        }
+        assert summary.assertions == {"a_reset_propagation": 1}
+        assert summary.end_time == "100"
+        failure = summary.first_failure
+        assert failure.line_number == 5 and "[MISMATCH] expected 1" in failure.line
+        assert [line[-6:] for line in failure.before] == ["config", "item 1"]
+        assert failure.after[0].endswith("item 2") and len(failure.after) == 2
+        assert summary.failed
+
+
+def test_analyze_log_first_failure_is_the_error_line(tmp_path):
+    """A Questa error block is reported at its "** Error" line, not at its scope line."""
+    log = tmp_path / "questa.log"
+    log.write_text(
+        "# UVM_INFO @ 0: reporter [RNTST] Running test\n"
+        "# ** Error: [chk] Reset did not propagate\n"
+        "#    Time: 60 ns Started: 55 ns  Scope: tb.u_chk.a_reset_propagation File: m.sv\n"
+        "# UVM_INFO @ 70: reporter [SEQ] item 3\n"
+        "# ** Error: (vsim-3421) Value out of range\n"
+    )
+    summary = analyze_log(str(log))
+    failure = summary.first_failure
+    assert failure.line_number == 2 and failure.line == "# ** Error: [chk] Reset did not propagate"
+    assert failure.before == ["# UVM_INFO @ 0: reporter [RNTST] Running test"]
+    assert failure.after[0].endswith("File: m.sv") and len(failure.after) == 3
+    assert summary.assertions == {"a_reset_propagation": 1} and summary.sim_errors == 1
+
+    # An error block at the very end is still the first failure
+    log.write_text("# UVM_INFO @ 0: reporter [RNTST] Running test\n# ** Error: late\n")
+    assert analyze_log(str(log)).first_failure.line_number == 2
+
+
+def test_analyze_log_end_time_formats(tmp_path):
+    formats = {
+        "Simulation complete via $finish(1) at time 250 NS + 17\n": "250 NS",
+        "$finish called at time : 300 ns : File \"tb.sv\" Line 9\n": "300 ns",
+        "# ** Note: $finish    : uvm_root.svh(517)\n#    Time: 400 ns  Iteration: 53\n": "400 ns",
+        "UVM_INFO @ 75ns: reporter [DONE] no finish message\n": "75ns",
+    }
+    for i, (text, expected) in enumerate(formats.items()):
+        log = tmp_path / f"{i}.log"
+        log.write_text(text)
+        summary = analyze_log(str(log))
+        assert summary.end_time == expected
+        assert not summary.failed and summary.first_failure is None
+
+
+def test_analyze_log_command_runs_logs_in_parallel(tmp_path, capsys):
+    good = tmp_path / "good.log"
+    good.write_text("UVM_INFO @ 0: reporter [RNTST] Running test\n")
+    bad = tmp_path / "bad.log"
+    bad.write_text(LONG_LOG)
+    missing = tmp_path / "missing.log"
+
+    rc = main(["analyze-log", "--json", "-j", "2", str(good), str(bad), str(missing)])
+    assert rc == 1
+    results = json.loads(capsys.readouterr().out)
+    assert [Path(r["path"]).name for r in results] == ["good.log", "bad.log", "missing.log"]
+    assert [r["failed"] for r in results] == [False, True, True]
+    assert results[1]["first_failure"]["line_number"] == 5
+    assert results[2]["error"]
+
+    assert main(["analyze-log", str(good)]) == 0
+    assert "good.log: OK" in capsys.readouterr().out
+
+
+def test_failure_signature_drops_volatile_tokens():
+    watcher = LogWatcher()
+    _feed(watcher, """
+UVM_INFO @ 0: reporter [RNTST] Running test base_test...
+# UVM_ERROR /work/seed_17/env.sv(42) @ 1250ns: uvm_test_top.env.agent[3].drv [DRV] data 8'h3f != 'h40 at 0x1000
+UVM_ERROR env.sv(42) @ 2000: uvm_test_top.env.sb [MISMATCH] expected 1 got 0
+""")
+    assert watcher.failure.startswith("# UVM_ERROR /work/seed_17/env.sv(42)")
+    assert failure_signature(watcher.failure) == "UVM_ERROR [DRV] data <hex> != <hex> at <hex>"
+    assert failure_signature(
+        '"tb.sv", 45: tb.u_chk.a_valid: started at 10ns failed at 20ns'
+    ) == '"tb.sv", <n>: *.a_valid: started at <time> failed at <time>'
+    assert failure_signature("compilation failed, see /runs/r1/compile.log") == (
+        "compilation failed, see compile.log"
+    )
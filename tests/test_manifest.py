@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pytest
+from jinja2 import DictLoader, Environment
+
+from uvm_tbgen import manifest
+from uvm_tbgen.generator import COMPONENTS, TBGenerator
+from uvm_tbgen.manifest import MANIFEST_NAME, write_stream_if_changed
+
+
+DUT_TEXT = """
+module inc_dut(input clk, input rst_n, input [7:0] din, output [7:0] dout);
+  // body
+endmodule
+"""
+
+
+def _setup(tmp_path: Path):
+    dut = tmp_path / "inc_dut.v"
+    dut.write_text(DUT_TEXT, encoding="utf-8")
+    return dut, tmp_path / "out"
+
+
+def _mtimes(outdir: Path):
+    return {p.name: p.stat().st_mtime_ns for p in outdir.iterdir()}
+
+
+def test_first_run_writes_everything_and_manifest(tmp_path: Path):
+    """A clean run writes the DUT copy, all components and the manifest."""
+    dut, outdir = _setup(tmp_path)
+    summary = TBGenerator(str(dut), str(outdir), "tb").generate()
+
+    assert summary.module == "inc_dut"
+    assert len(summary.written) == len(COMPONENTS) + 1
+    assert summary.skipped == []
+    data = json.loads((outdir / MANIFEST_NAME).read_text(encoding="utf-8"))
+    assert data["inputs"]["options"] == {"topname": "tb", "top_module": None, "params": {}}
+    assert data["outputs"]["driver.sv.j2"]["file"] == "inc_dut_driver.sv"
+
+
+def test_unchanged_inputs_skip_all_outputs(tmp_path: Path):
+    """Re-running with identical inputs touches no output file."""
+    dut, outdir = _setup(tmp_path)
+    TBGenerator(str(dut), str(outdir), "tb").generate()
+    before = _mtimes(outdir)
+
+    summary = TBGenerator(str(dut), str(outdir), "tb").generate()
+
+    assert summary.written == []
+    assert len(summary.skipped) == len(COMPONENTS) + 1
+    after = _mtimes(outdir)
+    del before[MANIFEST_NAME], after[MANIFEST_NAME]
+    assert before == after
+
+
+def test_dut_body_edit_only_recopies_dut(tmp_path: Path):
+    """Renders that produce identical bytes are not rewritten."""
+    dut, outdir = _setup(tmp_path)
+    TBGenerator(str(dut), str(outdir), "tb").generate()
+    dut.write_text(DUT_TEXT.replace("// body", "assign dout = din;"), encoding="utf-8")
+
+    summary = TBGenerator(str(dut), str(outdir), "tb").generate()
+
+    assert summary.written == ["inc_dut.v"]
+    assert "assign dout" in (outdir / "inc_dut.v").read_text(encoding="utf-8")
+
+
+def test_touched_files_are_hashed_once(tmp_path: Path, monkeypatch):
+    """After a touch the new stat is recorded, so the next run hashes nothing."""
+    dut, outdir = _setup(tmp_path)
+    TBGenerator(str(dut), str(outdir), "tb").generate()
+    later = dut.stat().st_mtime_ns + 10**9
+    for path in (dut, outdir / "inc_dut_driver.sv"):
+        os.utime(path, ns=(later, later))
+    assert TBGenerator(str(dut), str(outdir), "tb").generate().written == []
+
+    hashed = []
+    monkeypatch.setattr(manifest, "file_digest", lambda path: hashed.append(path))
+    assert TBGenerator(str(dut), str(outdir), "tb").generate().written == []
+    assert hashed == []
+
+
+def test_renamed_dut_is_copied_and_listed(tmp_path: Path):
+    """Renaming the DUT without editing it recopies it and updates the filelist."""
+    dut, outdir = _setup(tmp_path)
+    TBGenerator(str(dut), str(outdir), "tb").generate()
+    renamed = dut.rename(tmp_path / "renamed.v")
+
+    summary = TBGenerator(str(renamed), str(outdir), "tb").generate()
+
+    assert sorted(summary.written) == ["renamed.v", "tb.f"]
+    assert (outdir / "renamed.v").read_text(encoding="utf-8") == DUT_TEXT
+    filelist = (outdir / "tb.f").read_text(encoding="utf-8")
+    assert "renamed.v" in filelist and "inc_dut.v" not in filelist
+
+
+def test_deleted_or_changed_option_regenerates(tmp_path: Path):
+    """Missing outputs and changed options are regenerated."""
+    dut, outdir = _setup(tmp_path)
+    TBGenerator(str(dut), str(outdir), "tb").generate()
+    (outdir / "inc_dut_monitor.sv").unlink()
+
+    summary = TBGenerator(str(dut), str(outdir), "tb").generate()
+    assert summary.written == ["inc_dut_monitor.sv"]
+
+    summary = TBGenerator(str(dut), str(outdir), "tb2").generate()
+    assert "tb2.sv" in summary.written
+    assert "inc_dut_driver.sv" in summary.skipped
+
+
+def test_force_rerenders_everything(tmp_path: Path):
+    """force=True re-renders every component but still avoids identical writes."""
+    dut, outdir = _setup(tmp_path)
+    TBGenerator(str(dut), str(outdir), "tb").generate()
+
+    summary = TBGenerator(str(dut), str(outdir), "tb", force=True).generate()
+
+    assert summary.written == []
+    assert len(summary.skipped) == len(COMPONENTS) + 1
+
+
+def test_streamed_write_is_atomic(tmp_path: Path):
+    """Streamed outputs replace the target atomically and never leave partial files."""
+    target = tmp_path / "big.sv"
+    chunks = [f"assign w{i} = r{i};\n" for i in range(20000)]
+    text = "".join(chunks)
+
+    assert write_stream_if_changed(target, iter(chunks)) == (
+        True, hashlib.sha256(text.encode()).hexdigest()
+    )
+    assert target.read_text() == text
+    umask = os.umask(0)
+    os.umask(umask)
+    assert target.stat().st_mode & 0o777 == 0o666 & ~umask
+
+    before = target.stat().st_mtime_ns
+    written, _ = write_stream_if_changed(target, iter(chunks))
+    assert not written and target.stat().st_mtime_ns == before
+
+    def failing():
+        yield "partial output\n"
+        raise RuntimeError("template error")
+
+    with pytest.raises(RuntimeError):
+        write_stream_if_changed(target, failing())
+    assert target.read_text() == text
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["big.sv"]
+
+
+def test_failing_template_leaves_no_partial_output(tmp_path: Path):
+    dut, outdir = _setup(tmp_path)
+    templates = {name: "// {{ module }}\n" for name, _ in COMPONENTS}
+    templates["driver.sv.j2"] = "{% for p in ports %}// {{ p.name }}\n{% endfor %}{{ 1 // 0 }}"
+    env = Environment(loader=DictLoader(templates))
+
+    summary = TBGenerator(str(dut), str(outdir), "tb", env=env).generate()
+    assert "inc_dut_driver.sv" not in summary.written
+    assert not (outdir / "inc_dut_driver.sv").exists()
+    assert not [p for p in outdir.iterdir() if p.name.endswith(".tmp")]
+    assert (outdir / "inc_dut_monitor.sv").read_text() == "// inc_dut"
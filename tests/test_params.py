@@ -0,0 +1,87 @@
+from pathlib import Path
+
+import pytest
+
+from uvm_tbgen.generator import TBGenerator
+from uvm_tbgen.params import evaluate, fold_module, parse_overrides, range_width
+from uvm_tbgen.verilog import Param, parse_module
+
+
+def test_evaluate_constant_expressions():
+    env = {"DEPTH": 16, "W": 8}
+    assert evaluate("$clog2(DEPTH)-1", env) == 3
+    assert evaluate("W*2+1", env) == 17
+    assert evaluate("2**W>>4", env) == 16
+    assert evaluate("(W>=8)?W/3:1", env) == 2
+    assert evaluate("-7/2", env) == -3
+    assert evaluate("8'hFF+'b1", env) == 256
+    assert evaluate("UNKNOWN+1", env) is None
+    assert evaluate("4'bxx01", env) is None
+    assert evaluate("W/0", env) is None
+
+
+def test_range_width():
+    env = {"W": 8, "N": 4}
+    assert range_width("W-1:0", env) == 8
+    assert range_width("N-1:0][W-1:0", env) == 32
+    assert range_width("0:W-1", env) == 8
+    assert range_width("W*2+:N", env) == 4
+    assert range_width("X-1:0", env) is None
+
+
+def test_module_parameters_are_parsed():
+    module = parse_module(
+        """
+module fifo #(parameter int DATA_W = 8, DEPTH = 16, localparam AW = $clog2(DEPTH),
+              parameter type T = logic)(
+  input clk,
+  input [DATA_W-1:0] din,
+  output [AW:0] count
+);
+  localparam HALF = DEPTH / 2;
+  parameter LATE = 1;
+endmodule
+"""
+    )
+    assert module.params == (
+        Param("DATA_W", "8"),
+        Param("DEPTH", "16"),
+        Param("AW", "$clog2(DEPTH)", True),
+        Param("HALF", "DEPTH/2", True),
+        Param("LATE", "1", True),
+    )
+    folded = fold_module(module, {"DEPTH": "64", "AW": "1", "NOPE": "3"})
+    assert dict(folded.values) == {"DATA_W": 8, "DEPTH": 64, "AW": 6, "HALF": 32, "LATE": 1}
+    assert [p.width for p in folded.module.ports] == [1, 8, 7]
+    assert folded.ignored == ["AW", "NOPE"]
+
+
+def test_non_ansi_body_parameters():
+    module = parse_module(
+        "module m(a, b);\n parameter W = 4;\n input [W-1:0] a;\n output [2*W-1:0] b;\nendmodule\n"
+    )
+    assert module.params == (Param("W", "4"),)
+    folded = fold_module(module, {"W": "2+3"})
+    assert [p.width for p in folded.module.ports] == [5, 10]
+
+
+def test_parse_overrides():
+    assert parse_overrides(["W=16", " DEPTH = 2**4 "]) == {"W": "16", "DEPTH": "2**4"}
+    with pytest.raises(ValueError):
+        parse_overrides(["W"])
+
+
+def test_generate_with_param_override(tmp_path: Path):
+    dut = tmp_path / "pdut.v"
+    dut.write_text(
+        "module pdut #(parameter W = 4)(input clk, input [W-1:0] data_in,"
+        " output [$clog2(W):0] data_out);\nendmodule\n",
+        encoding="utf-8",
+    )
+    outdir = tmp_path / "out"
+    TBGenerator(str(dut), str(outdir), "tb", params={"W": "16"}).generate()
+
+    seq_item = (outdir / "pdut_seq_item.sv").read_text(encoding="utf-8")
+    assert "rand logic [15:0] data_in" in seq_item
+    assert "logic [4:0] data_out" in seq_item
+    assert "pdut #(.W(16)) dut_inst" in (outdir / "tb.sv").read_text(encoding="utf-8")
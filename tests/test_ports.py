@@ -0,0 +1,35 @@
+from uvm_tbgen.ports import Direction, Port, PortTable
+
+
+def _table():
+    return PortTable([
+        Port("clk"),
+        Port("data", "input", 8, "7:0"),
+        Port("q", "output", 4, "3:0"),
+        Port("io", "inout"),
+        Port("valid", "output"),
+    ])
+
+
+def test_views_filter_in_place():
+    """Direction views read the table without copying and support len/bool/index."""
+    table = _table()
+    assert [p.name for p in table.inputs] == ["clk", "data"]
+    assert [p.name for p in table.outputs] == ["q", "valid"]
+    assert len(table.outputs) == 2
+    assert table.outputs[-1] == Port("valid", "output")
+    assert table.inouts and not PortTable([Port("a")]).outputs
+    table.append("late", Direction.OUTPUT)
+    assert len(table.outputs) == 3
+
+
+def test_setitem_and_list_equality():
+    table = _table()
+    table[0] = Port("clk", "input", 2, "1:0")
+    assert table[0] == Port("clk", "input", 2, "1:0")
+    assert table == list(table)
+
+
+def test_columns_round_trip():
+    table = _table()
+    assert PortTable.from_columns(table.to_columns()) == table
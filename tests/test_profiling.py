@@ -0,0 +1,59 @@
+import json
+
+from uvm_tbgen import profiling
+from uvm_tbgen.cli import main
+
+
+def test_spans_export_json_and_chrome_trace(tmp_path):
+    profiler = profiling.Profiler()
+    with profiler.span("parse", dut="a.v") as info:
+        info["ports"] = 3
+    with profiler.span("parse"):
+        pass
+    profiling.set_lane(7)
+    with profiler.span("seed 1", "run"):
+        pass
+    profiling.set_lane(None)
+
+    trace_path = profiler.save(str(tmp_path / "prof.json"))
+    assert trace_path == tmp_path / "prof.trace.json"
+    report = json.loads((tmp_path / "prof.json").read_text())
+    assert report["totals"]["generate:parse"]["count"] == 2
+    assert report["spans"][0]["args"] == {"dut": "a.v", "ports": 3}
+    events = json.loads(trace_path.read_text())["traceEvents"]
+    assert {e["ph"] for e in events} == {"X"}
+    assert [e["tid"] for e in events if e["cat"] == "run"] == [7]
+
+
+def test_span_is_a_no_op_when_disabled():
+    assert profiling.active() is None
+    with profiling.span("anything", x=1) as info:
+        assert info == {"x": 1}
+
+
+def test_generate_profile_from_environment(tmp_path, monkeypatch, capsys):
+    dut = tmp_path / "dut.v"
+    dut.write_text("module dut(input clk, input rst, output [7:0] data_out);\nendmodule\n")
+    monkeypatch.setenv(profiling.PROFILE_ENV, str(tmp_path / "gen.json"))
+
+    assert main(["generate", "--dut", str(dut), "--outdir", str(tmp_path / "out")]) == 0
+    assert profiling.active() is None
+    names = {s["name"] for s in json.loads((tmp_path / "gen.json").read_text())["spans"]}
+    assert {"generate", "copy dut", "parse", "fold params", "analyze ports"} <= names
+    assert "render driver.sv.j2" in names and "render tb_top.sv.j2" in names
+    assert (tmp_path / "gen.trace.json").exists()
+
+
+def test_batch_profile_collects_worker_spans(tmp_path):
+    for name in ("a", "b"):
+        (tmp_path / f"{name}.v").write_text(f"module {name}(input clk);\nendmodule\n")
+    out = tmp_path / "prof.json"
+
+    rc = main([
+        "generate-batch", str(tmp_path / "a.v"), str(tmp_path / "b.v"),
+        "--outdir", str(tmp_path / "out"), "-j", "2", "--profile", str(out),
+    ])
+    assert rc == 0
+    spans = json.loads(out.read_text())["spans"]
+    duts = sorted(s["args"]["dut"] for s in spans if s["name"] == "generate")
+    assert duts == [str(tmp_path / "a.v"), str(tmp_path / "b.v")]
@@ -0,0 +1,114 @@
+import json
+import time
+from xml.etree import ElementTree
+
+import pytest
+
+from uvm_tbgen.cli import main
+from uvm_tbgen.manifest import file_digest
+from uvm_tbgen.results import ResultStore, RunRecord, parse_time
+
+XRUN_STUB = """
+from pathlib import Path
+if "-version" in args:
+    print("TOOL: xrun 23.09-s001")
+    return 0
+libdir = Path(args[args.index("-xmlibdirpath") + 1])
+if "-elaborate" in args:
+    (libdir / "compiled").write_text(" ".join(args))
+    return 0
+seed = int(args[args.index("-svseed") + 1])
+if seed % 3 == 0:
+    print(f"UVM_ERROR scb.sv(42) @ {seed * 10}ns: uvm_test_top.env.scb [CMP] "
+          f"expected 0x{seed:x} got 0x{seed + 1:x}")
+return 0
+"""
+
+
+def _record(started: float, seed: int, status: str = "PASS", **fields) -> RunRecord:
+    values = dict(
+        started=started, dut="/ip/fifo.sv", dut_sha256="ab", template_digest="cd",
+        generator_version="1.0", simulator="vcs", simulator_version="V-2023", seed=seed,
+        plusargs=[], status=status, returncode=0 if status == "PASS" else 1,
+        compile_time=0.0, run_time=1.0, elapsed=1.0, uvm_errors=0, uvm_fatals=0,
+        assertion_failures=0, reason="", failure="", signature="", log_file=f"seed_{seed}.log",
+    )
+    values.update(fields)
+    return RunRecord(**values)
+
+
+def test_runs_are_recorded_and_queried(tmp_path, run_simulation, stub_simulator, capsys):
+    stub_simulator("xrun", XRUN_STUB)
+    dut = tmp_path / "fifo.sv"
+    dut.write_text("module fifo(input clk);\nendmodule\n")
+    tb = tmp_path / "tb"
+    tb.mkdir()
+    (tb / "tb.sv").write_text("module tb; endmodule\n")
+    db = tmp_path / "results.db"
+    common = ["--simulator", "xcelium", "--dut", str(dut), "--testbench", str(tb),
+              "--results-db", str(db)]
+
+    assert run_simulation.main(common + ["--seeds", "1..9", "--plusarg", "+VERBOSE"]) == 1
+    assert run_simulation.main(common + ["--seed", "4"]) == 0
+    assert run_simulation.main(common + ["--seed", "5", "--no-results"]) == 0
+    capsys.readouterr()
+
+    with ResultStore(db) as store:
+        runs = store.query()
+        failed = store.query(failed=True, since=parse_time("1h"), dut="fifo.sv")
+    assert len(runs) == 10
+    assert runs[0].seed == 4 and runs[0].regression == "" and runs[0].compile_time > 0
+    assert sorted(r.seed for r in failed) == [3, 6, 9]
+    first = failed[0]
+    assert first.dut == str(dut.resolve()) and first.dut_sha256 == file_digest(dut)
+    assert first.simulator_version == "TOOL: xrun 23.09-s001"
+    assert first.plusargs == ["+VERBOSE"] and first.uvm_errors == 1
+    assert first.failure.startswith("UVM_ERROR scb.sv(42)")
+    # Times, values and the component path differ between seeds; the signature does not
+    assert {r.signature for r in failed} == {
+        "UVM_ERROR [CMP] expected <hex> got <hex>"
+    }
+
+    assert main(["results", "--db", str(db), "--failed", "--since", "1h", "--json"]) == 0
+    exported = json.loads(capsys.readouterr().out)
+    assert sorted(r["seed"] for r in exported) == [3, 6, 9]
+    assert main(["results", "--db", str(db), "--by-signature"]) == 0
+    assert "      3  last" in capsys.readouterr().out
+
+    junit = tmp_path / "results.xml"
+    assert main(["results", "--db", str(db), "--junit", str(junit)]) == 0
+    [suite] = ElementTree.parse(junit).getroot()
+    assert suite.get("name") == "fifo.xcelium"
+    assert (suite.get("tests"), suite.get("failures")) == ("10", "3")
+    assert suite.find("testcase[@name='seed_6']/failure").get("type") == first.signature
+
+    assert main(["results", "--db", str(db), "--until", "2000-01-01"]) == 0
+    assert "0 runs" in capsys.readouterr().out
+
+
+def test_bulk_insert_and_indexed_queries(tmp_path):
+    now = time.time()
+    records = [
+        _record(now - 86400 * (i % 30), i, "FAIL" if i % 7 == 0 else "PASS",
+                signature="UVM_ERROR [CMP] x" if i % 7 == 0 else "")
+        for i in range(5000)
+    ]
+    with ResultStore(tmp_path / "results.db") as store:
+        assert store.add_many(records) == 5000
+        recent = store.query(failed=True, since=parse_time("7d", now))
+        assert recent and all(r.status == "FAIL" and r.started >= now - 7 * 86400 for r in recent)
+        assert store.query(seed=14)[0].signature == "UVM_ERROR [CMP] x"
+        assert store.signatures()[0]["runs"] == len([r for r in records if r.status == "FAIL"])
+        plan = " ".join(str(row) for row in store._db.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM runs WHERE status != 'PASS' AND started >= ?",
+            (now,),
+        ))
+        assert "runs_failed" in plan
+
+
+def test_parse_time():
+    assert parse_time("2d", now=1_000_000.0) == 1_000_000.0 - 2 * 86400
+    assert parse_time("90m", now=10_000.0) == 10_000.0 - 5400
+    assert parse_time("2026-10-01") < parse_time("2026-10-01T08:00")
+    with pytest.raises(ValueError):
+        parse_time("last tuesday")
@@ -0,0 +1,324 @@
+import json
+from pathlib import Path
+
+import pytest
+
+XRUN_STUB = """
+from pathlib import Path
+if "-version" in args:
+    print("TOOL: xrun 23.09-s001")
+    return 0
+libdir = Path(args[args.index("-xmlibdirpath") + 1])
+if "-elaborate" in args:
+    (libdir / "compiled").write_text(" ".join(args))
+    with open(libdir.parent / "compiles.txt", "a") as f:
+        f.write("x\\n")
+    return 0
+assert "-R" in args and (libdir / "compiled").exists()
+seed = int(args[args.index("-svseed") + 1])
+print(f"UVM_INFO running seed {seed} {' '.join(a for a in args if a.startswith('+'))}")
+return 1 if seed % 3 == 0 else 0
+"""
+
+
+def _testbench(tmp_path: Path):
+    dut = tmp_path / "dut.v"
+    dut.write_text("module dut(input clk);\nendmodule\n")
+    tb = tmp_path / "tb"
+    tb.mkdir()
+    (tb / "tb.sv").write_text("module tb; endmodule\n")
+    return dut, tb
+
+
+def test_parse_seeds(run_simulation):
+    assert run_simulation.parse_seeds("1..3,7,2..4") == [1, 2, 3, 7, 4]
+    with pytest.raises(ValueError):
+        run_simulation.parse_seeds("5..1")
+    seeds = run_simulation.random_seeds(50, base=4)
+    assert len(set(seeds)) == 50 and seeds == run_simulation.random_seeds(50, base=4)
+
+
+def test_regression_workers(run_simulation):
+    assert run_simulation.regression_workers(100, jobs=16, licenses=4) == 4
+    assert run_simulation.regression_workers(2, jobs=16) == 2
+    assert run_simulation.regression_workers(10, jobs=0, licenses=None) >= 1
+
+
+def test_regression_with_stub_simulator(tmp_path, run_simulation, stub_simulator):
+    """Every seed gets its own directory, log and status."""
+    stub_simulator("xrun", XRUN_STUB)
+    dut, tb = _testbench(tmp_path)
+
+    results = run_simulation.run_regression(
+        "xcelium", str(dut), str(tb), list(range(1, 10)), jobs=4
+    )
+
+    assert [r.seed for r in results] == list(range(1, 10))
+    assert [r.seed for r in results if not r.passed] == [3, 6, 9]
+    for r in results:
+        assert Path(r.run_dir) == tb / "regression" / f"seed_{r.seed}"
+        assert f"running seed {r.seed}" in Path(r.log_file).read_text()
+        saved = json.loads((Path(r.run_dir) / "result.json").read_text())
+        assert saved["status"] == r.status
+    summary = json.loads((tb / "regression" / "summary.json").read_text())
+    assert (summary["passed"], summary["failed"]) == (6, 3)
+
+
+def test_regression_cli(tmp_path, run_simulation, stub_simulator, capsys):
+    stub_simulator("xrun", XRUN_STUB)
+    dut, tb = _testbench(tmp_path)
+
+    rc = run_simulation.main([
+        "--simulator", "xcelium", "--dut", str(dut), "--testbench", str(tb),
+        "--seeds", "1..2", "--regress-dir", str(tmp_path / "reg"),
+    ])
+    assert rc == 0
+    out = capsys.readouterr().out
+    assert "2 passed, 0 failed" in out
+    assert (tmp_path / "reg" / "seed_2" / "run.log").exists()
+
+
+def test_snapshot_is_compiled_once_and_invalidated(tmp_path, run_simulation, stub_simulator):
+    """Runs that only change seed or plusargs reuse the compiled snapshot."""
+    stub_simulator("xrun", XRUN_STUB)
+    dut, tb = _testbench(tmp_path)
+    compiles = tb / "snapshots" / "compiles.txt"
+
+    run_simulation.run_regression("xcelium", str(dut), str(tb), [1, 2, 4], jobs=3)
+    results = run_simulation.run_regression(
+        "xcelium", str(dut), str(tb), [5], plusargs=["+UVM_TESTNAME=smoke"]
+    )
+    assert compiles.read_text().count("x") == 1
+    assert "+UVM_TESTNAME=smoke" in Path(results[0].log_file).read_text()
+
+    dut.write_text("module dut(input clk, input rst);\nendmodule\n")
+    run_simulation.run_regression("xcelium", str(dut), str(tb), [1])
+    assert compiles.read_text().count("x") == 2
+    assert len(list((tb / "snapshots").glob("xcelium-*"))) == 2
+
+
+def test_generated_filelist_orders_sources(tmp_path, run_simulation, stub_simulator):
+    """Sources follow the filelist, and included class files are part of the snapshot key."""
+    from uvm_tbgen.generator import TBGenerator
+
+    stub_simulator("xrun", XRUN_STUB)
+    dut = tmp_path / "fifo.sv"
+    dut.write_text("module fifo(input clk, input [7:0] d, output [7:0] q);\nendmodule\n")
+    tb = tmp_path / "tb"
+    TBGenerator(str(dut), str(tb), "tb", verbose=False).generate()
+
+    sim = run_simulation.TestbenchSimulator("xcelium", str(dut), str(tb), "tb")
+    sources = [Path(s).name for s in sim.collect_sources()]
+    assert sources == [
+        "fifo.sv", "fifo_if.sv", "fifo_pkg.sv", "fifo_assertions.sv", "fifo_checker.sv", "tb.sv",
+    ]
+    assert sources.count("fifo.sv") == 1 and str(dut.resolve()) in sim.collect_sources()
+    assert sim.incdir_args() == [f"+incdir+{tb.resolve()}"]
+
+    compiles = tb / "snapshots" / "compiles.txt"
+    run_simulation.run_regression("xcelium", str(dut), str(tb), [1])
+    compiled = next((tb / "snapshots").glob("xcelium-*/compiled")).read_text()
+    assert f"+incdir+{tb.resolve()}" in compiled and "fifo_driver.sv" not in compiled
+    # The driver is only compiled through the package, but still triggers a recompile
+    driver = tb / "fifo_driver.sv"
+    driver.write_text(driver.read_text() + "// edited\n")
+    run_simulation.run_regression("xcelium", str(dut), str(tb), [1])
+    assert compiles.read_text().count("x") == 2
+
+
+VLOG_STUB = """
+from pathlib import Path
+if "-version" in args:
+    print("Model Technology ModelSim vlog 2023.1 Compiler")
+    return 0
+library = Path(args[args.index("-work") + 1])
+with open(library.parent.parent / "vlog_calls.txt", "a") as f:
+    f.write(" ".join(Path(a).name for a in args if a.endswith((".sv", ".v"))) + "\\n")
+return 0
+"""
+
+
+def test_modelsim_recompiles_only_changed_units(tmp_path, run_simulation, stub_simulator):
+    from uvm_tbgen.generator import TBGenerator
+
+    stub_simulator("vlog", VLOG_STUB)
+    stub_simulator("vlib", "from pathlib import Path\nPath(args[0]).mkdir()\n"
+                           "(Path(args[0]) / '_info').write_text('')\nreturn 0")
+    stub_simulator("vsim", 'print("UVM_INFO done")\nreturn 0')
+    dut = tmp_path / "fifo.sv"
+    dut.write_text("module fifo(input clk, input [7:0] d, output [7:0] q);\nendmodule\n")
+    tb = tmp_path / "tb"
+    TBGenerator(str(dut), str(tb), "tb", verbose=False).generate()
+    calls = tb / "snapshots" / "vlog_calls.txt"
+
+    def compile_once():
+        sim = run_simulation.TestbenchSimulator("modelsim", str(dut), str(tb), "tb")
+        assert sim.compile() is not None
+        return calls.read_text().splitlines() if calls.exists() else []
+
+    assert compile_once() == [
+        "fifo.sv fifo_if.sv fifo_pkg.sv fifo_assertions.sv fifo_checker.sv tb.sv"
+    ]
+    assert len(compile_once()) == 1  # nothing changed: the snapshot is reused
+
+    # A class file included by the package recompiles the package and its importers
+    driver = tb / "fifo_driver.sv"
+    driver.write_text(driver.read_text() + "// edited\n")
+    assert compile_once()[-1] == "fifo_pkg.sv tb.sv"
+    # A body-only RTL edit recompiles the RTL alone
+    dut.write_text(dut.read_text().replace("endmodule", "  assign q = d;\nendmodule"))
+    assert compile_once()[-1] == "fifo.sv"
+    # The interface is used by the package through virtual interfaces
+    iface = tb / "fifo_if.sv"
+    iface.write_text(iface.read_text() + "\n// edited\n")
+    assert compile_once()[-1] == "fifo_if.sv fifo_pkg.sv fifo_checker.sv tb.sv"
+    assert len(list((tb / "snapshots").glob("modelsim-*"))) == 1
+
+
+def test_compile_failure_fails_every_seed(tmp_path, run_simulation, stub_simulator):
+    stub_simulator("xrun", 'return 0 if "-version" in args else 2')
+    dut, tb = _testbench(tmp_path)
+    results = run_simulation.run_regression("xcelium", str(dut), str(tb), [1, 2])
+    assert [r.status for r in results] == ["ERROR", "ERROR"]
+    assert "compilation failed" in results[0].reason
+    assert not list((tb / "snapshots").glob("xcelium-*"))
+
+
+def test_missing_simulator_is_an_error(tmp_path, run_simulation, monkeypatch):
+    monkeypatch.setenv("PATH", str(tmp_path))
+    dut, tb = _testbench(tmp_path)
+    (result,) = run_simulation.run_regression("xcelium", str(dut), str(tb), [1])
+    assert result.status == "ERROR"
+
+
+HANGING_XRUN = XRUN_STUB.replace(
+    'seed = int(args[args.index("-svseed") + 1])',
+    'seed = int(args[args.index("-svseed") + 1])\n'
+    'if seed == 2:\n'
+    '    import subprocess, time\n'
+    '    child = subprocess.Popen(["sleep", "60"])\n'
+    '    (libdir.parent / "child.pid").write_text(str(child.pid))\n'
+    '    print("UVM_INFO hanging", flush=True)\n'
+    '    time.sleep(60)',
+)
+
+
+def _alive(pid: int, wait: float = 2.0) -> bool:
+    """Return True if ``pid`` is still running after up to ``wait`` seconds."""
+    import time
+
+    deadline = time.monotonic() + wait
+    while True:
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                running = "\nState:\tZ" not in f.read()
+        except FileNotFoundError:
+            running = False
+        if not running or time.monotonic() > deadline:
+            return running
+        time.sleep(0.05)
+
+
+@pytest.mark.skipif(not Path("/proc").is_dir(), reason="needs /proc")
+def test_run_timeout_kills_process_group(tmp_path, run_simulation, stub_simulator):
+    """A hung run is killed with its children; output is streamed to the callback."""
+    stub_simulator("xrun", HANGING_XRUN)
+    dut, tb = _testbench(tmp_path)
+    lines = []
+
+    results = run_simulation.run_regression(
+        "xcelium", str(dut), str(tb), [1, 2], timeouts={"run": 1.5},
+        on_line=lambda seed, line: lines.append((seed, line)),
+    )
+
+    assert [r.status for r in results] == ["PASS", "TIMEOUT"]
+    assert results[1].elapsed < 10
+    assert "timed out" in results[1].reason
+    assert (2, "UVM_INFO hanging\n") in lines
+    assert any(seed == 1 and "running seed 1" in line for seed, line in lines)
+    child = int((tb / "snapshots" / "child.pid").read_text())
+    assert not _alive(child)
+
+
+def test_cancellation_kills_running_simulations(tmp_path, run_simulation, stub_simulator):
+    import asyncio
+
+    stub_simulator("xrun", HANGING_XRUN)
+    dut, tb = _testbench(tmp_path)
+
+    async def scenario():
+        task = asyncio.ensure_future(
+            run_simulation.run_regression_async("xcelium", str(dut), str(tb), [2])
+        )
+        pid_file = tb / "snapshots" / "child.pid"
+        for _ in range(100):
+            if pid_file.exists() and pid_file.read_text():
+                break
+            await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return int(pid_file.read_text())
+
+    child = asyncio.run(scenario())
+    if Path("/proc").is_dir():
+        assert not _alive(child)
+
+
+NOISY_XRUN = XRUN_STUB.replace(
+    'seed = int(args[args.index("-svseed") + 1])',
+    'seed = int(args[args.index("-svseed") + 1])\n'
+    'import time\n'
+    'if seed == 1:\n'
+    '    print("UVM_ERROR env.sv(1) @ 10: sb [MISMATCH] bad", flush=True)\n'
+    '    return 0\n'
+    'if seed == 2:\n'
+    '    print("UVM_FATAL tb.sv(5) @ 0: uvm_test_top [NOVIF] no vif", flush=True)\n'
+    '    time.sleep(60)\n'
+    'if seed == 4:\n'
+    '    for t in range(1000):\n'
+    '        print(f"UVM_ERROR env.sv(1) @ {t}: sb [MISMATCH] bad", flush=True)\n'
+    '    time.sleep(60)',
+)
+
+
+def test_early_abort_on_fatal_and_error_limit(tmp_path, run_simulation, stub_simulator):
+    stub_simulator("xrun", NOISY_XRUN)
+    dut, tb = _testbench(tmp_path)
+
+    results = run_simulation.run_regression(
+        "xcelium", str(dut), str(tb), [1, 2, 4, 5], max_errors=10, abort_on_fatal=True,
+    )
+
+    by_seed = {r.seed: r for r in results}
+    # Exit status 0 but a UVM_ERROR in the log
+    assert by_seed[1].status == "FAIL" and by_seed[1].reason == "1 UVM_ERROR"
+    assert by_seed[2].reason.startswith("aborted: UVM_FATAL")
+    assert by_seed[2].uvm_fatals == 1
+    assert by_seed[4].reason == "aborted: error limit reached (10 UVM_ERROR)"
+    assert by_seed[4].uvm_errors == 10
+    assert max(r.elapsed for r in results) < 10
+    assert by_seed[5].passed
+    saved = json.loads((Path(by_seed[4].run_dir) / "result.json").read_text())
+    assert saved["reason"].startswith("aborted")
+
+
+def test_regression_profile(tmp_path, run_simulation, stub_simulator, capsys):
+    stub_simulator("xrun", XRUN_STUB)
+    dut, tb = _testbench(tmp_path)
+    out = tmp_path / "sim_profile.json"
+
+    run_simulation.main([
+        "--simulator", "xcelium", "--dut", str(dut), "--testbench", str(tb),
+        "--seeds", "1,2,4,5", "-j", "2", "--profile", str(out),
+    ])
+    spans = json.loads(out.read_text())["spans"]
+    compile_span = next(s for s in spans if s["name"] == "compile")
+    assert compile_span["category"] == "compile"
+    xrun = [s for s in spans if s["name"] == "xrun"]
+    assert {s["category"] for s in xrun} == {"compile", "run"}
+    assert all("cpu_user" in s["args"] and "maxrss_kb" in s["args"] for s in xrun)
+    seeds = [s for s in spans if s["category"] == "run" and s["name"].startswith("seed")]
+    assert sorted(s["args"]["seed"] for s in seeds) == [1, 2, 4, 5]
+    assert {s["tid"] for s in seeds} <= {1, 2}
+    assert (tmp_path / "sim_profile.trace.json").exists()
@@ -0,0 +1,106 @@
+import os
+from pathlib import Path
+import time
+
+from uvm_tbgen.runcache import RunCache
+
+# Logs compiles and runs to calls.txt in the testbench directory; seeds divisible by
+# 3 report a UVM_ERROR and seeds divisible by 5 just exit non-zero.
+XRUN_STUB = """
+from pathlib import Path
+if "-version" in args:
+    print("TOOL: xrun 23.09-s001")
+    return 0
+libdir = Path(args[args.index("-xmlibdirpath") + 1])
+if "-elaborate" in args:
+    (libdir / "compiled").write_text(" ".join(args))
+    with open(libdir.parent.parent / "calls.txt", "a") as f:
+        f.write("compile\\n")
+    return 0
+seed = int(args[args.index("-svseed") + 1])
+with open(libdir.parent.parent / "calls.txt", "a") as f:
+    f.write(f"run {seed}\\n")
+print(f"UVM_INFO running seed {seed}")
+Path(args[args.index("-l") + 1]).write_text(f"UVM_INFO running seed {seed}\\n")
+if seed % 3 == 0:
+    print(f"UVM_ERROR scb.sv(1) @ {seed}: scb [CMP] mismatch")
+return 2 if seed % 5 == 0 else 0
+"""
+
+
+def _calls(tb: Path) -> list:
+    calls = (tb / "calls.txt").read_text().splitlines()
+    (tb / "calls.txt").unlink()
+    return calls
+
+
+def test_unchanged_runs_come_from_the_cache(tmp_path, run_simulation, stub_simulator, capsys):
+    stub_simulator("xrun", XRUN_STUB)
+    dut = tmp_path / "dut.v"
+    dut.write_text("module dut(input clk);\nendmodule\n")
+    tb = tmp_path / "tb"
+    tb.mkdir()
+    (tb / "tb.sv").write_text("module tb; endmodule\n")
+    regress = ["--simulator", "xcelium", "--dut", str(dut), "--testbench", str(tb),
+               "--seeds", "1..6", "-j", "2", "--no-results"]
+
+    assert run_simulation.main(regress) == 1
+    assert len(_calls(tb)) == 7
+    capsys.readouterr()
+
+    # Passes and UVM_ERROR failures are reused; the bare exit status 2 of seed 5 is not
+    assert run_simulation.main(regress) == 1
+    # The compiled snapshot is still current, so only seed 5 is simulated
+    assert _calls(tb) == ["run 5"]
+    out = capsys.readouterr().out
+    assert "seed 3 FAIL (cached)" in out and "5 cached" in out
+    first_log = tb / "regression" / "seed_3" / "run.log"
+    assert f"{first_log}  (1 UVM_ERROR)  [cached]" in out
+
+    assert run_simulation.main(regress + ["--plusarg", "+VERBOSE"]) == 1
+    assert len(_calls(tb)) == 6
+    assert run_simulation.main(regress + ["--force"]) == 1
+    assert len(_calls(tb)) == 6
+    assert run_simulation.main(regress + ["--recompile"]) == 1
+    # A recompile never answers from the cache
+    calls = _calls(tb)
+    assert calls[0] == "compile" and sorted(calls[1:]) == [f"run {s}" for s in range(1, 7)]
+    (tb / "tb.sv").write_text("module tb; initial; endmodule\n")
+    assert run_simulation.main(regress) == 1
+    assert len(_calls(tb)) == 7
+
+    single = ["--simulator", "xcelium", "--dut", str(dut), "--testbench", str(tb),
+              "--seed", "7", "--no-results"]
+    assert run_simulation.main(single) == 0
+    assert _calls(tb) == ["run 7"]
+    capsys.readouterr()
+    assert run_simulation.main(single) == 0
+    assert "[CACHED] Seed 7 PASS" in capsys.readouterr().out
+    assert not (tb / "calls.txt").exists()
+    assert run_simulation.main(single + ["--recompile"]) == 0
+    assert _calls(tb) == ["compile", "run 7"]
+
+
+def test_entries_expire_follow_their_log_and_are_evicted(tmp_path):
+    cache = RunCache(tmp_path / "runs", ttl=3600, max_entries=3)
+    log = tmp_path / "run.log"
+    log.write_text("UVM_INFO ok\n")
+    cache.put("a", {"status": "PASS"}, str(log))
+    assert cache.get("a") == {"status": "PASS"}
+
+    # The recorded log was overwritten by another run
+    log.write_text("UVM_INFO another run\n")
+    assert cache.get("a") is None and not (tmp_path / "runs" / "a.json").exists()
+
+    cache.put("b", {"status": "PASS"}, str(log))
+    old = time.time() - 7200
+    os.utime(tmp_path / "runs" / "b.json", (old, old))
+    cache.ttl = 60
+    cache.put("c", {"status": "PASS"}, str(log))
+    cache.evict()
+    assert sorted(p.name for p in (tmp_path / "runs").iterdir()) == ["c.json"]
+
+    for key in "defg":
+        cache.put(key, {"status": "PASS"}, str(log))
+    cache.evict()
+    assert len(list((tmp_path / "runs").iterdir())) == 3
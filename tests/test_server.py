@@ -0,0 +1,124 @@
+import os
+from pathlib import Path
+import threading
+
+import pytest
+
+from uvm_tbgen import client
+from uvm_tbgen.cli import main
+from uvm_tbgen.logscan import analyze_log
+from uvm_tbgen.server import serve
+from uvm_tbgen.uvm_tbgen.parser import parse_dut
+
+DUT = """
+module fifo #(parameter int W = 8) (
+  input  logic         clk,
+  input  logic         rst_n,
+  input  logic [W-1:0] wdata,
+  output logic [W-1:0] rdata,
+  output logic         valid
+);
+endmodule
+"""
+
+LOG = """\
+UVM_INFO tb.sv(10) @ 0: reporter [START] go
+UVM_ERROR tb.sv(20) @ 50: reporter [CMP] mismatch
+$finish called at time : 100 ns
+"""
+
+
+@pytest.fixture
+def daemon():
+    """Serve on the test socket from a thread; yields the socket path."""
+    path = os.environ[client.SOCKET_ENV]
+    ready = threading.Event()
+    thread = threading.Thread(
+        target=serve, args=(path,), kwargs=dict(ready=ready, log=lambda message: None)
+    )
+    thread.start()
+    assert ready.wait(30)
+    yield path
+    client.call("shutdown")
+    thread.join(10)
+    assert not os.path.exists(path)
+
+
+def _outputs(outdir: Path) -> dict:
+    return {p.name: p.read_text() for p in sorted(outdir.glob("*.sv"))}
+
+
+def test_daemon_results_match_in_process(daemon, tmp_path, capsys):
+    dut = tmp_path / "fifo.sv"
+    dut.write_text(DUT)
+    log = tmp_path / "sim.log"
+    log.write_text(LOG)
+
+    assert client.call("ping")["version"] == client.__version__
+    assert main(["generate", "--dut", str(dut), "--outdir", str(tmp_path / "a")]) == 0
+    served = capsys.readouterr().out
+    assert "Testbench generation complete! 16 files written" in served
+    assert main(["generate", "--dut", str(dut), "--outdir", str(tmp_path / "b"),
+                 "--no-daemon"]) == 0
+    assert capsys.readouterr().out.splitlines()[2:] == served.splitlines()[2:]
+    assert _outputs(tmp_path / "a") == _outputs(tmp_path / "b")
+
+    result = client.call("generate", dict(dut=str(dut), outdir=str(tmp_path / "a")))
+    assert result["written"] == [] and result["failed"] == []
+
+    params = {"W": "16"}
+    served = client.call("parse", dict(dut=str(dut), params=params))
+    assert served == parse_dut(str(dut), params=params)
+    assert served["ports"][2]["bits"] == 16
+
+    [summary] = client.call("analyze", dict(logs=[str(log)]))
+    local = analyze_log(str(log))
+    assert summary["failed"] and summary["end_time"] == local.end_time == "100 ns"
+    assert summary["ids"] == local.ids
+    assert main(["analyze-log", str(log)]) == 1
+
+    with pytest.raises(client.DaemonError) as info:
+        client.call("generate", dict(dut=str(tmp_path / "missing.sv"), outdir=str(tmp_path)))
+    assert "DUT not found" in str(info.value)
+    with pytest.raises(client.DaemonError) as info:
+        client.call("no_such_method")
+    assert info.value.code == client.METHOD_NOT_FOUND
+
+
+def test_client_falls_back_without_a_compatible_daemon(daemon, tmp_path, monkeypatch):
+    dut = tmp_path / "fifo.sv"
+    dut.write_text(DUT)
+
+    # A daemon of another version is treated as absent
+    version = client.__version__
+    monkeypatch.setattr(client, "__version__", "0.0.0-other")
+    with pytest.raises(client.DaemonUnavailable):
+        client.call("ping")
+    assert main(["generate", "--dut", str(dut), "--outdir", str(tmp_path / "a")]) == 0
+    assert (tmp_path / "a" / "fifo_env.sv").exists()
+    monkeypatch.setattr(client, "__version__", version)
+
+    # A socket of another user (e.g. planted in /tmp) is never connected to
+    uid = os.getuid()
+    with monkeypatch.context() as m:
+        m.setattr(client.os, "getuid", lambda: uid + 1)
+        with pytest.raises(client.DaemonUnavailable, match="another user"):
+            client.call("ping")
+
+    # A second daemon on the same socket refuses to start
+    with pytest.raises(RuntimeError):
+        serve(daemon, log=lambda message: None)
+
+
+def test_cli_works_without_a_daemon(tmp_path, monkeypatch):
+    dut = tmp_path / "fifo.sv"
+    dut.write_text(DUT)
+    stale = tmp_path / "stale.sock"
+    stale.write_text("")
+    monkeypatch.setenv(client.SOCKET_ENV, str(stale))
+
+    with pytest.raises(client.DaemonUnavailable):
+        client.call("ping")
+    assert main(["generate", "--dut", str(dut), "--outdir", str(tmp_path / "out")]) == 0
+    assert main(["parse", "--dut", str(dut), "--json"]) == 0
+    assert (tmp_path / "out" / "fifo_env.sv").exists()
@@ -0,0 +1,55 @@
+import json
+import os
+
+from uvm_tbgen.cli import main
+from uvm_tbgen.simulators import detect_simulators
+
+VLOG_STUB = """
+with open(__file__ + ".calls", "a") as f:
+    f.write(" ".join(args) + "\\n")
+print("Model Technology ModelSim vlog 2023.1 Compiler")
+return 0
+"""
+
+
+def _calls(script):
+    path = script.parent / (script.name + ".calls")
+    return path.read_text().splitlines() if path.exists() else []
+
+
+def test_detection_is_cached_until_an_executable_changes(stub_simulator):
+    vlog = stub_simulator("vlog", VLOG_STUB)
+    search_path = str(vlog.parent)
+
+    found = detect_simulators(search_path=search_path)
+    assert list(found) == ["modelsim"]
+    assert found["modelsim"].version == "Model Technology ModelSim vlog 2023.1 Compiler"
+    assert found["modelsim"].commands == {"vlog": str(vlog)}
+    assert detect_simulators(search_path=search_path) == found
+    assert _calls(vlog) == ["-version"]
+
+    # A new tool on PATH, and an upgraded one, both invalidate the cache
+    stub_simulator("xrun", 'print("TOOL: xrun 23.09-s001")\nreturn 0')
+    found = detect_simulators(search_path=search_path)
+    assert found["xcelium"].version == "TOOL: xrun 23.09-s001"
+    assert len(_calls(vlog)) == 2
+    st = vlog.stat()
+    os.utime(vlog, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    detect_simulators(search_path=search_path)
+    detect_simulators(search_path=search_path)
+    assert len(_calls(vlog)) == 3
+
+
+def test_detect_command_json(stub_simulator, monkeypatch, capsys):
+    vlog = stub_simulator("vlog", VLOG_STUB)
+    monkeypatch.setenv("PATH", str(vlog.parent))
+
+    assert main(["detect", "--json"]) == 0
+    data = json.loads(capsys.readouterr().out)
+    assert data["modelsim"]["version"].startswith("Model Technology")
+    assert data["modelsim"]["commands"] == {"vlog": str(vlog)}
+
+    assert main(["detect"]) == 0
+    assert "modelsim" in capsys.readouterr().out
+    assert main(["detect", "--refresh"]) == 0
+    assert len(_calls(vlog)) == 2
@@ -0,0 +1,110 @@
+import json
+
+from uvm_tbgen import triage as triage_module
+from uvm_tbgen.cli import main
+from uvm_tbgen.triage import find_logs, first_failure, triage
+
+PREAMBLE = """\
+UVM_INFO @ 0: reporter [RNTST] Running test base_test...
+UVM_INFO tb.sv(3) @ 10: uvm_test_top [ECHO] checking a_valid and Error counters
+"""
+
+FAILURES = {
+    "cmp": "UVM_ERROR scb.sv(42) @ {t}ns: uvm_test_top.env.scb [CMP] expected 0x{v:x} got 0x{w:x}\n",
+    "fatal": "UVM_FATAL agent.sv(9) @ {t}: uvm_test_top.env.agent[{i}].drv [TIMEOUT] no grant\n",
+    "assert": (
+        "# ** Error: [chk] Reset did not propagate\n"
+        "#    Time: {t} ns Started: {s} ns  Scope: tb.u_chk.a_reset_propagation File: m.sv Line: 21\n"
+    ),
+}
+SUMMARY = """\
+--- UVM Report Summary ---
+UVM_ERROR :    1
+"""
+
+
+def _regression(root, seeds=60):
+    """seed % 4: 0 passes, 1 cmp, 2 fatal, 3 assertion (or a timeout for seed % 12 == 3)."""
+    for seed in range(seeds):
+        run = root / f"seed_{seed}"
+        run.mkdir(parents=True)
+        kind = seed % 4
+        elapsed = 100.0 - seed
+        status, reason = "FAIL", ""
+        text = PREAMBLE
+        if kind == 0:
+            status = "PASS"
+        elif kind == 3 and seed % 12 == 3:
+            status, reason = "TIMEOUT", "run phase timed out after 60s"
+        else:
+            name = ("cmp", "fatal", "assert")[kind - 1]
+            text += FAILURES[name].format(t=seed * 10, s=seed * 10 - 5, v=seed, w=seed + 1, i=seed)
+            text += "UVM_ERROR later.sv(1) @ 999: uvm_test_top [LATER] not the first\n"
+        text += SUMMARY + "UVM_ERROR extra line after the summary\n"
+        (run / "run.log").write_text(text)
+        (run / "xcelium_simulation.log").write_text(text)
+        (run / "result.json").write_text(json.dumps(
+            dict(seed=seed, status=status, reason=reason, elapsed=elapsed)
+        ))
+
+
+def test_clusters_failures_with_fastest_representative(tmp_path):
+    _regression(tmp_path / "regression")
+    logs = find_logs([tmp_path / "regression"])
+    assert len(logs) == 60 and all(log.endswith("run.log") for log in logs)
+
+    clusters = triage(logs, jobs=2)
+    assert triage(logs, jobs=1) == clusters
+    by_signature = {c.signature: c for c in clusters}
+    assert sorted(by_signature) == sorted([
+        "UVM_ERROR [CMP] expected <hex> got <hex>",
+        "UVM_FATAL [TIMEOUT] no grant",
+        "# ** Error: [chk] Reset did not propagate # Time: <time> Started: <time> "
+        "Scope: *.a_reset_propagation File: m.sv Line: <n>",
+        "run phase timed out after <time>",
+    ])
+    cmp = by_signature["UVM_ERROR [CMP] expected <hex> got <hex>"]
+    assert len(cmp.runs) == 15
+    # Seeds run for 100 - seed seconds, so the highest seed is the fastest
+    assert cmp.representative.seed == 57 and cmp.representative.elapsed == 43.0
+    assert cmp.representative.message.startswith("UVM_ERROR scb.sv(42) @ 570ns")
+    assert [len(c.runs) for c in clusters] == [15, 15, 10, 5]
+
+
+def test_first_failure_stops_at_report_summary(tmp_path, monkeypatch):
+    log = tmp_path / "sim.log"
+    log.write_text(PREAMBLE + SUMMARY + "UVM_ERROR after.sv(1) @ 5: x [LATE] ignored\n")
+    assert first_failure(log) == ""
+    # Nothing after the summary is fed to the watcher
+    fed = []
+
+    class CountingWatcher(triage_module.LogWatcher):
+        def feed(self, line):
+            fed.append(line)
+            return super().feed(line)
+
+    monkeypatch.setattr(triage_module, "LogWatcher", CountingWatcher)
+    log.write_text(PREAMBLE + SUMMARY + "UVM_ERROR :    1\n" * 10000)
+    assert first_failure(log) == "" and len(fed) < 5
+    monkeypatch.undo()
+    log.write_text("")
+    assert first_failure(log) == ""
+    log.write_text(PREAMBLE + "Error: [chk] wr and rd together\nplain line\nplain\nplain\n")
+    assert first_failure(log) == "Error: [chk] wr and rd together"
+
+    # A marker crossing the boundary between two search windows
+    filler = ("x" * 99 + "\n") * 655 + "x" * 28 + "\n"
+    failing = "UVM_ERROR t.sv(1) @ 5: x [ID] late"
+    log.write_text(filler + failing + "\n")
+    assert len(filler) + failing.index("RROR") == 65534  # "RROR" spans offset 65536
+    assert first_failure(log) == failing
+
+
+def test_triage_command(tmp_path, capsys):
+    _regression(tmp_path / "regression", seeds=8)
+    assert main(["triage", str(tmp_path / "regression"), "--all"]) == 1
+    out = capsys.readouterr().out
+    assert "6 of 8 runs failed, 4 signatures" in out
+    assert "representative: seed 5, 95.0s" in out
+    assert main(["triage", str(tmp_path / "regression" / "seed_0" / "run.log"), "--json"]) == 0
+    assert json.loads(capsys.readouterr().out) == []
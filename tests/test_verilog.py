@@ -0,0 +1,185 @@
+import pytest
+
+from uvm_tbgen.verilog import parse_file, parse_module, parse_modules, tokenize
+
+
+def _ports(module):
+    return {p.name: (p.direction, p.width) for p in module.ports}
+
+
+def test_comments_and_directives_are_ignored():
+    """Ports inside comments, strings and directives are not picked up."""
+    module = parse_module(
+        """
+`timescale 1ns/1ps
+`define WIDTH 8 // input fake_define
+// module commented(input nope);
+module real_one(
+  input clk, /* input fake_block, */
+  output [3:0] q  // output fake_line
+);
+  initial $display("input fake_string;");
+endmodule
+"""
+    )
+    assert module.name == "real_one"
+    assert [p.name for p in module.ports] == ["clk", "q"]
+
+
+def test_ansi_types_and_inherited_directions():
+    """Types are skipped and bare names inherit direction and range."""
+    module = parse_module(
+        "module m(input wire clk, rst_n, input logic signed [7:0] a, b,"
+        " output reg [15:0] q, inout tri [1:0] io);\nendmodule\n"
+    )
+    assert _ports(module) == {
+        "clk": ("input", 1),
+        "rst_n": ("input", 1),
+        "a": ("input", 8),
+        "b": ("input", 8),
+        "q": ("output", 16),
+        "io": ("inout", 2),
+    }
+
+
+def test_non_ansi_header_uses_body_declarations():
+    """Non-ANSI ports keep header order and take direction from the body."""
+    module = parse_module(
+        """
+module legacy(clk, data, result);
+  input clk;
+  input [7:0] data;
+  output [31:0] result;
+  reg [31:0] result;
+endmodule
+"""
+    )
+    assert [p.name for p in module.ports] == ["clk", "data", "result"]
+    assert _ports(module)["result"] == ("output", 32)
+
+
+def test_parameterized_ranges_keep_their_text():
+    """Ranges that are not plain numbers are preserved as text."""
+    module = parse_module(
+        "module p #(parameter W = 8) (input [W-1:0] d, output [$clog2(W)-1:0] idx);\nendmodule\n"
+    )
+    ports = {p.name: p for p in module.ports}
+    assert ports["d"].range == "W-1:0"
+    assert ports["idx"].range == "$clog2(W)-1:0"
+
+
+def test_stops_at_endmodule_and_skips_subroutines():
+    """Function/task arguments and later modules do not add ports."""
+    text = """
+module first(input a);
+  function automatic int f(input int x); return x; endfunction
+  task t; input y; begin end endtask
+  assert property (@(posedge a) a |-> a);
+  output b;
+endmodule
+module second(input c);
+  input d;
+endmodule
+"""
+    assert [p.name for p in parse_module(text).ports] == ["a", "b"]
+    assert [m.name for m in parse_modules(text)] == ["first", "second"]
+    assert [p.name for p in parse_module(text, "second").ports] == ["c", "d"]
+
+
+def test_conditional_headers_keep_later_modules():
+    """Only the first branch of a conditional header is parsed."""
+    inline = (
+        "module e(input a,`ifdef X output y);`else output z);`endif endmodule "
+        "module f(input g); endmodule"
+    )
+    assert {m.name: _ports(m) for m in parse_modules(inline)} == {
+        "e": {"a": ("input", 1), "y": ("output", 1)},
+        "f": {"g": ("input", 1)},
+    }
+
+    text = """
+module a(
+`ifdef WIDE
+  input [7:0] d,
+  output [7:0] q);
+`elsif NARROW
+  input [3:0] d,
+  output [3:0] q);
+`else
+  input d, output q);
+`endif
+endmodule
+module b(input clk, output reg r);
+endmodule
+module c(inout [1:0] io);
+endmodule
+"""
+    assert {m.name: _ports(m) for m in parse_modules(text)} == {
+        "a": {"d": ("input", 8), "q": ("output", 8)},
+        "b": {"clk": ("input", 1), "r": ("output", 1)},
+        "c": {"io": ("inout", 2)},
+    }
+    # A stray ")" or a missing endmodule does not run into the next module
+    broken = "module e(input a)); output ) z;\nmodule f(input g); endmodule"
+    assert [m.name for m in parse_modules(broken)] == ["e", "f"]
+
+
+def test_clocking_block_signals_are_not_ports():
+    module = parse_module(
+        """
+module d(input clk, output q);
+  clocking cb @(posedge clk);
+    input #1 sig_in;
+    output sig_out;
+  endclocking
+  default clocking cb;
+  output late;
+endmodule
+"""
+    )
+    assert [p.name for p in module.ports] == ["clk", "q", "late"]
+
+
+def test_missing_module_raises():
+    with pytest.raises(ValueError):
+        parse_module("// nothing here\n")
+    with pytest.raises(ValueError, match="'other'"):
+        parse_module("module m; endmodule", "other")
+
+
+def test_tokenize_sized_literals():
+    assert list(tokenize("a = 8'hFF + 'b1;")) == ["a", "=", "8'hFF", "+", "'b1", ";"]
+
+
+def test_parse_file_stops_at_selected_module(tmp_path):
+    """Memory-mapped parsing never reads past the selected endmodule."""
+    netlist = tmp_path / "netlist.v"
+    netlist.write_bytes(
+        b"module cell(input a, output y);\nendmodule\n"
+        b"module top(input clk, input [63:0] d, output [63:0] q);\nendmodule\n"
+        + b"\xff\xfe not even text" * 1000
+    )
+
+    assert parse_file(netlist).name == "cell"
+    top = parse_file(netlist, "top")
+    assert [(p.name, p.width) for p in top.ports] == [("clk", 1), ("d", 64), ("q", 64)]
+
+
+def test_legacy_parse_dut_uses_streaming_parser(tmp_path):
+    """parse_dut keeps its dict format with raw range text and adds folded widths."""
+    from uvm_tbgen.uvm_tbgen.parser import parse_dut
+
+    dut = tmp_path / "dut.v"
+    dut.write_text(
+        "module other; endmodule\n"
+        "module dut #(parameter W = 4)(input [W-1:0] a, output b);\nendmodule\n"
+    )
+
+    assert parse_dut(str(dut), "dut", params={"W": "8"}) == {
+        "module": "dut",
+        "params": {"W": 8},
+        "ports": [
+            {"name": "a", "dir": "input", "width": "W-1:0", "bits": 8},
+            {"name": "b", "dir": "output", "width": "", "bits": 1},
+        ],
+    }
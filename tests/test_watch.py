@@ -0,0 +1,63 @@
+import queue
+import shutil
+import threading
+
+import pytest
+
+from uvm_tbgen.generator import TEMPLATE_DIR, TBGenerator
+from uvm_tbgen.watch import watch
+
+DUT = """
+module fifo (
+  input  logic       clk,
+  input  logic       rst_n,
+  input  logic [7:0] wdata,
+  output logic [7:0] rdata
+);
+  assign rdata = wdata;
+endmodule
+"""
+
+
+@pytest.mark.parametrize("poll", [False, True], ids=["inotify", "poll"])
+def test_dut_edit_keeps_components_and_template_edit_renders_one(tmp_path, poll):
+    templates = tmp_path / "templates"
+    shutil.copytree(TEMPLATE_DIR, templates)
+    dut = tmp_path / "rtl" / "fifo.sv"
+    dut.parent.mkdir()
+    dut.write_text(DUT)
+    gen = TBGenerator(str(dut), str(tmp_path / "out"), "fifo_tb", verbose=False)
+    gen.template_dir = templates
+
+    summaries = queue.Queue()
+    stop = threading.Event()
+    thread = threading.Thread(target=watch, args=([gen],), kwargs=dict(
+        debounce=0.1, poll=poll, interval=0.05, stop=stop,
+        on_generate=lambda g, summary: summaries.put(summary), log=lambda message: None,
+    ))
+    thread.start()
+    try:
+        first = summaries.get(timeout=30)
+        assert len(first.written) == 16
+
+        # A body-only edit, saved twice in quick succession, is one regeneration
+        dut.write_text(DUT.replace("assign", "// edited\n  assign"))
+        dut.write_text(DUT.replace("assign", "// edited twice\n  assign"))
+        summary = summaries.get(timeout=30)
+        assert summary.written == ["fifo.sv"]
+        with pytest.raises(queue.Empty):
+            summaries.get(timeout=0.5)
+
+        driver = templates / "driver.sv.j2"
+        driver.write_text(driver.read_text() + "\n// local change\n")
+        summary = summaries.get(timeout=30)
+        assert summary.written == ["fifo_driver.sv"]
+        assert "// local change" in (tmp_path / "out" / "fifo_driver.sv").read_text()
+
+        # A new port changes the interface, so every component is rendered again
+        dut.write_text(DUT.replace("  output", "  input  logic       en,\n  output"))
+        summary = summaries.get(timeout=30)
+        assert {"fifo_if.sv", "fifo_seq_item.sv", "fifo_tb.sv"} <= set(summary.written)
+    finally:
+        stop.set()
+        thread.join(10)
@@ -1 +1,2 @@
 __all__ = ["TBGenerator"]
+__version__ = "0.0.1"
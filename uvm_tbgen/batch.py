@@ -0,0 +1,208 @@
+"""Batch generation of testbenches for whole RTL trees.
+
+DUT files are fanned out over a process pool. Every worker loads the shared
+Jinja2 environment once, compiles (or loads from the bytecode cache) all
+templates up front and reuses them for each DUT it is handed, so the per-DUT
+cost is only parsing and rendering.
+"""
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import glob
+import os
+from pathlib import Path
+import time
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from jinja2 import Environment
+
+from . import profiling
+from .generator import TEMPLATE_DIR, TBGenerator, get_environment, precompile_templates
+
+DUT_SUFFIXES = (".v", ".sv")
+
+# Per-process environment, populated by _init_worker().
+_WORKER_ENV: Optional[Environment] = None
+
+
+class BatchResult(NamedTuple):
+    """Outcome of generating the testbench for one DUT."""
+    dut: str
+    outdir: str
+    ok: bool
+    elapsed: float
+    error: str = ""
+
+
+def _is_glob(pattern: str) -> bool:
+    return any(ch in pattern for ch in "*?[")
+
+
+def read_manifest(manifest: str) -> List[Path]:
+    """Return the DUT paths listed in a manifest file.
+
+    One path or glob per line; blank lines and ``#`` comments are ignored.
+    Relative entries are resolved against the manifest's directory.
+    """
+    base = Path(manifest).parent
+    paths: List[Path] = []
+    for line in Path(manifest).read_text(encoding="utf-8").splitlines():
+        entry = line.split("#", 1)[0].strip()
+        if not entry:
+            continue
+        if not os.path.isabs(entry):
+            entry = str(base / entry)
+        paths.extend(_expand(entry))
+    return paths
+
+
+def _expand(source: str) -> List[Path]:
+    if _is_glob(source):
+        return [Path(p) for p in sorted(glob.glob(source, recursive=True))]
+    path = Path(source)
+    if path.is_dir():
+        return sorted(
+            p for p in path.rglob("*") if p.is_file() and p.suffix in DUT_SUFFIXES
+        )
+    return [path]
+
+
+def collect_duts(
+    sources: Iterable[str] = (), manifest: Optional[str] = None
+) -> List[Path]:
+    """Resolve directories, globs, plain paths and a manifest into DUT files.
+
+    The result is de-duplicated and keeps first-seen order.
+    """
+    found: List[Path] = []
+    for source in sources:
+        found.extend(_expand(source))
+    if manifest:
+        found.extend(read_manifest(manifest))
+
+    seen = set()
+    duts: List[Path] = []
+    for path in found:
+        key = os.path.abspath(path)
+        if key not in seen:
+            seen.add(key)
+            duts.append(path)
+    return duts
+
+
+def _output_dirs(duts: Sequence[Path], outdir: Path) -> List[Path]:
+    """Map each DUT to its own output directory below ``outdir``.
+
+    DUTs with unique file stems go to ``outdir/<stem>``; when stems collide
+    the DUT's path relative to the common parent is mirrored instead. Files
+    sharing a stem in one directory (``a.v`` and ``a.sv``) keep their
+    suffix in the name: ``a_v`` and ``a_sv``.
+    """
+    parents = [os.path.abspath(d.parent) for d in duts]
+    in_dir = Counter(zip(parents, (d.stem for d in duts)))
+    names = [
+        f"{d.stem}_{d.suffix.lstrip('.')}" if in_dir[parent, d.stem] > 1 else d.stem
+        for parent, d in zip(parents, duts)
+    ]
+    if len(set(names)) == len(names):
+        return [outdir / name for name in names]
+    root = os.path.commonpath(parents)
+    return [
+        outdir / os.path.relpath(parent, root) / name
+        for parent, name in zip(parents, names)
+    ]
+
+
+def _init_worker(template_dir: str, profile: bool = False) -> None:
+    """Load the worker's environment and every template once."""
+    global _WORKER_ENV
+    if profile:
+        profiling.enable()
+    with profiling.span("load templates", "batch"):
+        precompile_templates(Path(template_dir))
+        _WORKER_ENV = get_environment(Path(template_dir))
+
+
+def _generate_one(
+    dut: str, outdir: str, topname: str, parse_cache: bool, params: Dict[str, str]
+) -> BatchResult:
+    start = time.perf_counter()
+    try:
+        # DUTs are already spread over processes; render components serially
+        gen = TBGenerator(
+            dut_path=dut, outdir=outdir, topname=topname,
+            env=_WORKER_ENV, verbose=False, parse_cache=parse_cache, params=params,
+            jobs=1,
+        )
+        summary = gen.generate()
+    except Exception as e:
+        return BatchResult(dut, outdir, False, time.perf_counter() - start, str(e))
+    error = "; ".join(str(f) for f in summary.failed)
+    return BatchResult(dut, outdir, summary.ok, time.perf_counter() - start, error)
+
+
+def _generate_in_worker(*task) -> Tuple[BatchResult, List[profiling.Span]]:
+    """Run :func:`_generate_one` in a pool worker and hand its spans back."""
+    result = _generate_one(*task)
+    profiler = profiling.active()
+    return result, profiler.drain() if profiler is not None else []
+
+
+def generate_batch(
+    dut_paths: Iterable, outdir: str, jobs: Optional[int] = None,
+    topname: Optional[str] = None, template_dir: Path = TEMPLATE_DIR,
+    parse_cache: bool = True, params: Optional[Mapping[str, str]] = None
+) -> List[BatchResult]:
+    """Generate a testbench for each DUT and return one result per DUT.
+
+    ``jobs`` defaults to the number of CPUs; ``jobs=1`` runs in-process.
+    ``topname`` defaults to ``<dut stem>_tb``. Unchanged DUTs are served
+    from the on-disk parse cache unless ``parse_cache=False``. ``params``
+    overrides are applied to every DUT; each worker memoizes the folded
+    parameter environments, so variants of one IP are evaluated once. Failures are
+    reported in the results rather than raised, so one broken DUT does not
+    stop the batch.
+    """
+    duts = [Path(d) for d in dut_paths]
+    outdirs = _output_dirs(duts, Path(outdir))
+    tasks = [
+        (str(dut), str(out), topname or f"{dut.stem}_tb", parse_cache, dict(params or {}))
+        for dut, out in zip(duts, outdirs)
+    ]
+    if not tasks:
+        return []
+
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(tasks)))
+    if jobs == 1:
+        _init_worker(str(template_dir))
+        return [_generate_one(*task) for task in tasks]
+
+    profiler = profiling.active()
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker,
+        initargs=(str(template_dir), profiler is not None),
+    ) as pool:
+        futures = [pool.submit(_generate_in_worker, *task) for task in tasks]
+        results = []
+        for future in futures:
+            result, spans = future.result()
+            if profiler is not None:
+                profiler.extend(spans)
+            results.append(result)
+        return results
+
+
+def print_summary(results: Sequence[BatchResult], wall: float) -> None:
+    """Print a per-DUT status table followed by aggregate timings."""
+    failed = [r for r in results if not r.ok]
+    print(f"[uvm_tbgen] Batch summary ({len(results)} DUTs)")
+    for r in results:
+        status = "OK" if r.ok else "FAILED"
+        line = f"  {status:<7}{r.elapsed:8.3f}s  {r.dut} -> {r.outdir}"
+        if r.error:
+            line += f"  ({r.error})"
+        print(line)
+    busy = sum(r.elapsed for r in results)
+    print(
+        f"[uvm_tbgen] {len(results) - len(failed)} succeeded, {len(failed)} failed; "
+        f"wall {wall:.3f}s, summed DUT time {busy:.3f}s"
+    )
@@ -0,0 +1,232 @@
+"""On-disk caches shared by the generator.
+
+Everything lives below a single user cache directory, which can be moved
+with ``UVM_TBGEN_CACHE_DIR`` and disabled with ``UVM_TBGEN_NO_CACHE=1``.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+import sys
+import tempfile
+from typing import Dict, List, Optional
+
+import jinja2
+from jinja2 import BytecodeCache, FileSystemBytecodeCache
+from jinja2.bccache import Bucket
+
+from .manifest import file_digest
+from .ports import PortTable
+from .verilog import PARSER_VERSION, Module, Param, parse_file
+
+
+def caching_disabled() -> bool:
+    """Return True when ``UVM_TBGEN_NO_CACHE`` asks for no on-disk caching."""
+    return os.environ.get("UVM_TBGEN_NO_CACHE", "") not in ("", "0")
+
+
+def default_cache_dir() -> Path:
+    """Return the root cache directory for this user."""
+    override = os.environ.get("UVM_TBGEN_CACHE_DIR")
+    if override:
+        return Path(override)
+    if sys.platform == "win32" and os.environ.get("LOCALAPPDATA"):
+        return Path(os.environ["LOCALAPPDATA"]) / "uvm_tbgen" / "cache"
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg) if xdg else Path.home() / ".cache"
+    return base / "uvm_tbgen"
+
+
+class ContentHashBytecodeCache(FileSystemBytecodeCache):
+    """Jinja2 bytecode cache keyed on the template source itself.
+
+    Jinja's default key is the template name, so an edited template would
+    first be loaded and then rejected. Keying on a hash of the source, the
+    Jinja2 version and the options that affect compilation means an edit
+    simply misses, and stale entries are never consulted.
+    """
+
+    def __init__(self, directory: Path):
+        directory.mkdir(parents=True, exist_ok=True)
+        super().__init__(str(directory), "%s.jinja.cache")
+
+    def get_bucket(self, environment, name, filename, source) -> Bucket:
+        options = (
+            environment.trim_blocks, environment.lstrip_blocks,
+            environment.keep_trailing_newline, environment.block_start_string,
+            environment.variable_start_string, environment.comment_start_string,
+        )
+        digest = hashlib.sha256()
+        digest.update(f"{jinja2.__version__}:{options!r}\0".encode("utf-8"))
+        digest.update(source.encode("utf-8"))
+        bucket = Bucket(environment, digest.hexdigest(), self.get_source_checksum(source))
+        self.load_bytecode(bucket)
+        return bucket
+
+
+def template_bytecode_cache(cache_dir: Path) -> Optional[BytecodeCache]:
+    """Return the template bytecode cache below ``cache_dir``.
+
+    Returns None if the directory cannot be created, so generation still
+    works (uncached) on read-only home directories.
+    """
+    try:
+        return ContentHashBytecodeCache(cache_dir / "templates")
+    except OSError:
+        return None
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class ParseCache:
+    """Size-bounded LRU cache of parsed modules, keyed by DUT content.
+
+    Entries are keyed on the SHA-256 of the DUT file, the parser version and
+    the selected top module. A small stat index maps (path, size, mtime) to
+    the content hash so unchanged files are not even re-hashed. Hits bump
+    the entry's mtime, and the oldest entries are evicted once the cache
+    exceeds ``max_bytes`` or ``max_entries``. Writes are counted as they
+    happen and the directories are only scanned once the count passes a
+    limit by a tenth, so a batch does not rescan the cache for every DUT.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = 128 << 20, max_entries: int = 4096):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        (directory / "stat").mkdir(parents=True, exist_ok=True)
+        (directory / "modules").mkdir(parents=True, exist_ok=True)
+        # [bytes, entries] per subdirectory, as of the last scan plus our writes
+        self._usage: Optional[Dict[str, List[int]]] = None
+
+    @staticmethod
+    def _hash(*parts) -> str:
+        return hashlib.sha256("\0".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+
+    def content_digest(self, path: Path) -> str:
+        """Return the file's SHA-256, reusing it while size and mtime are unchanged."""
+        st = path.stat()
+        index = self.directory / "stat" / self._hash(path.resolve(), st.st_size, st.st_mtime_ns)
+        try:
+            digest = index.read_text(encoding="utf-8")
+            # A truncated index entry is rewritten below
+            if len(digest) == 64:
+                return digest
+        except OSError:
+            pass
+        digest = file_digest(path)
+        _write_atomic(index, digest)
+        self._added("stat", len(digest))
+        return digest
+
+    def _entry(self, digest: str, top: Optional[str]) -> Path:
+        return self.directory / "modules" / f"{self._hash(digest, PARSER_VERSION, top)}.json"
+
+    def get(self, digest: str, top: Optional[str] = None) -> Optional[Module]:
+        """Return the cached module, or None on a miss.
+
+        Entries that cannot be read back (damaged, or of an older layout)
+        are removed and count as a miss.
+        """
+        entry = self._entry(digest, top)
+        try:
+            text = entry.read_text(encoding="utf-8")
+        except OSError:
+            return None
+        try:
+            data = json.loads(text)
+            params = tuple(Param(*p) for p in data["params"])
+            module = Module(data["name"], PortTable.from_columns(data["ports"]), params)
+        except (KeyError, TypeError, ValueError, OverflowError):
+            try:
+                entry.unlink()
+            except OSError:
+                pass
+            return None
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return module
+
+    def put(self, digest: str, top: Optional[str], module: Module) -> None:
+        data = {
+            "name": module.name,
+            "ports": module.ports.to_columns(),
+            "params": [list(p) for p in module.params],
+        }
+        text = json.dumps(data, separators=(",", ":"))
+        _write_atomic(self._entry(digest, top), text)
+        self._added("modules", len(text))
+
+    def _added(self, sub: str, size: int) -> None:
+        """Count a new entry in ``sub``, evicting once a limit is passed by a tenth."""
+        if self._usage is None:
+            self.evict()
+            return
+        usage = self._usage[sub]
+        usage[0] += size
+        usage[1] += 1
+        if (usage[0] > self.max_bytes + self.max_bytes // 10
+                or usage[1] > self.max_entries + self.max_entries // 10):
+            self.evict()
+
+    def parse(self, path: Path, top: Optional[str] = None, digest: Optional[str] = None) -> Module:
+        """Return the parsed module for ``path``, parsing only on a cache miss.
+
+        ``digest`` may be passed when the caller already knows the file hash.
+        """
+        path = Path(path)
+        digest = digest or self.content_digest(path)
+        module = self.get(digest, top)
+        if module is None:
+            module = parse_file(path, top)
+            self.put(digest, top, module)
+        return module
+
+    def evict(self) -> None:
+        """Drop least recently used entries until the cache is within bounds."""
+        self._usage = {}
+        for sub in ("modules", "stat"):
+            entries = []
+            total = 0
+            with os.scandir(self.directory / sub) as it:
+                for e in it:
+                    try:
+                        st = e.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime_ns, st.st_size, e.path))
+                    total += st.st_size
+            count = len(entries)
+            if total > self.max_bytes or count > self.max_entries:
+                entries.sort()
+                for _, size, entry_path in entries:
+                    if total <= self.max_bytes and count <= self.max_entries:
+                        break
+                    try:
+                        os.unlink(entry_path)
+                    except OSError:
+                        continue
+                    total -= size
+                    count -= 1
+            self._usage[sub] = [total, count]
+
+
+def default_parse_cache() -> Optional[ParseCache]:
+    """Return the user's parse cache, or None if caching is off or unavailable."""
+    if caching_disabled():
+        return None
+    try:
+        return ParseCache(default_cache_dir() / "parse")
+    except OSError:
+        return None
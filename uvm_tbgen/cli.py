@@ -1,5 +1,14 @@
 import argparse
-from .generator import TBGenerator
+import json
+import os
+from pathlib import Path
+import time
+
+from . import client, profiling
+
+# The generator, batch, cache, logscan and simulators modules (and Jinja2)
+# are imported where they are used, so that commands answered by the
+# daemon start quickly.
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -10,17 +19,482 @@ def build_parser() -> argparse.ArgumentParser:
     gen.add_argument("--dut", required=True, help="Path to DUT Verilog file")
     gen.add_argument("--outdir", default="generated_tb", help="Output directory")
     gen.add_argument("--topname", default="my_dut_tb", help="Top-level testbench name")
+    gen.add_argument(
+        "--top-module", default=None,
+        help="Module to generate for when the DUT file holds several (default: first)",
+    )
+    gen.add_argument(
+        "--force", action="store_true",
+        help="Regenerate every file even if its inputs are unchanged",
+    )
+    gen.add_argument(
+        "--param", action="append", default=[], metavar="NAME=VALUE",
+        help="Override a DUT parameter (repeatable); VALUE may be an expression",
+    )
+    gen.add_argument(
+        "--no-parse-cache", action="store_true",
+        help="Always re-parse the DUT instead of using the on-disk parse cache",
+    )
+    gen.add_argument(
+        "--jobs", "-j", type=int, default=None,
+        help="Components rendered concurrently (default: up to 4, by CPU count)",
+    )
+    gen.add_argument(
+        "--executor", choices=("thread", "process"), default="thread",
+        help="Render components on threads (default) or on worker processes",
+    )
+    gen.add_argument(
+        "--profile", metavar="PATH", default=None,
+        help=f"Write timed spans to PATH and a Chrome trace next to it (or set ${profiling.PROFILE_ENV})",
+    )
+
+    parse = sub.add_parser("parse", help="Print the ports and parameters of a DUT")
+    parse.add_argument("--dut", required=True, help="Path to DUT Verilog file")
+    parse.add_argument(
+        "--top-module", default=None,
+        help="Module to parse when the DUT file holds several (default: first)",
+    )
+    parse.add_argument(
+        "--param", action="append", default=[], metavar="NAME=VALUE",
+        help="Override a DUT parameter (repeatable); VALUE may be an expression",
+    )
+    parse.add_argument("--json", action="store_true", help="Print the result as JSON")
+
+    watch = sub.add_parser(
+        "watch", help="Regenerate testbenches when DUT files or templates change"
+    )
+    watch.add_argument(
+        "--dut", action="append", required=True,
+        help="DUT Verilog file to watch (repeatable; several go to OUTDIR/<stem>)",
+    )
+    watch.add_argument("--outdir", default="generated_tb", help="Output directory")
+    watch.add_argument(
+        "--topname", default=None,
+        help="Top-level testbench name (default: my_dut_tb, or <dut stem>_tb for several DUTs)",
+    )
+    watch.add_argument(
+        "--top-module", default=None,
+        help="Module to generate for when the DUT file holds several (default: first)",
+    )
+    watch.add_argument(
+        "--param", action="append", default=[], metavar="NAME=VALUE",
+        help="Override a DUT parameter (repeatable); VALUE may be an expression",
+    )
+    watch.add_argument(
+        "--template-dir", default=None,
+        help="Template directory to watch (default: the bundled templates)",
+    )
+    watch.add_argument(
+        "--debounce", type=float, default=0.2, metavar="SECONDS",
+        help="Wait until files have been quiet this long before regenerating (default: 0.2)",
+    )
+    watch.add_argument(
+        "--poll", action="store_true",
+        help="Poll file stats instead of using inotify",
+    )
+    watch.add_argument(
+        "--interval", type=float, default=0.5, metavar="SECONDS",
+        help="Polling interval (default: 0.5)",
+    )
+
+    batch = sub.add_parser(
+        "generate-batch", help="Generate UVM testbenches for many DUTs in parallel"
+    )
+    batch.add_argument(
+        "sources", nargs="*",
+        help="DUT files, directories (searched for *.v/*.sv) or glob patterns",
+    )
+    batch.add_argument("--manifest", help="File listing one DUT path or glob per line")
+    batch.add_argument("--outdir", default="generated_tb", help="Output root directory")
+    batch.add_argument(
+        "--topname", default=None,
+        help="Top-level testbench name (default: <dut stem>_tb)",
+    )
+    batch.add_argument(
+        "--jobs", "-j", type=int, default=None,
+        help="Worker processes (default: number of CPUs)",
+    )
+    batch.add_argument(
+        "--param", action="append", default=[], metavar="NAME=VALUE",
+        help="Override a DUT parameter (repeatable); VALUE may be an expression",
+    )
+    batch.add_argument(
+        "--no-parse-cache", action="store_true",
+        help="Always re-parse DUTs instead of using the on-disk parse cache",
+    )
+    batch.add_argument(
+        "--profile", metavar="PATH", default=None,
+        help=f"Write timed spans to PATH and a Chrome trace next to it (or set ${profiling.PROFILE_ENV})",
+    )
+
+    pre = sub.add_parser(
+        "precompile-templates",
+        help="Compile all templates into the on-disk bytecode cache",
+    )
+    pre.add_argument(
+        "--template-dir", default=None,
+        help="Template directory (default: the bundled templates)",
+    )
+    pre.add_argument(
+        "--cache-dir", default=None,
+        help="Cache root (default: $UVM_TBGEN_CACHE_DIR or the user cache directory)",
+    )
+
+    logs = sub.add_parser(
+        "analyze-log",
+        help="Summarise simulation logs: UVM report IDs, assertions, first failure",
+    )
+    logs.add_argument("logs", nargs="+", help="Simulation log files")
+    logs.add_argument("--json", action="store_true", help="Print the summaries as JSON")
+    logs.add_argument(
+        "--jobs", "-j", type=int, default=None,
+        help="Worker processes for several logs (default: number of CPUs)",
+    )
+    logs.add_argument(
+        "--context", type=int, default=5, metavar="N",
+        help="Lines of context to keep around the first failure (default: 5)",
+    )
+    logs.add_argument(
+        "--mmap", action="store_true", help="Read logs through a memory map",
+    )
+
+    tri = sub.add_parser(
+        "triage", help="Cluster failing runs by failure signature, one representative each",
+    )
+    tri.add_argument(
+        "paths", nargs="+",
+        help="Run logs, or directories searched for run.log / *_simulation.log",
+    )
+    tri.add_argument("--json", action="store_true", help="Print the clusters as JSON")
+    tri.add_argument(
+        "--jobs", "-j", type=int, default=None,
+        help="Worker processes (default: number of CPUs)",
+    )
+    tri.add_argument(
+        "--all", action="store_true", help="List the seeds of every cluster",
+    )
+
+    detect = sub.add_parser(
+        "detect", help="List installed simulators and their versions (cached)"
+    )
+    detect.add_argument("--json", action="store_true", help="Print the result as JSON")
+    detect.add_argument(
+        "--refresh", action="store_true",
+        help="Ignore the cached result and probe PATH and versions again",
+    )
+
+    results = sub.add_parser(
+        "results", help="Query the history of simulation runs recorded by run_simulation.py"
+    )
+    results.add_argument(
+        "--db", default=None,
+        help="Results database (default: $UVM_TBGEN_RESULTS_DB or <cache dir>/results.db)",
+    )
+    results.add_argument("--failed", action="store_true", help="Only failed runs")
+    results.add_argument(
+        "--since", default=None, metavar="WHEN",
+        help="Only runs started since WHEN: an age (30m, 12h, 7d, 2w) or an ISO date/time",
+    )
+    results.add_argument(
+        "--until", default=None, metavar="WHEN", help="Only runs started before WHEN",
+    )
+    results.add_argument("--dut", default=None, help="Only runs of this DUT (path or file name)")
+    results.add_argument("--simulator", default=None, help="Only runs on this simulator")
+    results.add_argument(
+        "--signature", default=None, help="Only failed runs with exactly this failure signature",
+    )
+    results.add_argument("--seed", type=int, default=None, help="Only runs of this seed")
+    results.add_argument("--limit", type=int, default=None, help="Newest N runs only")
+    output = results.add_mutually_exclusive_group()
+    output.add_argument("--json", action="store_true", help="Print the runs as JSON")
+    output.add_argument(
+        "--junit", default=None, metavar="PATH",
+        help="Write the runs as JUnit XML to PATH ('-' for standard output)",
+    )
+    output.add_argument(
+        "--by-signature", action="store_true",
+        help="Count failed runs per failure signature instead of listing runs",
+    )
+
+    serve = sub.add_parser(
+        "serve",
+        help="Run a daemon that keeps templates, parse cache and simulators warm",
+    )
+    serve.add_argument(
+        "--socket", default=None,
+        help=f"Unix socket path (default: ${client.SOCKET_ENV} or a per-user socket)",
+    )
+    serve.add_argument(
+        "--idle-timeout", type=float, default=None, metavar="SECONDS",
+        help="Exit after this many seconds without requests",
+    )
+
+    for command in (gen, parse, logs, detect):
+        command.add_argument(
+            "--no-daemon", action="store_true",
+            help=f"Work in-process even if a daemon is running (or set ${client.NO_DAEMON_ENV})",
+        )
 
     return parser
 
 
+def _from_daemon(args: argparse.Namespace, method: str, params: dict):
+    """Return the daemon's result for a request, or None to work in-process."""
+    # Spans are recorded in this process, so profiled runs stay in-process
+    if args.no_daemon or client.daemon_disabled() or profiling.active() is not None:
+        return None
+    try:
+        return client.call(method, params)
+    except client.DaemonUnavailable:
+        return None
+
+
 def main(argv=None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
+    path = None
+    if args.command in ("generate", "generate-batch"):
+        path = profiling.profile_path(args.profile)
+    if not path:
+        return _run(parser, args)
+
+    profiler = profiling.enable()
+    try:
+        return _run(parser, args)
+    finally:
+        profiling.disable()
+        trace = profiler.save(path)
+        print(f"[uvm_tbgen] Profile written to {path} (trace: {trace})")
+
+
+def _run(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
+    try:
+        return _dispatch(parser, args)
+    except client.DaemonError as e:
+        print(f"[uvm_tbgen] Error: {e}")
+        return 1
+
+
+def _dispatch(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
+    params = {}
+    if args.command in ("generate", "generate-batch", "parse", "watch"):
+        from .params import parse_overrides
+
+        try:
+            params = parse_overrides(args.param)
+        except ValueError as e:
+            parser.error(str(e))
 
     if args.command == "generate":
-        gen = TBGenerator(dut_path=args.dut, outdir=args.outdir, topname=args.topname)
-        gen.generate()
+        summary = _from_daemon(args, "generate", dict(
+            dut=os.path.abspath(args.dut), outdir=os.path.abspath(args.outdir),
+            topname=args.topname, force=args.force, top_module=args.top_module,
+            parse_cache=not args.no_parse_cache, params=params,
+            jobs=args.jobs, executor=args.executor,
+        ))
+        if summary is not None:
+            for message in summary["log"]:
+                print(f"[uvm_tbgen] {message}")
+            return 1 if summary["failed"] else 0
+
+        from .generator import TBGenerator
+
+        gen = TBGenerator(
+            dut_path=args.dut, outdir=args.outdir, topname=args.topname,
+            force=args.force, top_module=args.top_module,
+            parse_cache=not args.no_parse_cache, params=params,
+            jobs=args.jobs, executor=args.executor,
+        )
+        summary = gen.generate()
+        return 0 if summary.ok else 1
+
+    if args.command == "parse":
+        result = _from_daemon(args, "parse", dict(
+            dut=os.path.abspath(args.dut), top_module=args.top_module, params=params,
+        ))
+        if result is None:
+            from .uvm_tbgen.parser import parse_dut
+
+            result = parse_dut(args.dut, args.top_module, params=params)
+        if args.json:
+            print(json.dumps(result, indent=2))
+            return 0
+        values = ", ".join(f"{name}={value}" for name, value in result["params"].items())
+        print(f"[uvm_tbgen] module {result['module']}" + (f" #({values})" if values else ""))
+        for port in result["ports"]:
+            rng = f"[{port['width']}]" if port["width"] else ""
+            print(f"  {port['dir']:<7}{rng:<24}{port['name']}  ({port['bits']} bits)")
+        return 0
+
+    if args.command == "watch":
+        from .batch import _output_dirs
+        from .generator import TBGenerator
+        from .watch import watch
+
+        duts = [Path(d) for d in args.dut]
+        missing = [str(d) for d in duts if not d.is_file()]
+        if missing:
+            parser.error(f"watch: DUT not found: {', '.join(missing)}")
+        if len(duts) == 1:
+            targets = [(duts[0], Path(args.outdir), args.topname or "my_dut_tb")]
+        else:
+            targets = [
+                (dut, out, args.topname or f"{dut.stem}_tb")
+                for dut, out in zip(duts, _output_dirs(duts, Path(args.outdir)))
+            ]
+        generators = []
+        for dut, outdir, topname in targets:
+            gen = TBGenerator(
+                dut_path=str(dut), outdir=str(outdir), topname=topname,
+                top_module=args.top_module, params=params,
+            )
+            if args.template_dir:
+                gen.template_dir = Path(args.template_dir)
+            generators.append(gen)
+        try:
+            watch(generators, debounce=args.debounce, poll=args.poll, interval=args.interval)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    if args.command == "generate-batch":
+        from .batch import collect_duts, generate_batch, print_summary
+
+        duts = collect_duts(args.sources, args.manifest)
+        if not duts:
+            parser.error("generate-batch: no DUT files found")
+        start = time.perf_counter()
+        results = generate_batch(
+            duts, args.outdir, jobs=args.jobs, topname=args.topname,
+            parse_cache=not args.no_parse_cache, params=params,
+        )
+        print_summary(results, time.perf_counter() - start)
+        return 0 if all(r.ok for r in results) else 1
+
+    if args.command == "precompile-templates":
+        from .cache import default_cache_dir
+        from .generator import TEMPLATE_DIR, precompile_templates
+
+        cache_dir = Path(args.cache_dir) if args.cache_dir else None
+        template_dir = Path(args.template_dir) if args.template_dir else TEMPLATE_DIR
+        names = precompile_templates(template_dir, cache_dir)
+        location = (cache_dir or default_cache_dir()) / "templates"
+        print(f"[uvm_tbgen] Precompiled {len(names)} templates into {location}")
+        return 0
+
+    if args.command == "analyze-log":
+        if args.context < 0:
+            parser.error("analyze-log: --context must not be negative")
+        from .logscan import (
+            analyze_logs, print_log_summary, summary_from_json, summary_to_json,
+        )
+
+        results = _from_daemon(args, "analyze", dict(
+            logs=[os.path.abspath(p) for p in args.logs], context=args.context,
+            use_mmap=args.mmap, jobs=args.jobs,
+        ))
+        if results is not None:
+            # Report the paths as they were given on the command line
+            summaries = [
+                summary_from_json(r)._replace(path=str(p)) for r, p in zip(results, args.logs)
+            ]
+        else:
+            summaries = analyze_logs(
+                args.logs, jobs=args.jobs, context=args.context, use_mmap=args.mmap
+            )
+        if args.json:
+            print(json.dumps([summary_to_json(s) for s in summaries], indent=2))
+        else:
+            for summary in summaries:
+                print_log_summary(summary)
+        return 1 if any(s.failed for s in summaries) else 0
+
+    if args.command == "triage":
+        from .triage import clusters_to_json, find_logs, print_clusters, triage
+
+        logs = find_logs(args.paths)
+        if not logs:
+            parser.error("triage: no logs found")
+        start = time.perf_counter()
+        clusters = triage(logs, jobs=args.jobs)
+        if args.json:
+            print(json.dumps(clusters_to_json(clusters), indent=2))
+        else:
+            failed = sum(len(c.runs) for c in clusters)
+            print(f"[uvm_tbgen] {failed} of {len(logs)} runs failed, {len(clusters)} "
+                  f"signature{'s' if len(clusters) != 1 else ''} "
+                  f"({time.perf_counter() - start:.2f}s)")
+            print_clusters(clusters, args.all)
+        return 1 if clusters else 0
+
+    if args.command == "detect":
+        # The daemon searches our PATH, which may differ from its own
+        search_path = os.environ.get("PATH", os.defpath)
+        found = _from_daemon(args, "detect", dict(refresh=args.refresh, search_path=search_path))
+        if found is None:
+            from .simulators import detect_simulators
+
+            detected = detect_simulators(refresh=args.refresh, search_path=search_path)
+            found = {sim: info._asdict() for sim, info in detected.items()}
+        if args.json:
+            print(json.dumps(found, indent=2))
+            return 0
+        if not found:
+            print("[uvm_tbgen] No simulators found on PATH")
+        for info in found.values():
+            exe = next(iter(info["commands"].values()))
+            print(f"[uvm_tbgen] {info['simulator']:<9} {info['version']}  ({exe})")
+        return 0
+
+    if args.command == "results":
+        from .results import (
+            ResultStore, default_db_path, parse_time, print_records, to_json, to_junit,
+        )
+
+        try:
+            since = parse_time(args.since) if args.since else None
+            until = parse_time(args.until) if args.until else None
+        except ValueError as e:
+            parser.error(f"results: {e}")
+        db = Path(args.db) if args.db else default_db_path()
+        if not db.exists():
+            print(f"[uvm_tbgen] No results recorded yet ({db} does not exist)")
+            return 0
+        with ResultStore(db) as store:
+            if args.by_signature:
+                groups = store.signatures(since, until, args.dut, args.simulator)
+                records = None
+            else:
+                records = store.query(
+                    args.failed, since, until, args.dut, args.simulator, args.signature,
+                    args.seed, args.limit,
+                )
+        if records is None:
+            for group in groups:
+                last = time.strftime("%Y-%m-%d %H:%M", time.localtime(group["last"]))
+                print(f"  {group['runs']:>7}  last {last}  seed {group['seed']}  "
+                      f"{group['signature'] or '(no signature)'}")
+            return 0
+        if args.json:
+            print(to_json(records), end="")
+        elif args.junit == "-":
+            print(to_junit(records), end="")
+        elif args.junit:
+            Path(args.junit).write_text(to_junit(records), encoding="utf-8")
+            print(f"[uvm_tbgen] Wrote {len(records)} runs to {args.junit}")
+        else:
+            print(f"[uvm_tbgen] {len(records)} runs in {db}")
+            print_records(records)
+        return 0
+
+    if args.command == "serve":
+        from .server import serve
+
+        try:
+            serve(args.socket, idle_timeout=args.idle_timeout)
+        except (OSError, RuntimeError) as e:
+            print(f"[uvm_tbgen] Error: {e}")
+            return 1
         return 0
 
     parser.print_help()
@@ -0,0 +1,110 @@
+"""Client for the ``uvm-tbgen serve`` daemon.
+
+Requests are JSON-RPC 2.0 objects sent one per line over a Unix domain
+socket, and every request is answered with one line. This module only
+imports the standard library so a client process starts quickly; callers
+fall back to in-process work when :class:`DaemonUnavailable` is raised.
+"""
+import json
+import os
+import socket
+import stat
+import tempfile
+from typing import Any, Dict, Optional
+
+from . import __version__
+
+SOCKET_ENV = "UVM_TBGEN_SOCKET"
+NO_DAEMON_ENV = "UVM_TBGEN_NO_DAEMON"
+
+# JSON-RPC error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+VERSION_MISMATCH = -32001
+
+
+class DaemonUnavailable(Exception):
+    """No compatible daemon is listening on the socket."""
+
+
+class DaemonError(Exception):
+    """The daemon answered a request with an error."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+def socket_path() -> str:
+    """Return the daemon socket: ``$UVM_TBGEN_SOCKET``, else one per user."""
+    override = os.environ.get(SOCKET_ENV)
+    if override:
+        return override
+    runtime = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return os.path.join(runtime, f"uvm_tbgen-{uid}.sock")
+
+
+def daemon_disabled() -> bool:
+    """Return True when ``UVM_TBGEN_NO_DAEMON`` asks for in-process work."""
+    return os.environ.get(NO_DAEMON_ENV, "") not in ("", "0")
+
+
+def _check_socket(path: str) -> None:
+    """Raise DaemonUnavailable unless ``path`` is a socket owned by this user.
+
+    The default socket may live in the shared temporary directory, where
+    another user could create it first and answer requests with forged
+    results.
+    """
+    try:
+        st = os.lstat(path)
+    except OSError as e:
+        raise DaemonUnavailable(str(e)) from None
+    if not stat.S_ISSOCK(st.st_mode):
+        raise DaemonUnavailable(f"{path} is not a socket")
+    if hasattr(os, "getuid") and st.st_uid != os.getuid():
+        raise DaemonUnavailable(f"{path} is owned by another user")
+
+
+def call(
+    method: str, params: Optional[Dict[str, Any]] = None, path: Optional[str] = None,
+    timeout: Optional[float] = None
+) -> Any:
+    """Send one request to the daemon and return its result.
+
+    Raises DaemonUnavailable if no daemon (or one of another version) is
+    listening or the socket is not this user's own, and DaemonError if the request failed in the daemon.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise DaemonUnavailable("Unix domain sockets are not supported here")
+    request = {
+        "jsonrpc": "2.0", "id": 1, "method": method,
+        "params": dict(params or {}, client_version=__version__),
+    }
+    path = path or socket_path()
+    _check_socket(path)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try:
+            sock.connect(path)
+        except OSError as e:
+            raise DaemonUnavailable(str(e)) from None
+        sock.settimeout(timeout)
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as reply:
+            line = reply.readline()
+    finally:
+        sock.close()
+    if not line:
+        raise DaemonUnavailable("daemon closed the connection")
+    response = json.loads(line)
+    error = response.get("error")
+    if error:
+        if error.get("code") == VERSION_MISMATCH:
+            raise DaemonUnavailable(error.get("message", "version mismatch"))
+        raise DaemonError(error.get("code", SERVER_ERROR), error.get("message", ""))
+    return response.get("result")
@@ -0,0 +1,114 @@
+"""Per-file dependency tracking for incremental compilation.
+
+Every source handed to the compiler is a compilation unit. A unit's digest
+covers its own text and every file it `` `include``s, and a unit depends on
+the units that define the packages and interfaces it refers to
+(``import pkg::*``, ``pkg::name``, ``virtual some_if``). After a compile the
+digests are stamped into the work library; the next compile only passes the
+units whose digest changed, plus everything that depends on them, to
+``vlog``/``xvlog``. Module instantiations are bound at elaboration and do
+not make a unit dependent.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+import re
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Sequence
+
+from .cache import _write_atomic
+from .filelist import included_files
+
+# Stamp file kept in the work library
+STAMPS_NAME = "uvm_tbgen_units.json"
+STAMPS_FORMAT = 1
+
+_COMMENT_RE = re.compile(r"//[^\n]*|/\*.*?\*/", re.DOTALL)
+_PROVIDES_RE = re.compile(
+    r"^[ \t]*(?:package|interface|module|macromodule|program)[ \t]+"
+    r"(?:(?:automatic|static)[ \t]+)?(\w+)",
+    re.MULTILINE,
+)
+_USES_RE = re.compile(r"\b(\w+)[ \t]*::|\bvirtual[ \t]+(?:interface[ \t]+)?(\w+)")
+
+
+class CompileUnit(NamedTuple):
+    """One source file passed to the compiler."""
+    path: str
+    digest: str  # sha256 of the file and everything it includes
+    provides: List[str]  # packages, interfaces and modules it defines
+    uses: List[str]  # packages and interfaces it refers to
+
+
+def scan_unit(path, incdirs: Sequence[Path] = ()) -> CompileUnit:
+    """Hash ``path`` with its includes and find the design units it defines and uses."""
+    path = Path(path)
+    files = [path] + included_files([path], incdirs)
+    digest = hashlib.sha256()
+    texts = []
+    for f in files:
+        data = f.read_bytes()
+        digest.update(str(len(data)).encode("ascii") + b"\0" + data)
+        texts.append(_COMMENT_RE.sub(" ", data.decode("latin-1")))
+    text = "\n".join(texts)
+    provides = list(dict.fromkeys(_PROVIDES_RE.findall(text)))
+    uses = dict.fromkeys(a or b for a, b in _USES_RE.findall(text))
+    return CompileUnit(
+        str(path), digest.hexdigest(), provides, [n for n in uses if n not in provides]
+    )
+
+
+def scan_units(sources: Iterable, incdirs: Sequence[Path] = ()) -> List[CompileUnit]:
+    return [scan_unit(s, incdirs) for s in sources]
+
+
+def plan(units: Sequence[CompileUnit], stamps: Mapping[str, str]) -> List[CompileUnit]:
+    """Return the units to recompile, in compile order.
+
+    These are the units whose digest differs from ``stamps`` and, transitively,
+    every unit using a package or interface defined by one of them. If a
+    stamped source is no longer compiled, everything is recompiled.
+    """
+    if set(stamps) - {u.path for u in units}:
+        return list(units)
+    providers: Dict[str, str] = {}
+    for unit in units:
+        for name in unit.provides:
+            providers.setdefault(name, unit.path)
+    dirty = {u.path for u in units if stamps.get(u.path) != u.digest}
+    changed = bool(dirty)
+    while changed:
+        changed = False
+        for unit in units:
+            if unit.path not in dirty and any(providers.get(n) in dirty for n in unit.uses):
+                dirty.add(unit.path)
+                changed = True
+    return [u for u in units if u.path in dirty]
+
+
+def load_stamps(library: Path) -> Dict[str, str]:
+    """Return {source path: digest} of the units last compiled into ``library``."""
+    try:
+        data = json.loads((library / STAMPS_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if data.get("format") != STAMPS_FORMAT:
+        return {}
+    return data.get("units", {})
+
+
+def save_stamps(
+    library: Path, units: Sequence[CompileUnit], compiled: Sequence[CompileUnit], ok: bool
+) -> None:
+    """Record the units now in ``library``; failed units are left unstamped."""
+    old = load_stamps(library)
+    failed = set() if ok else {u.path for u in compiled}
+    stamps = {
+        u.path: u.digest for u in units
+        if u.path not in failed and (u in compiled or old.get(u.path) == u.digest)
+    }
+    os.makedirs(library, exist_ok=True)
+    _write_atomic(
+        library / STAMPS_NAME,
+        json.dumps({"format": STAMPS_FORMAT, "units": stamps}, indent=1, sort_keys=True),
+    )
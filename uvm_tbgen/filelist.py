@@ -0,0 +1,100 @@
+"""Reading simulator filelists (``.f`` files).
+
+The generator writes ``<topname>.f`` listing the testbench in compile
+order: the DUT, the interface, the package (with ``+incdir+`` for the class
+files it includes), assertions and checkers, and the top. Relative paths
+are resolved against the filelist's directory, like the simulators' ``-F``
+option. :func:`included_files` follows `` `include`` directives so callers
+can tell when an included class file changed.
+"""
+from pathlib import Path
+import re
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Set
+
+_INCLUDE_RE = re.compile(rb'^[ \t]*`include[ \t]+"([^"]+)"', re.MULTILINE)
+
+
+class Filelist(NamedTuple):
+    """Sources and include directories of a ``.f`` file, in order."""
+    path: Path
+    files: List[Path]
+    incdirs: List[Path]
+    defines: List[str]  # NAME or NAME=VALUE from +define+
+
+
+def read_filelist(path, _seen: Optional[Set[Path]] = None) -> Filelist:
+    """Parse a filelist; nested ``-f``/``-F`` files are read in place.
+
+    ``//`` and ``#`` comments and blank lines are skipped, as are options
+    other than ``+incdir+``, ``+define+``, ``-f`` and ``-F``.
+    """
+    path = Path(path).resolve()
+    seen = _seen if _seen is not None else set()
+    if path in seen:
+        raise ValueError(f"Filelist includes itself: {path}")
+    seen.add(path)
+    base = path.parent
+    files: List[Path] = []
+    incdirs: List[Path] = []
+    defines: List[str] = []
+    tokens = iter(_tokens(path.read_text(encoding="utf-8")))
+    for token in tokens:
+        if token.startswith("+incdir+"):
+            incdirs.extend(base / d for d in token[len("+incdir+"):].split("+") if d)
+        elif token.startswith("+define+"):
+            defines.extend(d for d in token[len("+define+"):].split("+") if d)
+        elif token in ("-f", "-F"):
+            nested = read_filelist(base / next(tokens), seen)
+            files.extend(nested.files)
+            incdirs.extend(nested.incdirs)
+            defines.extend(nested.defines)
+        elif not token.startswith(("-", "+")):
+            files.append(base / token)
+    return Filelist(path, files, list(dict.fromkeys(incdirs)), defines)
+
+
+def _tokens(text: str) -> List[str]:
+    tokens = []
+    for line in text.splitlines():
+        for marker in ("//", "#"):
+            line = line.split(marker, 1)[0]
+        tokens.extend(line.split())
+    return tokens
+
+
+def find_filelist(directory, top: Optional[str] = None) -> Optional[Path]:
+    """Return ``<top>.f`` in ``directory``, else its only ``.f`` file, else None."""
+    directory = Path(directory)
+    if top and (directory / f"{top}.f").is_file():
+        return directory / f"{top}.f"
+    candidates = sorted(directory.glob("*.f"))
+    return candidates[0] if len(candidates) == 1 else None
+
+
+def included_files(sources: Iterable[Path], incdirs: Sequence[Path] = ()) -> List[Path]:
+    """Return the files pulled in by `` `include`` from ``sources``, recursively.
+
+    Includes are looked up next to the including file, then in ``incdirs``;
+    ones that cannot be found (e.g. ``uvm_macros.svh`` from the simulator's
+    UVM installation) are ignored.
+    """
+    found: List[Path] = []
+    seen: Set[Path] = set()
+    pending = [Path(s) for s in sources]
+    while pending:
+        source = pending.pop(0)
+        try:
+            text = source.read_bytes()
+        except OSError:
+            continue
+        for match in _INCLUDE_RE.finditer(text):
+            name = match.group(1).decode("utf-8", "replace")
+            for directory in (source.parent, *incdirs):
+                candidate = (directory / name).resolve()
+                if candidate.is_file():
+                    if candidate not in seen:
+                        seen.add(candidate)
+                        found.append(candidate)
+                        pending.append(candidate)
+                    break
+    return found
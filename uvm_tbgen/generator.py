@@ -1,82 +1,186 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import functools
+import os
 from pathlib import Path
-import re
 import shutil
-from typing import List, NamedTuple
-from jinja2 import Environment, FileSystemLoader, Template
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+from jinja2 import BytecodeCache, Environment, FileSystemLoader, Template
+
+from . import __version__
+from .cache import (
+    caching_disabled, default_cache_dir, default_parse_cache, template_bytecode_cache
+)
+from .manifest import Manifest, file_digest, input_key, write_stream_if_changed
+from .params import fold_module
+from .profiling import span
+from .ports import Port, PortTable, PortView
+from .verilog import parse_file, parse_module
+
+TEMPLATE_DIR = Path(__file__).parent.parent / "templates"
+
+# (template, output file) for every generated component. Output names are
+# formatted with the DUT module name and the testbench top name.
+COMPONENTS = [
+    ("seq_item.sv.j2", "{module}_seq_item.sv"),
+    ("driver.sv.j2", "{module}_driver.sv"),
+    ("monitor.sv.j2", "{module}_monitor.sv"),
+    ("sequencer.sv.j2", "{module}_sequencer.sv"),
+    ("agent.sv.j2", "{module}_agent.sv"),
+    ("scoreboard.sv.j2", "{module}_scoreboard.sv"),
+    ("env_generated.sv.j2", "{module}_env.sv"),
+    ("test.sv.j2", "{module}_test.sv"),
+    ("coverage.sv.j2", "{module}_coverage.sv"),
+    ("checker.sv.j2", "{module}_checker.sv"),
+    ("assertions.sv.j2", "{module}_assertions.sv"),
+    ("interface.sv.j2", "{module}_if.sv"),
+    ("pkg.sv.j2", "{module}_pkg.sv"),
+    ("tb_top.sv.j2", "{topname}.sv"),
+    ("filelist.f.j2", "{topname}.f"),
+]
+
+# Components `include'd by {module}_pkg.sv, in dependency order. The others
+# hold modules or interfaces and are compiled on their own.
+PACKAGE_COMPONENTS = [
+    "seq_item.sv.j2",
+    "sequencer.sv.j2",
+    "driver.sv.j2",
+    "monitor.sv.j2",
+    "coverage.sv.j2",
+    "scoreboard.sv.j2",
+    "agent.sv.j2",
+    "env_generated.sv.j2",
+    "test.sv.j2",
+]
+
+# How components are rendered concurrently: threads overlap the file writes
+# and hashing, processes also spread large renders over CPUs.
+EXECUTORS = ("thread", "process")
+# Default cap on concurrent component renders
+_MAX_COMPONENT_JOBS = 4
+
+
+def _extract_module_and_ports(verilog_text: str, top: Optional[str] = None):
+    """Return (module_name, PortTable) for the first (or ``top``) module.
+
+    See :mod:`uvm_tbgen.verilog` for the supported header styles. Raises
+    ValueError if no module is found.
+    """
+    module = parse_module(verilog_text, top)
+    return module.name, module.ports
+
+
+def make_environment(
+    template_dir: Path = TEMPLATE_DIR, bytecode_cache: Optional[BytecodeCache] = None
+) -> Environment:
+    """Return a Jinja2 environment configured for the testbench templates."""
+    return Environment(
+        loader=FileSystemLoader(str(template_dir)),
+        trim_blocks=True,
+        lstrip_blocks=True,
+        bytecode_cache=bytecode_cache,
+        auto_reload=True,
+    )
 
 
-class Port(NamedTuple):
-    """Represents a Verilog port with direction, width, and name."""
-    name: str
-    direction: str = "input"  # "input", "output", "inout"
-    width: int = 1
+@functools.lru_cache(maxsize=None)
+def _shared_environment(template_dir: str, cache_dir: Optional[str]) -> Environment:
+    bcc = template_bytecode_cache(Path(cache_dir)) if cache_dir else None
+    return make_environment(Path(template_dir), bcc)
 
-    def signal_decl(self) -> str:
-        """Return the signal declaration for testbench."""
-        if self.width == 1:
-            return f"logic {self.name};"
-        return f"logic [{self.width - 1}:0] {self.name};"
 
-    def connection(self) -> str:
-        """Return the DUT instantiation connection."""
-        return f".{self.name}({self.name})"
+def get_environment(
+    template_dir: Path = TEMPLATE_DIR, cache_dir: Optional[Path] = None
+) -> Environment:
+    """Return the process-wide environment for ``template_dir``.
 
+    Compiled templates are kept in memory for the life of the process and
+    their bytecode is persisted in the user cache directory, so a fresh
+    process loads them without parsing or compiling. Edited templates are
+    picked up automatically.
+    """
+    cache = None if caching_disabled() else str(cache_dir or default_cache_dir())
+    return _shared_environment(str(Path(template_dir).resolve()), cache)
 
-def _extract_module_and_ports(verilog_text: str):
-    """Return (module_name, [Port]) using a heuristic parser.
 
-    This handles common styles where the module header lists ports and
-    where ports are later declared with `input|output|inout`.
-    """
-    m = re.search(
-        r"module\s+([a-zA-Z_]\w*)\s*\((.*?)\)\s*;", verilog_text, re.S
-    )
-    if not m:
-        raise ValueError("No module header found")
-    module_name = m.group(1)
-    header = m.group(2)
-
-    # Try to extract port declarations from header
-    parts = [p.strip() for p in header.split(",") if p.strip()]
-    ports: List[Port] = []
-    
-    for part in parts:
-        # Extract direction, width, and name from e.g. "input [7:0] data"
-        dir_match = re.match(r"(\w+)\s*(?:\[(\d+):(\d+)\])?\s*([a-zA-Z_]\w*)", part)
-        if dir_match:
-            direction = dir_match.group(1) if dir_match.group(1) in [
-                "input", "output", "inout"
-            ] else "input"
-            msb = int(dir_match.group(2)) if dir_match.group(2) else 0
-            lsb = int(dir_match.group(3)) if dir_match.group(3) else 0
-            width = abs(msb - lsb) + 1
-            name = dir_match.group(4)
-            ports.append(Port(name, direction, width))
-
-    # Also search for declared ports inside the module body: e.g. input [7:0] bus;
-    body = verilog_text[m.end():]
-    decl_pattern = r"(input|output|inout)\s*(?:\[(\d+):(\d+)\])?\s*([a-zA-Z_]\w*)"
-    for match in re.finditer(decl_pattern, body):
-        direction = match.group(1)
-        msb = int(match.group(2)) if match.group(2) else 0
-        lsb = int(match.group(3)) if match.group(3) else 0
-        width = abs(msb - lsb) + 1
-        name = match.group(4)
-        # Avoid duplicates
-        if not any(p.name == name for p in ports):
-            ports.append(Port(name, direction, width))
-
-    return module_name, ports
+def precompile_templates(
+    template_dir: Path = TEMPLATE_DIR, cache_dir: Optional[Path] = None
+) -> List[str]:
+    """Compile every template into the bytecode cache and return their names."""
+    env = get_environment(template_dir, cache_dir)
+    names = env.list_templates(extensions=["j2"])
+    for name in names:
+        env.get_template(name)
+    return names
+
+
+class ComponentFailure(NamedTuple):
+    """A component that could not be generated."""
+    component: str  # template name
+    file: str  # output file that was not written
+    error: str
+
+    def __str__(self) -> str:
+        return f"{self.file} ({self.component}): {self.error}"
+
+
+class GenerationSummary(NamedTuple):
+    """Files written, skipped and failed by one :meth:`TBGenerator.generate` call."""
+    module: str
+    written: List[str]
+    skipped: List[str]
+    failed: Sequence[ComponentFailure] = ()
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
 
 
 class TBGenerator:
-    def __init__(self, dut_path: str, outdir: str, topname: str):
+    def __init__(
+        self, dut_path: str, outdir: str, topname: str,
+        env: Optional[Environment] = None, verbose: bool = True,
+        force: bool = False, top_module: Optional[str] = None,
+        parse_cache: bool = True, params: Optional[Mapping[str, str]] = None,
+        jobs: Optional[int] = None, executor: str = "thread"
+    ):
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unknown executor '{executor}', expected one of {EXECUTORS}")
+        if executor == "process" and env is not None:
+            raise ValueError("A custom Jinja2 environment cannot be used with process workers")
         self.dut_path = dut_path
         self.outdir = outdir
         self.topname = topname
-        self.template_dir = Path(__file__).parent.parent / "templates"
+        self.template_dir = TEMPLATE_DIR
+        self.env = env
+        self.verbose = verbose
+        self.force = force
+        self.top_module = top_module
+        self.parse_cache = parse_cache
+        # Parameter overrides, NAME -> value expression
+        self.params: Dict[str, str] = dict(params or {})
+        # Components rendered concurrently (None: a few, 1: one after another)
+        self.jobs = jobs
+        self.executor = executor
+
+    @classmethod
+    def generate_batch(
+        cls, dut_paths, outdir: str, jobs: Optional[int] = None,
+        topname: Optional[str] = None
+    ):
+        """Generate testbenches for many DUTs on a process pool.
+
+        See :func:`uvm_tbgen.batch.generate_batch` for details.
+        """
+        from .batch import generate_batch
 
-    def generate(self) -> None:
+        return generate_batch(dut_paths, outdir, jobs=jobs, topname=topname)
+
+    def _log(self, message: str) -> None:
+        if self.verbose:
+            print(f"[uvm_tbgen] {message}")
+
+    def generate(self) -> GenerationSummary:
         """Generate complete UVM testbench with components using Jinja2 templates.
 
         Generates:
@@ -89,45 +193,259 @@ class TBGenerator:
         - env.sv: Environment
         - test.sv: Base test
         - interface.sv: DUT interface
+        - pkg.sv: Package including the classes in dependency order
         - tb_top.sv: Top module connecting all
+        - <topname>.f: Filelist in compile order (RTL, interface, package, top)
+
+        Generation is incremental: outputs whose inputs are unchanged since
+        the last run (see :mod:`uvm_tbgen.manifest`) are skipped, and files
+        are only rewritten when their contents differ. Components depend on
+        the DUT's interface, so an edit to the DUT body only refreshes the
+        copied DUT. ``force=True`` renders everything regardless.
         """
-        print(f"[uvm_tbgen] Generating testbench for {self.dut_path}")
-        print(f"[uvm_tbgen] Output dir: {self.outdir}, top: {self.topname}")
+        with span("generate", dut=str(self.dut_path)):
+            return self._generate()
+
+    def _generate(self) -> GenerationSummary:
+        self._log(f"Generating testbench for {self.dut_path}")
+        self._log(f"Output dir: {self.outdir}, top: {self.topname}")
 
         outdir = Path(self.outdir)
         outdir.mkdir(parents=True, exist_ok=True)
 
-        # Copy the DUT file into the output directory
         dut_src = Path(self.dut_path)
         if not dut_src.exists():
             raise FileNotFoundError(f"DUT not found: {self.dut_path}")
-        dut_dst = outdir / dut_src.name
-        shutil.copy2(dut_src, dut_dst)
 
-        verilog_text = dut_dst.read_text(encoding="utf-8")
-        try:
-            module_name, ports = _extract_module_and_ports(verilog_text)
-        except ValueError:
-            module_name = dut_dst.stem
-            ports = []
+        manifest = Manifest.load(outdir)
+        dut_digest = manifest.source_digest(dut_src)
+        options = self._options()
+        template_digests = {
+            template: self._template_digest(template) for template, _ in COMPONENTS
+        }
 
-        # Separate ports by direction
-        input_ports = [p for p in ports if p.direction == "input"]
-        output_ports = [p for p in ports if p.direction == "output"]
-        inout_ports = [p for p in ports if p.direction == "inout"]
+        # Components depend on the DUT only through its interface (module
+        # name, ports and parameters), so an edit to the DUT body leaves them
+        # alone. The interface digest is reused while the DUT text, its file
+        # name (listed in the filelist) and the options are unchanged, else
+        # the DUT is parsed to recompute it.
+        previous = manifest.inputs
+        interface = previous.get("dut", {}).get("interface")
+        built = None
+        if (self.force or not interface or previous["dut"].get("sha256") != dut_digest
+                or Path(previous["dut"].get("path", "")).name != dut_src.name
+                or previous.get("options") != options
+                or previous.get("generator_version") != __version__):
+            built = self._build_context(dut_src, dut_digest)
+            interface = self._interface_digest(*built)
+        manifest.inputs = {
+            "generator_version": __version__,
+            "dut": {"path": str(dut_src), "sha256": dut_digest, "interface": interface},
+            "templates": template_digests,
+            "options": options,
+        }
+        written: List[str] = []
+        skipped: List[str] = []
 
-        # Analyze ports for assertion patterns
-        assertion_context = self._analyze_ports_for_assertions(
-            module_name, ports, input_ports, output_ports
+        # Copy the DUT file into the output directory
+        dut_dst = outdir / dut_src.name
+        dut_key = input_key(dut_dst.name, dut_digest)
+        if not self.force and manifest.is_current("dut", dut_key):
+            skipped.append(dut_dst.name)
+        else:
+            with span("copy dut", file=dut_dst.name):
+                if not dut_dst.exists() or file_digest(dut_dst) != dut_digest:
+                    shutil.copy2(dut_src, dut_dst)
+                    written.append(dut_dst.name)
+                else:
+                    skipped.append(dut_dst.name)
+            manifest.record("dut", dut_key, dut_dst.name, dut_digest)
+
+        keys = {
+            template: input_key(__version__, interface, digest, options)
+            for template, digest in template_digests.items()
+        }
+        stale = []
+        for template, pattern in COMPONENTS:
+            if self.force or not manifest.is_current(template, keys[template]):
+                stale.append((template, pattern))
+            else:
+                skipped.append(manifest.output_file(template))
+
+        module_name = built[0] if built else manifest.module or dut_src.stem
+        manifest.module = module_name
+        failed: List[ComponentFailure] = []
+        if stale:
+            module_name, context = built or self._build_context(dut_src, dut_digest)
+            manifest.module = module_name
+
+            tasks = [
+                (template, pattern.format(module=module_name, topname=self.topname))
+                for template, pattern in stale
+            ]
+            outcomes = self._write_components(tasks, outdir, context)
+            # Results are applied in component order, however they completed
+            for (template_file, output_file), outcome in zip(tasks, outcomes):
+                if isinstance(outcome, Exception):
+                    failure = ComponentFailure(template_file, output_file, str(outcome))
+                    self._log(f"Error: failed to generate {failure}")
+                    failed.append(failure)
+                    manifest.forget(template_file)
+                    continue
+                changed, digest = outcome
+                if changed:
+                    written.append(output_file)
+                    self._log(f"Generated {output_file}")
+                else:
+                    skipped.append(output_file)
+                manifest.record(template_file, keys[template_file], output_file, digest)
+
+        manifest.save()
+        self._log(
+            f"Testbench generation complete! {len(written)} files written, "
+            f"{len(skipped)} skipped (unchanged)"
+            + (f", {len(failed)} failed" if failed else "")
         )
+        return GenerationSummary(module_name, written, skipped, failed)
 
-        # Setup Jinja2 environment
-        env = Environment(
-            loader=FileSystemLoader(str(self.template_dir)),
-            trim_blocks=True,
-            lstrip_blocks=True,
+    def _component_jobs(self, count: int) -> int:
+        jobs = self.jobs
+        if jobs is None:
+            jobs = min(_MAX_COMPONENT_JOBS, os.cpu_count() or 1)
+        return max(1, min(jobs, count))
+
+    def _write_components(self, tasks: List[Tuple[str, str]], outdir: Path, context: dict) -> list:
+        """Render and write every (template, output file) task.
+
+        Returns, in task order, (written, sha256) or the exception that
+        stopped the component. The context is shared read-only by all
+        components; with process workers each worker receives a copy and
+        renders with the shared environment for ``template_dir``.
+        """
+        context = MappingProxyType(context)
+        jobs = self._component_jobs(len(tasks))
+        if jobs == 1:
+            # Use the caller's environment, else the shared cached one
+            env = self.env or get_environment(self.template_dir)
+            return [
+                self._run_component(env, template, outdir / name, context)
+                for template, name in tasks
+            ]
+
+        pool: Executor
+        if self.executor == "process":
+            pool = ProcessPoolExecutor(max_workers=jobs)
+            env = None
+            context = dict(context)
+        else:
+            pool = ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="uvm_tbgen-render")
+            env = self.env or get_environment(self.template_dir)
+        outcomes = []
+        with span("render components", jobs=jobs, executor=self.executor), pool:
+            futures = [
+                pool.submit(self._run_component, env, template, outdir / name, context)
+                for template, name in tasks
+            ]
+            for future in futures:
+                try:
+                    outcomes.append(future.result())
+                except Exception as e:
+                    # The worker process died or the task could not be sent
+                    outcomes.append(e)
+        return outcomes
+
+    def _run_component(
+        self, env: Optional[Environment], template_file: str, path: Path, context: Mapping
+    ):
+        """Write one component; return (written, sha256) or the exception raised."""
+        if env is None:
+            env = get_environment(self.template_dir)
+        try:
+            with span(f"render {template_file}", file=path.name) as info:
+                changed, digest = self._write_component(env, template_file, path, context)
+                info["changed"] = changed
+        except Exception as e:
+            return e
+        return changed, digest
+
+    def _options(self) -> dict:
+        """Options that affect generated output, recorded in the manifest."""
+        return {"topname": self.topname, "top_module": self.top_module, "params": self.params}
+
+    @staticmethod
+    def _interface_digest(module_name: str, context: Mapping) -> str:
+        """Hash the parts of the template context that come from the DUT."""
+        return input_key(
+            module_name, context["ports"].to_columns(), context["parameters"],
+            context["param_overrides"], context["dut_file"],
         )
 
+    def _template_digest(self, template_file: str) -> Optional[str]:
+        path = Path(self.template_dir) / template_file
+        return file_digest(path) if path.exists() else None
+
+    def _parse_dut(self, dut_src: Path, digest: Optional[str] = None):
+        """Return the parsed DUT module, from the parse cache when possible.
+
+        On a miss the DUT is scanned through a memory map only as far as the
+        selected module's ``endmodule``, so large netlists are never loaded
+        whole.
+        """
+        cache = default_parse_cache() if self.parse_cache else None
+        if cache is None:
+            return parse_file(dut_src, self.top_module)
+        return cache.parse(dut_src, self.top_module, digest)
+
+    def _build_context(self, dut_src: Path, digest: Optional[str] = None):
+        """Parse the DUT and return (module_name, template context)."""
+        overrides: Dict[str, str] = {}
+        parameters: Mapping[str, int] = {}
+        try:
+            with span("parse", dut=str(dut_src)):
+                module = self._parse_dut(dut_src, digest)
+        except ValueError:
+            if self.top_module:
+                raise
+            module_name = dut_src.stem
+            ports = PortTable()
+        else:
+            # Fold parameter values and parameterized port widths
+            with span("fold params", params=len(module.params)):
+                folded = fold_module(module, self.params)
+            module_name, ports = module.name, folded.module.ports
+            parameters = {p.name: folded.values[p.name] for p in module.params
+                          if not p.local and p.name in folded.values}
+            overrides = {n: v for n, v in self.params.items() if n not in folded.ignored}
+            for name in folded.ignored:
+                self._log(f"Warning: {module_name} has no parameter '{name}'; override ignored")
+            for name in folded.unresolved:
+                self._log(f"Warning: could not resolve the width of port '{name}'; using 1")
+
+        # Direction-filtered views over the port table (no copies)
+        input_ports = ports.inputs
+        output_ports = ports.outputs
+        inout_ports = ports.inouts
+
+        # Analyze ports for assertion patterns
+        with span("analyze ports", ports=len(ports)):
+            assertion_context = self._analyze_ports_for_assertions(
+                module_name, ports, input_ports, output_ports
+            )
+
+        # Files named by the package and the filelist
+        outputs = {
+            template: pattern.format(module=module_name, topname=self.topname)
+            for template, pattern in COMPONENTS
+        }
+        files = {
+            "dut_file": dut_src.name,
+            "interface_file": outputs["interface.sv.j2"],
+            "package_file": outputs["pkg.sv.j2"],
+            "package_files": [outputs[t] for t in PACKAGE_COMPONENTS],
+            "checker_files": [outputs["assertions.sv.j2"], outputs["checker.sv.j2"]],
+            "top_file": outputs["tb_top.sv.j2"],
+        }
+
         context = {
             "module": module_name,
             "topname": self.topname,
@@ -136,91 +454,54 @@ class TBGenerator:
             "input_ports": input_ports,
             "output_ports": output_ports,
             "inout_ports": inout_ports,
+            "parameters": parameters,
+            "param_overrides": overrides,
             **assertion_context,  # Add assertion-specific context
+            **files,
         }
+        return module_name, context
 
-        # Generate each component
-        components = [
-            ("seq_item.sv.j2", f"{module_name}_seq_item.sv"),
-            ("driver.sv.j2", f"{module_name}_driver.sv"),
-            ("monitor.sv.j2", f"{module_name}_monitor.sv"),
-            ("sequencer.sv.j2", f"{module_name}_sequencer.sv"),
-            ("agent.sv.j2", f"{module_name}_agent.sv"),
-            ("scoreboard.sv.j2", f"{module_name}_scoreboard.sv"),
-            ("env_generated.sv.j2", f"{module_name}_env.sv"),
-            ("test.sv.j2", f"{module_name}_test.sv"),
-            ("coverage.sv.j2", f"{module_name}_coverage.sv"),
-            ("checker.sv.j2", f"{module_name}_checker.sv"),
-        ]
-
-        for template_file, output_file in components:
-            try:
-                template = env.get_template(template_file)
-                content = template.render(context)
-                output_path = outdir / output_file
-                output_path.write_text(content, encoding="utf-8")
-                print(f"[uvm_tbgen] Generated {output_file}")
-            except Exception as e:
-                print(f"[uvm_tbgen] Warning: Failed to generate {template_file}: {e}")
-
-        # Generate assertions
-        try:
-            template = env.get_template("assertions.sv.j2")
-            content = template.render(context)
-            output_path = outdir / f"{module_name}_assertions.sv"
-            output_path.write_text(content, encoding="utf-8")
-            print(f"[uvm_tbgen] Generated {module_name}_assertions.sv")
-        except Exception as e:
-            print(f"[uvm_tbgen] Warning: Failed to generate assertions: {e}")
-
-        # Generate interface
-        try:
-            template = env.get_template("interface.sv.j2")
-            # Map Port to template format
-            ports_for_if = [
-                {
-                    "name": p.name,
-                    "dir": p.direction,
-                    "width": f"[{p.width - 1}:0]" if p.width > 1 else "",
-                }
-                for p in ports
-            ]
-            context["ports"] = ports_for_if
-            content = template.render(context)
-            output_path = outdir / f"{module_name}_if.sv"
-            output_path.write_text(content, encoding="utf-8")
-            print(f"[uvm_tbgen] Generated {module_name}_if.sv")
-        except Exception as e:
-            print(f"[uvm_tbgen] Warning: Failed to generate interface: {e}")
+    def _write_component(
+        self, env: Environment, template_file: str, path: Path, context: dict
+    ) -> Tuple[bool, str]:
+        """Stream one component template into ``path``; return (written, sha256).
 
-        # Generate top module using tb_top.sv.j2 if it exists
+        The output is rendered chunk by chunk with ``Template.generate()``
+        and never held in memory as a whole. On errors no partial file is
+        left behind.
+        """
         try:
-            template = env.get_template("tb_top.sv.j2")
-            context["ports"] = ports
-            content = template.render(context)
-            output_path = outdir / f"{self.topname}.sv"
-            output_path.write_text(content, encoding="utf-8")
-            print(f"[uvm_tbgen] Generated {self.topname}.sv")
-        except Exception as e:
-            print(f"[uvm_tbgen] tb_top.sv.j2 not found or error; using fallback top module")
-            self._generate_fallback_top(outdir, module_name, ports)
-
-        print(f"[uvm_tbgen] Testbench generation complete!")
-
-    def _generate_fallback_top(
-        self, outdir: Path, module_name: str, ports: List[Port]
-    ) -> None:
-        """Generate a simple fallback top module if tb_top.sv.j2 not available."""
+            chunks = env.get_template(template_file).generate(context)
+            return write_stream_if_changed(path, chunks)
+        except Exception:
+            if template_file != "tb_top.sv.j2":
+                raise
+            # Generate top module using tb_top.sv.j2 if it exists
+            self._log("tb_top.sv.j2 not found or error; using fallback top module")
+            top = self._fallback_top(
+                context["module"], context["ports"], context["param_overrides"]
+            )
+            return write_stream_if_changed(path, [top])
+
+    def _fallback_top(
+        self, module_name: str, ports: PortTable, overrides: Optional[Mapping[str, str]] = None
+    ) -> str:
+        """Return a simple fallback top module if tb_top.sv.j2 not available."""
+        instance = module_name
+        if overrides:
+            assigns = ", ".join(f".{name}({value})" for name, value in overrides.items())
+            instance = f"{module_name} #({assigns})"
         content = (
             f"// Auto-generated UVM testbench top (fallback)\n"
             f"`timescale 1ns/1ps\n"
             f"`include \"uvm_macros.svh\"\n"
-            f"import uvm_pkg::*;\n\n"
+            f"import uvm_pkg::*;\n"
+            f"import {module_name}_pkg::*;\n\n"
             f"module {self.topname};\n\n"
             f"  // DUT interface\n"
             f"  {module_name}_if dut_if();\n\n"
             f"  // DUT instance\n"
-            f"  {module_name} dut_inst (\n"
+            f"  {instance} dut_inst (\n"
         )
 
         for i, p in enumerate(ports):
@@ -234,18 +515,15 @@ class TBGenerator:
             f"  end\n"
             f"endmodule\n"
         )
-
-        output_path = outdir / f"{self.topname}.sv"
-        output_path.write_text(content, encoding="utf-8")
-        print(f"[uvm_tbgen] Generated {self.topname}.sv (fallback)")
+        return content
 
     def _generate_uvm_scaffold(self, module_name: str, ports: List[Port]) -> str:
         """Legacy scaffold generator (retained for reference; replaced by Jinja2 templates)."""
         return ""
 
     def _analyze_ports_for_assertions(
-        self, module_name: str, all_ports: List[Port], input_ports: List[Port],
-        output_ports: List[Port]
+        self, module_name: str, all_ports: PortTable, input_ports: PortView,
+        output_ports: PortView
     ) -> dict:
         """Analyze ports to generate meaningful SVA properties and constraints."""
         context = {
@@ -254,6 +532,8 @@ class TBGenerator:
             "has_ready_signal": False,
             "multiple_control_signals": False,
             "control_signals": [],
+            "data_input_ports": [],
+            "data_output_ports": [],
         }
 
         # Find reset signal
@@ -283,5 +563,9 @@ class TBGenerator:
         if len(context["control_signals"]) > 1:
             context["multiple_control_signals"] = True
 
+        # Data ports, paired up by the data propagation assertions
+        context["data_input_ports"] = [p for p in input_ports if "data" in p.name.lower()]
+        context["data_output_ports"] = [p for p in output_ports if "data" in p.name.lower()]
+
         return context
 
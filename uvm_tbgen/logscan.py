@@ -0,0 +1,418 @@
+"""Incremental parsing of UVM simulation output.
+
+:class:`LogWatcher` is fed simulator output one line at a time while the
+simulation runs. It counts UVM report severities and failures of the
+generated ``a_*`` assertions, and decides when a run should be aborted
+early (``UVM_FATAL`` or too many errors).
+
+:func:`analyze_log` runs the same parser over a finished log in a single
+streaming pass (optionally through a memory map) and additionally collects
+report counts per message ID, the context around the first failure and the
+simulation end time. Memory use does not depend on the log size, so
+multi-gigabyte ``UVM_HIGH`` logs can be summarised; :func:`analyze_logs`
+spreads many logs over a process pool.
+
+Assertion failures are recognised in the formats the supported simulators
+print: a single line naming the ``a_*`` label together with ``failed`` /
+``Error`` / ``*E,ASRT`` (VCS, Xcelium), or an ``** Error:`` / ``Error:``
+line followed by a ``Scope:`` or ``Process:`` line naming the label
+(Questa, xsim). Simulator errors that cannot be tied to a label are
+counted separately.
+"""
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import contextlib
+import mmap
+import os
+import re
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
+SEVERITIES = ("UVM_INFO", "UVM_WARNING", "UVM_ERROR", "UVM_FATAL")
+
+# "UVM_ERROR file.sv(12) @ 100: reporter [ID] text", optionally behind "# ".
+# The report summary ("UVM_ERROR :    3") is excluded by the lookahead.
+_UVM_RE = re.compile(r"^(?:#\s*)?(UVM_(?:INFO|WARNING|ERROR|FATAL))(?!\s*:\s*\d)\b")
+_SUMMARY_RE = re.compile(r"---\s*UVM Report Summary\s*---")
+_LABEL_RE = re.compile(r"(?:^|[\s./:])(a_\w+)")
+_FAILED_RE = re.compile(r"\bfail(?:ed|ure)?\b|\berror\b|\*E,ASRT", re.I)
+_SIM_ERROR_RE = re.compile(r"^(?:#\s*)?(?:\*\*\s*Error\b|Error:|\S*:\s*\*E,)")
+_SCOPE_RE = re.compile(r"\b(?:Scope|Process):")
+# "... @ 100ns: reporter [ID] ..." after the severity of a UVM report
+_REPORT_RE = re.compile(r"[^@\n]*@\s*(?P<time>[^:\n]*?)\s*:\s*\S*\s*\[(?P<id>[^\]\n]*)\]")
+# VCS, Xcelium and xsim $finish messages, and Questa's "Time:" line after them
+_FINISH_RE = re.compile(
+    r"\$finish\b.*?\bat\s+(?:simulation\s+)?time\s*:?\s*(?P<time>\d[\d.]*(?:[ \t]*[a-zA-Z]+)?)"
+)
+_TIME_RE = re.compile(r"\bTime:\s*(?P<time>\d[\d.]*(?:[ \t]*[a-zA-Z]+)?)")
+
+# Lines after a simulator error in which its scope line may appear
+_SCOPE_WINDOW = 3
+
+# Volatile parts of a failure message, replaced in order by failure_signature()
+_SIGNATURE_SUBS = (
+    # "UVM_ERROR file.sv(12) @ 100: uvm_test_top.env.scb [ID] text" -> "UVM_ERROR [ID] text"
+    (re.compile(r"^(?:#\s*)?(UVM_[A-Z]+)\b[^@\n]*@[^:\n]*:\s*\S*\s*(?=\[)"), r"\1 "),
+    # Directories of file paths: "/runs/seed_7/compile.log" -> "compile.log"
+    (re.compile(r"(?<![\w.])(?:[A-Za-z]:)?(?:[/\\][^\s/\\:\"'()]+)+[/\\](?=[^\s/\\])"), ""),
+    (re.compile(r"\b\d+(?:\.\d+)?\s*(?:fs|ps|ns|us|ms|s)\b"), "<time>"),
+    (re.compile(r"\b0[xX][0-9a-fA-F_]+\b|(?<!\w)\d*'[sS]?[hHbBoOdD][0-9a-fA-F_xXzZ?]+\b"), "<hex>"),
+    (re.compile(r"\b(?=[0-9a-fA-F]*\d)(?=[0-9a-fA-F]*[a-fA-F])[0-9a-fA-F]{4,}\b"), "<hex>"),
+    # Hierarchical paths keep their leaf: "uvm_test_top.env.agent[3].drv" -> "*.drv"
+    (re.compile(
+        r"(?<![\w.])(?:[A-Za-z_]\w*(?:\[\d+\])*\.)+(?!(?:sv|svh|v|vh|log|f)\b)([A-Za-z_]\w*)\b"
+    ), r"*.\1"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "<n>"),
+    (re.compile(r"\s+"), " "),
+)
+# Longest signature kept
+_SIGNATURE_LEN = 240
+
+
+class LogWatcher:
+    """Count severities and assertion failures in simulator output.
+
+    ``max_errors`` is a threshold on UVM_ERROR, UVM_FATAL, assertion
+    failures and other simulator errors combined; ``abort_on_fatal`` stops
+    at the first UVM_FATAL. :meth:`feed` returns the abort reason once a
+    limit is reached.
+    """
+
+    def __init__(self, max_errors: Optional[int] = None, abort_on_fatal: bool = False):
+        self.max_errors = max_errors
+        self.abort_on_fatal = abort_on_fatal
+        self.severities: Dict[str, int] = dict.fromkeys(SEVERITIES, 0)
+        self.assertions: Dict[str, int] = {}
+        self.sim_errors = 0
+        self.errors = 0  # failures counted towards max_errors
+        self.reason = ""
+        self.failure = ""  # first failure message, with its scope line if one names it
+        self._pending = 0  # lines left to find the scope of a simulator error
+        self._pending_line = ""
+        self._in_summary = False
+
+    @property
+    def assertion_failures(self) -> int:
+        return sum(self.assertions.values())
+
+    @property
+    def failed(self) -> bool:
+        return self.errors > 0
+
+    def summary(self) -> str:
+        """Short description of the failures seen, e.g. ``'2 UVM_ERROR, 1 assertion failure'``."""
+        parts = [
+            f"{self.severities[sev]} {sev}"
+            for sev in ("UVM_FATAL", "UVM_ERROR") if self.severities[sev]
+        ]
+        if self.assertion_failures:
+            n = self.assertion_failures
+            parts.append(f"{n} assertion failure{'s' if n != 1 else ''}")
+        if self.sim_errors:
+            parts.append(f"{self.sim_errors} simulator error{'s' if self.sim_errors != 1 else ''}")
+        return ", ".join(parts)
+
+    @property
+    def waiting(self) -> bool:
+        """True while a simulator error waits for the line naming its scope."""
+        return self._pending > 0
+
+    @property
+    def finished(self) -> bool:
+        """True once the UVM report summary is reached; later lines are ignored."""
+        return self._in_summary
+
+    def feed(self, line: str) -> Optional[str]:
+        """Account for one line of output; return the abort reason once a limit is hit."""
+        if self._in_summary:
+            return None
+        m = _UVM_RE.match(line)
+        if m:
+            self._close_pending()
+            severity = m.group(1)
+            self.severities[severity] += 1
+            if severity in ("UVM_ERROR", "UVM_FATAL"):
+                self.errors += 1
+                self._failed(line)
+            self._on_report(severity, line, m.end())
+            if severity == "UVM_FATAL" and self.abort_on_fatal:
+                return self._abort(f"UVM_FATAL: {line.strip()}")
+        elif _SUMMARY_RE.search(line):
+            self._close_pending()
+            self._in_summary = True
+            return None
+        else:
+            self._assertion(line)
+        if self.max_errors and self.errors >= self.max_errors:
+            return self._abort(f"error limit reached ({self.summary()})")
+        return None
+
+    def _on_report(self, severity: str, line: str, pos: int) -> None:
+        """Hook called for every UVM report line; ``pos`` is the end of the severity."""
+
+    def _on_error_block(self, line: str) -> None:
+        """Hook called when a simulator error opens; it is counted on a later line."""
+
+    def _abort(self, reason: str) -> str:
+        if not self.reason:
+            self.reason = reason
+        return self.reason
+
+    def _failed(self, message: str) -> None:
+        if not self.failure:
+            self.failure = message.strip()
+
+    def _count(self, label: str, message: str) -> None:
+        self.assertions[label] = self.assertions.get(label, 0) + 1
+        self.errors += 1
+        self._failed(message)
+
+    def _sim_error(self) -> None:
+        self.sim_errors += 1
+        self.errors += 1
+        self._failed(self._pending_line)
+
+    def _close_pending(self) -> None:
+        if self._pending:
+            self._pending = 0
+            self._sim_error()
+
+    def _assertion(self, line: str) -> None:
+        label = _LABEL_RE.search(line)
+        if label and _FAILED_RE.search(line):
+            message = f"{self._pending_line} {line.strip()}" if self._pending else line
+            self._pending = 0
+            self._count(label.group(1), message)
+        elif _SIM_ERROR_RE.match(line):
+            self._close_pending()
+            self._pending = _SCOPE_WINDOW
+            self._pending_line = line.strip()
+            self._on_error_block(line)
+        elif self._pending:
+            if label and _SCOPE_RE.search(line):
+                self._pending = 0
+                self._count(label.group(1), f"{self._pending_line} {line.strip()}")
+            else:
+                self._pending -= 1
+                if not self._pending:
+                    self._sim_error()
+
+    def close(self) -> None:
+        """Flush state at the end of the output."""
+        self._close_pending()
+
+
+class FailureContext(NamedTuple):
+    """The first failing line of a log and the lines around it."""
+    line_number: int
+    line: str
+    before: List[str]
+    after: List[str]
+
+
+class LogSummary(NamedTuple):
+    """Result of :func:`analyze_log` for one log file."""
+    path: str
+    lines: int
+    severities: Dict[str, int]
+    ids: Dict[str, Dict[str, int]]  # severity -> message ID -> count
+    assertions: Dict[str, int]  # a_* label -> failures
+    sim_errors: int
+    first_failure: Optional[FailureContext]
+    end_time: str
+    error: str = ""
+
+    @property
+    def failed(self) -> bool:
+        return bool(self.error) or (
+            self.severities.get("UVM_ERROR", 0) + self.severities.get("UVM_FATAL", 0)
+            + sum(self.assertions.values()) + self.sim_errors
+        ) > 0
+
+
+class LogAnalyzer(LogWatcher):
+    """:class:`LogWatcher` that also keeps per-ID counts, failure context and end time."""
+
+    def __init__(self, context: int = 5):
+        super().__init__()
+        self.context = context
+        self.ids: Dict[str, Dict[str, int]] = {sev: {} for sev in SEVERITIES}
+        self.lines = 0
+        self.end_time = ""
+        self.first_failure: Optional[FailureContext] = None
+        self._recent: deque = deque(maxlen=context)
+        self._after: Optional[List[str]] = None
+        self._finish_seen = False
+
+    def feed(self, line: str) -> Optional[str]:
+        self.lines += 1
+        after = self._after
+        if after is not None:
+            if len(after) < self.context:
+                after.append(line.rstrip("\r\n"))
+            else:
+                self._after = None
+        if self._finish_seen:
+            # Questa reports the time on the line after "$finish"
+            self._finish_seen = False
+            m = _TIME_RE.search(line)
+            if m:
+                self.end_time = m.group("time")
+        if "$finish" in line:
+            m = _FINISH_RE.search(line)
+            if m:
+                self.end_time = m.group("time")
+            else:
+                self._finish_seen = True
+        before = self.errors
+        super().feed(line)
+        if self.errors != before and self.first_failure is None:
+            self._first_failure(line)
+        if self.context:
+            self._recent.append(line.rstrip("\r\n"))
+        return None
+
+    def _first_failure(self, line: str) -> None:
+        self._after = []
+        self.first_failure = FailureContext(
+            self.lines, line.rstrip("\r\n"), list(self._recent), self._after
+        )
+
+    def _on_error_block(self, line: str) -> None:
+        # Every error block is counted eventually (once its scope is known, or
+        # when the window runs out), but the failure is its first line
+        if self.first_failure is None:
+            self._first_failure(line)
+
+    def _on_report(self, severity: str, line: str, pos: int) -> None:
+        m = _REPORT_RE.match(line, pos)
+        if m is None:
+            return
+        counts = self.ids[severity]
+        msg_id = m.group("id")
+        counts[msg_id] = counts.get(msg_id, 0) + 1
+        self.end_time = m.group("time")
+
+    def result(self, path: str) -> LogSummary:
+        return LogSummary(
+            path, self.lines, dict(self.severities),
+            {sev: ids for sev, ids in self.ids.items() if ids},
+            dict(self.assertions), self.sim_errors, self.first_failure, self.end_time,
+        )
+
+
+@contextlib.contextmanager
+def _open_lines(path: str, use_mmap: bool) -> Iterator[Iterable[bytes]]:
+    """Yield an iterator over the raw lines of a file."""
+    with open(path, "rb") as f:
+        mm = None
+        if use_mmap:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                # Empty or non-regular files cannot be mapped
+                mm = None
+        if mm is None:
+            yield f
+            return
+        try:
+            if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            yield iter(mm.readline, b"")
+        finally:
+            mm.close()
+
+
+def analyze_log(path: str, context: int = 5, use_mmap: bool = False) -> LogSummary:
+    """Summarise one simulation log in a single streaming pass.
+
+    ``context`` lines before and after the first failure are kept. Lines
+    are read through a memory map with ``use_mmap``, else through a
+    buffered file. I/O errors are reported in ``LogSummary.error``.
+    """
+    analyzer = LogAnalyzer(context)
+    feed = analyzer.feed
+    try:
+        with _open_lines(path, use_mmap) as lines:
+            for raw in lines:
+                # latin-1 never fails and keeps the ASCII markers intact
+                feed(raw.decode("latin-1"))
+    except OSError as e:
+        return analyzer.result(str(path))._replace(error=str(e))
+    analyzer.close()
+    return analyzer.result(str(path))
+
+
+def analyze_logs(
+    paths: Sequence[str], jobs: Optional[int] = None, context: int = 5, use_mmap: bool = False
+) -> List[LogSummary]:
+    """Analyze many logs on a process pool; results are in input order."""
+    paths = [str(p) for p in paths]
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(paths) or 1))
+    if jobs == 1:
+        return [analyze_log(p, context, use_mmap) for p in paths]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(analyze_log, p, context, use_mmap) for p in paths]
+        return [f.result() for f in futures]
+
+
+def failure_signature(message: str) -> str:
+    """Reduce a failure message to a signature shared by runs failing the same way.
+
+    Report locations, simulation times, hex values, numbers (seeds, counts,
+    indices) and all but the leaf of hierarchical paths are replaced by
+    placeholders, so ``UVM_ERROR scb.sv(88) @ 1200ns: uvm_test_top.env.scb
+    [CMP] Expected 0x1f got 0x20`` becomes ``UVM_ERROR [CMP] Expected <hex>
+    got <hex>``.
+    """
+    for pattern, replacement in _SIGNATURE_SUBS:
+        message = pattern.sub(replacement, message)
+    return message.strip()[:_SIGNATURE_LEN]
+
+
+def summary_to_json(summary: LogSummary) -> dict:
+    """Return ``summary`` as JSON-compatible data, including ``failed``."""
+    failure = summary.first_failure
+    return dict(
+        summary._asdict(), failed=summary.failed,
+        first_failure=failure._asdict() if failure else None,
+    )
+
+
+def summary_from_json(data: dict) -> LogSummary:
+    """Inverse of :func:`summary_to_json`."""
+    fields = {k: v for k, v in data.items() if k in LogSummary._fields}
+    if fields.get("first_failure"):
+        fields["first_failure"] = FailureContext(**fields["first_failure"])
+    return LogSummary(**fields)
+
+
+def print_log_summary(summary: LogSummary) -> None:
+    """Print a human-readable report for one log."""
+    status = "ERROR" if summary.error else ("FAILED" if summary.failed else "OK")
+    print(f"[uvm_tbgen] {summary.path}: {status} ({summary.lines} lines"
+          f"{', ended at ' + summary.end_time if summary.end_time else ''})")
+    if summary.error:
+        print(f"  {summary.error}")
+        return
+    for sev in SEVERITIES:
+        count = summary.severities.get(sev, 0)
+        if not count:
+            continue
+        ids = summary.ids.get(sev, {})
+        top = sorted(ids.items(), key=lambda item: (-item[1], item[0]))
+        detail = ", ".join(f"[{msg_id}] {n}" for msg_id, n in top[:10])
+        if len(top) > 10:
+            detail += f", ... ({len(top) - 10} more IDs)"
+        print(f"  {sev:<12}{count:>9}  {detail}")
+    for label, n in sorted(summary.assertions.items(), key=lambda item: (-item[1], item[0])):
+        print(f"  assertion   {n:>9}  {label}")
+    if summary.sim_errors:
+        print(f"  sim errors  {summary.sim_errors:>9}")
+    failure = summary.first_failure
+    if failure is not None:
+        print(f"  First failure at line {failure.line_number}:")
+        for line in failure.before:
+            print(f"      {line}")
+        print(f"    > {failure.line}")
+        for line in failure.after:
+            print(f"      {line}")
@@ -0,0 +1,176 @@
+"""Content-hash manifest for incremental testbench regeneration.
+
+The manifest lives next to the generated files and records, for every
+output, a key derived from its inputs (the DUT's module name, ports and
+parameters, template text, generator version and options) together with
+the hash and stat of the file that was written. An output whose key is
+unchanged and whose file is still intact is skipped without rendering.
+"""
+import hashlib
+import itertools
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+MANIFEST_NAME = ".uvm_tbgen_manifest.json"
+MANIFEST_FORMAT = 1
+_CHUNK = 1 << 20
+# Rendered chunks joined, encoded and written at a time
+_STREAM_BATCH = 4096
+
+
+def file_digest(path: Path) -> str:
+    """Return the SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def input_key(*parts) -> str:
+    """Return a stable hash of JSON-serialisable input parts."""
+    blob = json.dumps(parts, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _create_temp(path: Path) -> Tuple[int, str]:
+    """Create a new temporary file next to ``path`` and return (fd, name).
+
+    Unlike mkstemp, the file gets the mode the umask gives a new file, so
+    the output that replaces ``path`` is not private.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    while True:
+        tmp = str(path.parent / f".{path.name}.{os.urandom(6).hex()}.tmp")
+        try:
+            return os.open(tmp, flags, 0o666), tmp
+        except FileExistsError:
+            continue
+
+
+def write_stream_if_changed(path: Path, chunks: Iterable[str]) -> Tuple[bool, str]:
+    """Write streamed text to ``path`` unless it already holds the same bytes.
+
+    The chunks are joined in batches, encoded as UTF-8 and written to a temporary
+    file in the target directory while being hashed, so memory use does
+    not grow with the output. The temporary file then atomically replaces
+    ``path``, or is dropped if ``path`` already has the same contents. If
+    the chunks raise, the temporary file is removed and ``path`` is left
+    untouched. Returns (written, sha256 of the text).
+    """
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp = _create_temp(path)
+    try:
+        chunks = iter(chunks)
+        with os.fdopen(fd, "wb") as f:
+            # Templates yield many tiny chunks; join them in batches
+            while True:
+                batch = list(itertools.islice(chunks, _STREAM_BATCH))
+                if not batch:
+                    break
+                data = "".join(batch).encode("utf-8")
+                digest.update(data)
+                f.write(data)
+                size += len(data)
+        hexdigest = digest.hexdigest()
+        try:
+            unchanged = path.stat().st_size == size and file_digest(path) == hexdigest
+        except FileNotFoundError:
+            unchanged = False
+        if unchanged:
+            os.unlink(tmp)
+            return False, hexdigest
+        os.replace(tmp, path)
+        return True, hexdigest
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class Manifest:
+    """Inputs and outputs of the last generation into one output directory."""
+
+    def __init__(self, path: Path, data: Optional[dict] = None):
+        self.path = path
+        data = data if data and data.get("format") == MANIFEST_FORMAT else {}
+        self.module: Optional[str] = data.get("module")
+        self.inputs: Dict = data.get("inputs", {})
+        self.outputs: Dict[str, Dict] = data.get("outputs", {})
+        self._sources: Dict[str, Dict] = data.get("sources", {})
+
+    @classmethod
+    def load(cls, outdir: Path) -> "Manifest":
+        path = outdir / MANIFEST_NAME
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = None
+        return cls(path, data)
+
+    def source_digest(self, path: Path) -> str:
+        """Return the hash of an input file, reusing it while its stat is unchanged."""
+        st = path.stat()
+        key = str(path.resolve())
+        entry = self._sources.get(key)
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            return entry["sha256"]
+        digest = file_digest(path)
+        self._sources = {key: {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}}
+        return digest
+
+    def is_current(self, component: str, key: str) -> bool:
+        """Return True if ``component`` was generated from ``key`` and is intact.
+
+        A file whose stat changed but whose contents did not is still current;
+        its new stat is recorded for :meth:`save`.
+        """
+        entry = self.outputs.get(component)
+        if not entry or entry["key"] != key:
+            return False
+        path = self.path.parent / entry["file"]
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return False
+        if st.st_size == entry["size"] and st.st_mtime_ns == entry["mtime_ns"]:
+            return True
+        if file_digest(path) != entry["sha256"]:
+            return False
+        # Touched but intact: record the new stat so later runs skip the hash
+        entry["size"], entry["mtime_ns"] = st.st_size, st.st_mtime_ns
+        return True
+
+    def output_file(self, component: str) -> Optional[str]:
+        entry = self.outputs.get(component)
+        return entry["file"] if entry else None
+
+    def record(self, component: str, key: str, filename: str, digest: str) -> None:
+        st = (self.path.parent / filename).stat()
+        self.outputs[component] = {
+            "file": filename,
+            "key": key,
+            "sha256": digest,
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+        }
+
+    def forget(self, component: str) -> None:
+        self.outputs.pop(component, None)
+
+    def save(self) -> None:
+        data = {
+            "format": MANIFEST_FORMAT,
+            "module": self.module,
+            "inputs": self.inputs,
+            "sources": self._sources,
+            "outputs": self.outputs,
+        }
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        os.replace(tmp, self.path)
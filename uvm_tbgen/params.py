@@ -0,0 +1,380 @@
+"""Constant folding of parameter values and parameterized port widths.
+
+Parameter defaults, ``--param`` overrides and port ranges are kept as source
+text by the parser. This module compiles such constant expressions
+(arithmetic, shifts, comparisons, logical and bitwise operators, the
+conditional operator, ``$clog2`` and parameter references) into small
+closures and evaluates them against a module's parameter environment.
+
+Everything that can be shared is memoized per process: compiled
+expressions are cached by their text, and the parameter environment of a
+module is cached by its parameter declarations and the applied overrides.
+Batch runs over many variants of one IP therefore evaluate each distinct
+parameter set once and only look up port ranges afterwards.
+"""
+import functools
+import re
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from .ports import PortTable
+from .verilog import Module, Param, _int_literal, _split_top, tokenize
+
+Env = Mapping[str, int]
+_Fn = Callable[[Env], int]
+
+# Larger shift counts or exponents are not meaningful for widths.
+_MAX_SHIFT = 4096
+
+_NAME_RE = re.compile(r"[A-Za-z_][\w$]*")
+
+# The tokenizer emits single-character operators; rebuild the compound ones.
+_MERGE = {
+    ("=", "="): "==", ("!", "="): "!=", ("==", "="): "===", ("!=", "="): "!==",
+    ("<", "="): "<=", (">", "="): ">=", ("&", "&"): "&&", ("|", "|"): "||",
+    ("~", "^"): "~^", ("^", "~"): "^~",
+}
+
+
+class _Unresolved(Exception):
+    """Raised while evaluating when a value cannot be determined."""
+
+
+def _div(a: int, b: int) -> int:
+    if b == 0:
+        raise _Unresolved
+    q = abs(a) // abs(b)
+    return q if (a >= 0) == (b >= 0) else -q
+
+
+def _mod(a: int, b: int) -> int:
+    return a - b * _div(a, b)
+
+
+def _pow(a: int, b: int) -> int:
+    if b < 0 or b > _MAX_SHIFT:
+        raise _Unresolved
+    return a ** b
+
+
+def _shl(a: int, b: int) -> int:
+    if b < 0 or b > _MAX_SHIFT:
+        raise _Unresolved
+    return a << b
+
+
+def _shr(a: int, b: int) -> int:
+    if b < 0:
+        raise _Unresolved
+    return a >> b
+
+
+def _clog2(n: int) -> int:
+    return 0 if n <= 1 else (n - 1).bit_length()
+
+
+# operator -> (precedence, function); higher binds tighter
+_BINARY = {
+    "||": (2, lambda a, b: int(bool(a) or bool(b))),
+    "&&": (3, lambda a, b: int(bool(a) and bool(b))),
+    "|": (4, lambda a, b: a | b),
+    "^": (5, lambda a, b: a ^ b),
+    "~^": (5, lambda a, b: ~(a ^ b)),
+    "^~": (5, lambda a, b: ~(a ^ b)),
+    "&": (6, lambda a, b: a & b),
+    "==": (7, lambda a, b: int(a == b)),
+    "!=": (7, lambda a, b: int(a != b)),
+    "===": (7, lambda a, b: int(a == b)),
+    "!==": (7, lambda a, b: int(a != b)),
+    "<": (8, lambda a, b: int(a < b)),
+    "<=": (8, lambda a, b: int(a <= b)),
+    ">": (8, lambda a, b: int(a > b)),
+    ">=": (8, lambda a, b: int(a >= b)),
+    "<<": (9, _shl),
+    "<<<": (9, _shl),
+    ">>": (9, _shr),
+    ">>>": (9, _shr),
+    "+": (10, lambda a, b: a + b),
+    "-": (10, lambda a, b: a - b),
+    "*": (11, lambda a, b: a * b),
+    "/": (11, _div),
+    "%": (11, _mod),
+    "**": (12, _pow),
+}
+_TERNARY_PRECEDENCE = 1
+
+_UNARY = {
+    "+": lambda a: a,
+    "-": lambda a: -a,
+    "!": lambda a: int(not a),
+    "~": lambda a: ~a,
+}
+
+_FUNCTIONS = {
+    "$clog2": _clog2,
+    "$signed": lambda a: a,
+    "$unsigned": lambda a: a,
+}
+
+
+def _lex(text: str) -> List[str]:
+    tokens: List[str] = []
+    for tok in tokenize(text):
+        if tokens and (tokens[-1], tok) in _MERGE:
+            tokens[-1] = _MERGE[tokens[-1], tok]
+        else:
+            tokens.append(tok)
+    return tokens
+
+
+def _unresolved(env: Env) -> int:
+    raise _Unresolved
+
+
+class _Compiler:
+    """Precedence-climbing compiler from tokens to an evaluation closure."""
+
+    def __init__(self, tokens: List[str]):
+        self.tokens = tokens
+        self.pos = 0
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _take(self) -> str:
+        tok = self._peek()
+        if tok is None:
+            raise ValueError("unexpected end of expression")
+        self.pos += 1
+        return tok
+
+    def _expect(self, tok: str) -> None:
+        got = self._take()
+        if got != tok:
+            raise ValueError(f"expected '{tok}', found '{got}'")
+
+    def compile(self) -> _Fn:
+        fn = self._expr(0)
+        if self._peek() is not None:
+            raise ValueError(f"unexpected '{self._peek()}'")
+        return fn
+
+    def _expr(self, min_prec: int) -> _Fn:
+        left = self._unary()
+        while True:
+            op = self._peek()
+            if op == "?" and min_prec <= _TERNARY_PRECEDENCE:
+                self._take()
+                then = self._expr(0)
+                self._expect(":")
+                other = self._expr(_TERNARY_PRECEDENCE)
+                left = (lambda env, c=left, t=then, o=other: t(env) if c(env) else o(env))
+                continue
+            entry = _BINARY.get(op)
+            if entry is None or entry[0] < min_prec:
+                return left
+            prec, fn = entry
+            self._take()
+            # ** is right-associative, everything else left-associative
+            right = self._expr(prec if op == "**" else prec + 1)
+            left = (lambda env, f=fn, a=left, b=right: f(a(env), b(env)))
+
+    def _unary(self) -> _Fn:
+        tok = self._take()
+        if tok in _UNARY:
+            fn, operand = _UNARY[tok], self._unary()
+            return lambda env: fn(operand(env))
+        return self._primary(tok)
+
+    def _primary(self, tok: str) -> _Fn:
+        if tok == "(":
+            inner = self._expr(0)
+            self._expect(")")
+            return inner
+        if tok[0].isdigit() or tok[0] == "'":
+            value = _int_literal([tok])
+            if value is None:
+                # x/z digits or unsupported literal forms
+                return _unresolved
+            return lambda env: value
+        if tok in _FUNCTIONS:
+            func = _FUNCTIONS[tok]
+            self._expect("(")
+            arg = self._expr(0)
+            self._expect(")")
+            return lambda env: func(arg(env))
+        if _NAME_RE.fullmatch(tok):
+            if self._peek() == "::":
+                # Package constants are not visible here
+                self._take()
+                self._take()
+                return _unresolved
+            name = tok
+
+            def lookup(env: Env) -> int:
+                try:
+                    return env[name]
+                except KeyError:
+                    raise _Unresolved from None
+            return lookup
+        raise ValueError(f"unsupported token '{tok}'")
+
+
+@functools.lru_cache(maxsize=8192)
+def compile_expr(text: str) -> Optional[_Fn]:
+    """Compile a constant expression, or return None if it is not supported."""
+    try:
+        return _Compiler(_lex(text)).compile()
+    except ValueError:
+        return None
+
+
+def evaluate(text: str, env: Env) -> Optional[int]:
+    """Return the value of ``text`` in ``env``, or None if it cannot be folded."""
+    fn = compile_expr(text)
+    if fn is None:
+        return None
+    try:
+        return fn(env)
+    except _Unresolved:
+        return None
+
+
+@functools.lru_cache(maxsize=8192)
+def _compile_range(text: str) -> Optional[_Fn]:
+    """Compile packed range text such as ``W-1:0][3:0`` into a width function."""
+    tokens = _lex(f"[{text}]")
+    dims: List[List[str]] = []
+    depth = 0
+    for tok in tokens:
+        if tok == "[":
+            depth += 1
+            if depth == 1:
+                dims.append([])
+                continue
+        elif tok == "]":
+            depth -= 1
+            if depth == 0:
+                continue
+        if depth == 0:
+            return None
+        dims[-1].append(tok)
+
+    parts: List[Tuple[str, _Fn, _Fn]] = []
+    try:
+        for dim in dims:
+            for sep in (":", "+:", "-:"):
+                bounds = _split_top(dim, sep)
+                if len(bounds) == 2:
+                    parts.append((
+                        sep,
+                        _Compiler(bounds[0]).compile(),
+                        _Compiler(bounds[1]).compile(),
+                    ))
+                    break
+            else:
+                return None
+    except ValueError:
+        return None
+
+    def width(env: Env) -> int:
+        total = 1
+        for sep, first, second in parts:
+            if sep == ":":
+                total *= abs(first(env) - second(env)) + 1
+            else:
+                total *= second(env)
+        return total
+    return width
+
+
+def range_width(text: str, env: Env) -> Optional[int]:
+    """Return the width of packed range text in ``env``, or None if unknown."""
+    fn = _compile_range(text)
+    if fn is None:
+        return None
+    try:
+        width = fn(env)
+    except _Unresolved:
+        return None
+    return width if width > 0 else None
+
+
+def parse_overrides(items: Iterable[str]) -> Dict[str, str]:
+    """Parse ``NAME=VALUE`` strings into an ordered override mapping.
+
+    Raises ValueError for malformed items.
+    """
+    overrides: Dict[str, str] = {}
+    for item in items:
+        name, sep, value = item.partition("=")
+        name, value = name.strip(), value.strip()
+        if not sep or not _NAME_RE.fullmatch(name) or not value:
+            raise ValueError(f"Invalid parameter override '{item}', expected NAME=VALUE")
+        overrides[name] = value
+    return overrides
+
+
+@functools.lru_cache(maxsize=1024)
+def _resolve(params: Tuple[Param, ...], overrides: Tuple[Tuple[str, str], ...]) -> Env:
+    given = dict(overrides)
+    env: Dict[str, int] = {}
+    for param in params:
+        text = param.default
+        if not param.local and param.name in given:
+            text = given[param.name]
+        value = evaluate(text, env)
+        if value is not None:
+            env[param.name] = value
+    return MappingProxyType(env)
+
+
+def resolve_params(
+    params: Tuple[Param, ...], overrides: Optional[Mapping[str, str]] = None
+) -> Env:
+    """Return the folded values of ``params`` with ``overrides`` applied.
+
+    Override values are expressions and may refer to earlier parameters.
+    Parameters whose value cannot be folded are left out. The result is
+    shared between callers and must not be modified.
+    """
+    return _resolve(tuple(params), tuple(sorted((overrides or {}).items())))
+
+
+class FoldedModule(NamedTuple):
+    """A module with its parameters and port widths folded to integers."""
+    module: Module
+    values: Env
+    unresolved: List[str]  # ports whose range could not be folded
+    ignored: List[str]  # overrides that name no overridable parameter
+
+
+def fold_module(module: Module, overrides: Optional[Mapping[str, str]] = None) -> FoldedModule:
+    """Fold the parameters of ``module`` and recompute its port widths.
+
+    Ports whose range cannot be folded keep the width the parser gave them.
+    """
+    overrides = overrides or {}
+    values = resolve_params(module.params, overrides)
+    overridable = {p.name for p in module.params if not p.local}
+    ignored = [name for name in overrides if name not in overridable]
+
+    widths: Dict[str, Optional[int]] = {}
+    unresolved: List[str] = []
+    table = PortTable()
+    changed = False
+    for port in module.ports:
+        width = port.width
+        if port.range:
+            if port.range not in widths:
+                widths[port.range] = range_width(port.range, values)
+            folded = widths[port.range]
+            if folded is None:
+                unresolved.append(port.name)
+            elif folded != width:
+                width = folded
+                changed = True
+        table.append(port.name, port.direction, width, port.range)
+    if changed:
+        module = module._replace(ports=table)
+    return FoldedModule(module, values, unresolved, ignored)
@@ -0,0 +1,180 @@
+"""Compact, column-oriented port model.
+
+A :class:`PortTable` stores ports as parallel columns: interned names, one
+byte per direction code, an array of widths and interned range strings.
+Direction-filtered :class:`PortView` objects read the table in place, so
+``input_ports``/``output_ports``/``inout_ports`` cost no copies. Iterating a
+table or view yields lightweight :class:`Port` records built on the fly,
+which is what the templates consume.
+"""
+from array import array
+from enum import IntEnum
+import sys
+from typing import Iterable, Iterator, List, NamedTuple, Union
+
+
+class Port(NamedTuple):
+    """Represents a Verilog port with direction, width, and name."""
+    name: str
+    direction: str = "input"  # "input", "output", "inout"
+    width: int = 1
+    range: str = ""  # packed range text, e.g. "7:0" or "DATA_W-1:0"
+
+    def signal_decl(self) -> str:
+        """Return the signal declaration for testbench."""
+        if self.width == 1:
+            return f"logic {self.name};"
+        return f"logic [{self.width - 1}:0] {self.name};"
+
+    def connection(self) -> str:
+        """Return the DUT instantiation connection."""
+        return f".{self.name}({self.name})"
+
+
+class Direction(IntEnum):
+    """Port direction as stored in a :class:`PortTable` column."""
+    INPUT = 0
+    OUTPUT = 1
+    INOUT = 2
+
+    @property
+    def label(self) -> str:
+        return _LABELS[self]
+
+    @classmethod
+    def parse(cls, direction: Union[str, "Direction"]) -> "Direction":
+        if isinstance(direction, Direction):
+            return direction
+        return _CODES[direction]
+
+
+_LABELS = ("input", "output", "inout")
+_CODES = {label: Direction(code) for code, label in enumerate(_LABELS)}
+
+
+class PortView:
+    """Read-only, direction-filtered view of a :class:`PortTable`."""
+
+    __slots__ = ("_table", "_code")
+
+    def __init__(self, table: "PortTable", direction: Direction):
+        self._table = table
+        self._code = int(direction)
+
+    def __iter__(self) -> Iterator[Port]:
+        table = self._table
+        names, widths, ranges = table._names, table._widths, table._ranges
+        label = _LABELS[self._code]
+        code = self._code
+        for i, c in enumerate(table._dirs):
+            if c == code:
+                yield Port(names[i], label, widths[i], ranges[i])
+
+    def __len__(self) -> int:
+        return self._table._dirs.count(self._code)
+
+    def __bool__(self) -> bool:
+        return self._code in self._table._dirs
+
+    def __getitem__(self, index: int) -> Port:
+        if index < 0:
+            index += len(self)
+        if index >= 0:
+            for i, port in enumerate(self):
+                if i == index:
+                    return port
+        raise IndexError("port view index out of range")
+
+    def __repr__(self) -> str:
+        return f"PortView({_LABELS[self._code]}, {len(self)} ports)"
+
+
+class PortTable:
+    """Ports of one module stored as parallel columns."""
+
+    __slots__ = ("_names", "_dirs", "_widths", "_ranges")
+
+    def __init__(self, ports: Iterable[Port] = ()):
+        self._names: List[str] = []
+        self._dirs = array("B")
+        self._widths = array("l")
+        self._ranges: List[str] = []
+        for port in ports:
+            self.append(*port)
+
+    def append(
+        self, name: str, direction: Union[str, Direction] = "input",
+        width: int = 1, range: str = ""
+    ) -> None:
+        self._names.append(sys.intern(name))
+        self._dirs.append(Direction.parse(direction))
+        self._widths.append(width)
+        self._ranges.append(sys.intern(range))
+
+    def __setitem__(self, index: int, port: Port) -> None:
+        self._names[index] = sys.intern(port.name)
+        self._dirs[index] = Direction.parse(port.direction)
+        self._widths[index] = port.width
+        self._ranges[index] = sys.intern(port.range)
+
+    def __getitem__(self, index: int) -> Port:
+        return Port(
+            self._names[index], _LABELS[self._dirs[index]],
+            self._widths[index], self._ranges[index],
+        )
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __iter__(self) -> Iterator[Port]:
+        for name, code, width, rng in zip(self._names, self._dirs, self._widths, self._ranges):
+            yield Port(name, _LABELS[code], width, rng)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, PortTable):
+            return (
+                self._names == other._names and self._dirs == other._dirs
+                and self._widths == other._widths and self._ranges == other._ranges
+            )
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"PortTable({list(self)!r})"
+
+    def view(self, direction: Union[str, Direction]) -> PortView:
+        return PortView(self, Direction.parse(direction))
+
+    @property
+    def inputs(self) -> PortView:
+        return self.view(Direction.INPUT)
+
+    @property
+    def outputs(self) -> PortView:
+        return self.view(Direction.OUTPUT)
+
+    @property
+    def inouts(self) -> PortView:
+        return self.view(Direction.INOUT)
+
+    def to_columns(self) -> dict:
+        """Return the table as plain lists, e.g. for JSON serialisation."""
+        return {
+            "names": self._names,
+            "dirs": self._dirs.tolist(),
+            "widths": self._widths.tolist(),
+            "ranges": self._ranges,
+        }
+
+    @classmethod
+    def from_columns(cls, columns: dict) -> "PortTable":
+        table = cls()
+        table._names = [sys.intern(n) for n in columns["names"]]
+        table._dirs = array("B", columns["dirs"])
+        table._widths = array("l", columns["widths"])
+        table._ranges = [sys.intern(r) for r in columns["ranges"]]
+        if not len(table._names) == len(table._dirs) == len(table._widths) == len(table._ranges):
+            raise ValueError("port columns differ in length")
+        return table
+
@@ -0,0 +1,155 @@
+"""Timed spans for profiling generation and simulation runs.
+
+Profiling is off unless enabled with ``--profile PATH`` or the
+``UVM_TBGEN_PROFILE=PATH`` environment variable; :func:`span` is then a
+cheap no-op. When enabled, every span records its wall-clock start,
+duration, process and thread (or lane, see :func:`set_lane`) and free-form
+``args``. :meth:`Profiler.save` writes the spans with per-name totals as
+JSON to ``PATH`` and in Chrome trace-event format next to it
+(``profile.json`` -> ``profile.trace.json``), which loads in
+``chrome://tracing`` or Perfetto.
+"""
+import contextlib
+import contextvars
+import json
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PROFILE_ENV = "UVM_TBGEN_PROFILE"
+
+# Row in the trace viewer for spans of concurrent asyncio tasks
+_lane: contextvars.ContextVar = contextvars.ContextVar("uvm_tbgen_profile_lane", default=None)
+
+
+class Span(NamedTuple):
+    """One timed region."""
+    name: str
+    category: str
+    start: float  # seconds since the epoch
+    duration: float  # seconds
+    pid: int
+    tid: int
+    args: Dict[str, Any]
+
+
+class Profiler:
+    """Collects :class:`Span` records; safe to use from several threads."""
+
+    def __init__(self):
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str = "generate", **args):
+        """Time the block; the yielded ``args`` dict may be extended inside it."""
+        lane = _lane.get()
+        tid = threading.get_ident() if lane is None else lane
+        wall = time.time()
+        start = time.perf_counter()
+        try:
+            yield args
+        finally:
+            record = Span(name, category, wall, time.perf_counter() - start, os.getpid(), tid, args)
+            with self._lock:
+                self.spans.append(record)
+
+    def extend(self, spans: Iterable[Span]) -> None:
+        """Add spans recorded elsewhere, e.g. in a worker process."""
+        with self._lock:
+            self.spans.extend(Span(*s) for s in spans)
+
+    def drain(self) -> List[Span]:
+        """Remove and return the spans recorded so far."""
+        with self._lock:
+            spans, self.spans = self.spans, []
+        return spans
+
+    def totals(self) -> Dict[str, Dict[str, float]]:
+        """Return count and summed duration per ``category:name``, slowest first."""
+        totals: Dict[str, Dict[str, float]] = {}
+        for s in self.spans:
+            entry = totals.setdefault(f"{s.category}:{s.name}", {"count": 0, "seconds": 0.0})
+            entry["count"] += 1
+            entry["seconds"] += s.duration
+        return dict(sorted(totals.items(), key=lambda item: -item[1]["seconds"]))
+
+    def to_json(self) -> dict:
+        return {"spans": [s._asdict() for s in self.spans], "totals": self.totals()}
+
+    def chrome_trace(self) -> dict:
+        """Return the spans as Chrome trace-event complete ("X") events."""
+        events = [
+            {
+                "name": s.name, "cat": s.category, "ph": "X",
+                "ts": round(s.start * 1e6), "dur": round(s.duration * 1e6),
+                "pid": s.pid, "tid": s.tid, "args": s.args,
+            }
+            for s in sorted(self.spans, key=lambda s: s.start)
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save(self, path: str) -> Path:
+        """Write the JSON report to ``path`` and the trace next to it; return the trace path."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        stem = path.name[:-len(".json")] if path.name.endswith(".json") else path.name
+        trace = path.with_name(f"{stem}.trace.json")
+        path.write_text(json.dumps(self.to_json(), indent=1, default=str) + "\n")
+        trace.write_text(json.dumps(self.chrome_trace(), default=str) + "\n")
+        return trace
+
+
+_active: Optional[Profiler] = None
+
+
+def enable() -> Profiler:
+    """Start recording spans in this process and return the profiler."""
+    global _active
+    if _active is None:
+        _active = Profiler()
+    return _active
+
+
+def disable() -> Optional[Profiler]:
+    """Stop recording and return the profiler that was active, if any."""
+    global _active
+    profiler, _active = _active, None
+    return profiler
+
+
+def active() -> Optional[Profiler]:
+    """Return the profiler if profiling is enabled, else None."""
+    return _active
+
+
+def profile_path(cli_value: Optional[str] = None) -> Optional[str]:
+    """Return the output path from ``--profile`` or ``UVM_TBGEN_PROFILE``."""
+    return cli_value or os.environ.get(PROFILE_ENV) or None
+
+
+def span(name: str, category: str = "generate", **args):
+    """Time a block if profiling is enabled; yields a dict of span arguments."""
+    if _active is None:
+        return contextlib.nullcontext(args)
+    return _active.span(name, category, **args)
+
+
+def set_lane(lane: Optional[int]) -> None:
+    """Show spans of the current task (or thread) on trace row ``lane``."""
+    _lane.set(lane)
+
+
+def child_usage() -> Dict[str, float]:
+    """CPU seconds and peak RSS (KiB) of terminated child processes so far."""
+    if resource is None:
+        return {}
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return {"cpu_user": usage.ru_utime, "cpu_sys": usage.ru_stime, "maxrss_kb": usage.ru_maxrss}
@@ -0,0 +1,292 @@
+"""Local history of simulation runs in SQLite.
+
+Every run made by ``run_simulation.py`` is added to a results database
+(default ``<cache dir>/results.db``, moved with ``UVM_TBGEN_RESULTS_DB``):
+what was simulated (DUT path and hash, template digest, generator and
+simulator versions), the seed and plusargs, compile and run times, error
+counts, and the first failure with its :func:`~.logscan.failure_signature`.
+
+The database is opened in WAL mode, so parallel regressions can write while
+``uvm-tbgen results`` reads. Regressions insert their runs in batches of one
+transaction each (:meth:`ResultStore.add_many`). Queries on start time,
+failures, DUT and signature are served from indexes; results can be
+exported as JSON or JUnit XML.
+"""
+import datetime
+import json
+import os
+from pathlib import Path
+import re
+import sqlite3
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+from xml.etree import ElementTree
+
+from .cache import default_cache_dir
+
+RESULTS_ENV = "UVM_TBGEN_RESULTS_DB"
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started REAL NOT NULL,
+    dut TEXT NOT NULL,
+    dut_sha256 TEXT NOT NULL,
+    template_digest TEXT NOT NULL,
+    generator_version TEXT NOT NULL,
+    simulator TEXT NOT NULL,
+    simulator_version TEXT NOT NULL,
+    seed INTEGER,
+    plusargs TEXT NOT NULL,
+    status TEXT NOT NULL,
+    returncode INTEGER NOT NULL,
+    compile_time REAL NOT NULL,
+    run_time REAL NOT NULL,
+    elapsed REAL NOT NULL,
+    uvm_errors INTEGER NOT NULL,
+    uvm_fatals INTEGER NOT NULL,
+    assertion_failures INTEGER NOT NULL,
+    reason TEXT NOT NULL,
+    failure TEXT NOT NULL,
+    signature TEXT NOT NULL,
+    log_file TEXT NOT NULL,
+    regression TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_started ON runs (started);
+CREATE INDEX IF NOT EXISTS runs_failed ON runs (started) WHERE status != 'PASS';
+CREATE INDEX IF NOT EXISTS runs_dut ON runs (dut, started);
+CREATE INDEX IF NOT EXISTS runs_signature ON runs (signature, started) WHERE signature != '';
+"""
+
+# "7d", "12h", "30m", "2w" for --since/--until
+_AGE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([smhdw])\s*$")
+_AGE_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+
+class RunRecord(NamedTuple):
+    """One simulation run as stored in the results database."""
+    started: float  # Unix time
+    dut: str
+    dut_sha256: str
+    template_digest: str  # hash of the templates the testbench was generated from
+    generator_version: str
+    simulator: str
+    simulator_version: str
+    seed: Optional[int]
+    plusargs: List[str]
+    status: str  # PASS, FAIL, TIMEOUT or ERROR
+    returncode: int
+    compile_time: float
+    run_time: float
+    elapsed: float
+    uvm_errors: int
+    uvm_fatals: int
+    assertion_failures: int
+    reason: str
+    failure: str  # first failing line of the run
+    signature: str
+    log_file: str
+    regression: str = ""  # regression directory, empty for single runs
+    id: Optional[int] = None
+
+    @property
+    def passed(self) -> bool:
+        return self.status == "PASS"
+
+
+_COLUMNS = RunRecord._fields[:-1]
+_INSERT = f"INSERT INTO runs ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})"
+_SELECT = f"SELECT {', '.join(_COLUMNS)}, id FROM runs"
+
+
+def default_db_path() -> Path:
+    """Return the results database used when none is given."""
+    override = os.environ.get(RESULTS_ENV)
+    if override:
+        return Path(override)
+    return default_cache_dir() / "results.db"
+
+
+def parse_time(text: str, now: Optional[float] = None) -> float:
+    """Parse ``--since``/``--until``: an age such as ``7d`` or ``12h``, or an ISO date/time."""
+    m = _AGE_RE.match(text)
+    if m:
+        return (time.time() if now is None else now) - float(m.group(1)) * _AGE_UNITS[m.group(2)]
+    try:
+        return datetime.datetime.fromisoformat(text.strip()).timestamp()
+    except ValueError:
+        raise ValueError(
+            f"Invalid time '{text}' (expected e.g. 7d, 12h, 2026-10-01 or 2026-10-01T08:00)"
+        ) from None
+
+
+class ResultStore:
+    """The results database; use as a context manager to close it."""
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else default_db_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), timeout=30)
+        try:
+            self._db.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.OperationalError:
+            # e.g. file systems without shared memory; the default journal works too
+            pass
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        with self._db:
+            self._db.executescript(_SCHEMA)
+            self._db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._db.close()
+
+    @staticmethod
+    def _row(record: RunRecord) -> tuple:
+        return tuple(record[:8]) + (json.dumps(list(record.plusargs)),) + tuple(record[9:-1])
+
+    def add(self, record: RunRecord) -> int:
+        """Store one run and return its id."""
+        with self._db:
+            return self._db.execute(_INSERT, self._row(record)).lastrowid
+
+    def add_many(self, records: Iterable[RunRecord]) -> int:
+        """Store many runs in a single transaction; return how many were added."""
+        with self._db:
+            cursor = self._db.executemany(_INSERT, (self._row(r) for r in records))
+        return cursor.rowcount
+
+    def _where(
+        self, failed: bool, since: Optional[float], until: Optional[float], dut: Optional[str],
+        simulator: Optional[str], signature: Optional[str], seed: Optional[int],
+    ):
+        clauses: List[str] = []
+        params: List = []
+        if failed:
+            clauses.append("status != 'PASS'")
+        if since is not None:
+            clauses.append("started >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("started < ?")
+            params.append(until)
+        if dut:
+            if os.path.exists(dut):
+                clauses.append("dut = ?")
+                params.append(str(Path(dut).resolve()))
+            else:
+                # A file name matches that DUT in any directory
+                clauses.append("(dut = ? OR dut LIKE ? ESCAPE '\\')")
+                escaped = dut.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                params += [dut, f"%/{escaped}"]
+        if simulator:
+            clauses.append("simulator = ?")
+            params.append(simulator.lower())
+        if signature is not None:
+            clauses.append("signature = ?")
+            params.append(signature)
+        if seed is not None:
+            clauses.append("seed = ?")
+            params.append(seed)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def query(
+        self, failed: bool = False, since: Optional[float] = None, until: Optional[float] = None,
+        dut: Optional[str] = None, simulator: Optional[str] = None,
+        signature: Optional[str] = None, seed: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[RunRecord]:
+        """Return matching runs, newest first.
+
+        ``since``/``until`` are Unix times; ``dut`` is a path or a file name.
+        """
+        where, params = self._where(failed, since, until, dut, simulator, signature, seed)
+        sql = f"{_SELECT}{where} ORDER BY started DESC, id DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        records = []
+        for row in self._db.execute(sql, params):
+            records.append(RunRecord(*row[:8], json.loads(row[8]), *row[9:]))
+        return records
+
+    def signatures(
+        self, since: Optional[float] = None, until: Optional[float] = None,
+        dut: Optional[str] = None, simulator: Optional[str] = None,
+    ) -> List[Dict]:
+        """Count failed runs per failure signature, most frequent first.
+
+        Each entry holds the signature, its run count, when it was last seen
+        and the seed of that latest run.
+        """
+        where, params = self._where(True, since, until, dut, simulator, None, None)
+        # With a single MAX() aggregate, SQLite takes the bare seed column from that row
+        sql = (
+            "SELECT signature, COUNT(*), MAX(started), seed FROM runs"
+            f"{where} GROUP BY signature ORDER BY COUNT(*) DESC, MAX(started) DESC"
+        )
+        return [
+            dict(signature=sig, runs=n, last=last, seed=seed)
+            for sig, n, last, seed in self._db.execute(sql, params)
+        ]
+
+
+def to_json(records: Sequence[RunRecord]) -> str:
+    """Return ``records`` as a JSON array."""
+    return json.dumps([dict(r._asdict(), passed=r.passed) for r in records], indent=2) + "\n"
+
+
+def to_junit(records: Sequence[RunRecord], name: str = "uvm_tbgen") -> str:
+    """Return ``records`` as JUnit XML, one test suite per DUT and simulator.
+
+    Failed runs carry a ``<failure>`` with the failure signature as its
+    type; timeouts and errors become ``<error>`` elements.
+    """
+    suites: Dict[tuple, List[RunRecord]] = {}
+    for r in sorted(records, key=lambda r: (r.dut, r.simulator, r.started)):
+        suites.setdefault((r.dut, r.simulator), []).append(r)
+    root = ElementTree.Element("testsuites", name=name)
+    for (dut, simulator), runs in suites.items():
+        suite_name = f"{Path(dut).stem}.{simulator}"
+        suite = ElementTree.SubElement(
+            root, "testsuite", name=suite_name, tests=str(len(runs)),
+            failures=str(sum(r.status == "FAIL" for r in runs)),
+            errors=str(sum(r.status in ("ERROR", "TIMEOUT") for r in runs)),
+            time=f"{sum(r.elapsed for r in runs):.3f}",
+            timestamp=datetime.datetime.fromtimestamp(runs[0].started).isoformat(timespec="seconds"),
+        )
+        for r in runs:
+            case = ElementTree.SubElement(
+                suite, "testcase", classname=suite_name, name=f"seed_{r.seed}",
+                time=f"{r.elapsed:.3f}",
+            )
+            if r.status == "FAIL":
+                failure = ElementTree.SubElement(
+                    case, "failure", message=r.reason, type=r.signature or "FAIL"
+                )
+                failure.text = r.failure
+            elif not r.passed:
+                error = ElementTree.SubElement(case, "error", message=r.reason, type=r.status)
+                error.text = r.failure
+            ElementTree.SubElement(case, "system-out").text = f"log: {r.log_file}"
+    ElementTree.indent(root)
+    return '<?xml version="1.0" encoding="UTF-8"?>\n' + ElementTree.tostring(root, "unicode") + "\n"
+
+
+def print_records(records: Sequence[RunRecord]) -> None:
+    """Print one line per run."""
+    print(f"  {'STARTED':<17}{'STATUS':<8}{'SIMULATOR':<10}{'SEED':>12}{'TIME':>11}  DUT / FAILURE")
+    for r in records:
+        started = time.strftime("%Y-%m-%d %H:%M", time.localtime(r.started))
+        seed = "-" if r.seed is None else r.seed
+        line = f"  {started:<17}{r.status:<8}{r.simulator:<10}{seed:>12}{r.elapsed:10.1f}s  "
+        line += Path(r.dut).name
+        if not r.passed:
+            line += f"  {r.signature or r.reason}"
+        print(line)
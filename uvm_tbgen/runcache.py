@@ -0,0 +1,131 @@
+"""Cache of simulation results, to skip re-running identical runs.
+
+A run's result is fully determined by its inputs: the contents of every
+source and included file, the simulator and its version, the compile and
+run options, the plusargs and the seed. ``run_simulation.py`` hashes them
+into a key (:meth:`TestbenchSimulator.run_key`) and, on a hit, reports the
+recorded result and points at the log of the run that produced it instead
+of launching the simulator.
+
+Only verdicts that a rerun would repeat are stored: passes, and failures
+found in the simulation output. Timeouts, tool errors and bare non-zero
+exit statuses (e.g. a license checkout failure) are always rerun. An entry
+is dropped when its log has been changed or removed, when it is older than
+``ttl`` seconds, and least recently used entries go once the cache exceeds
+``max_bytes`` or ``max_entries``. Entries live in ``<cache dir>/runs``.
+"""
+import json
+import os
+from pathlib import Path
+import time
+from typing import Optional
+
+from .cache import _write_atomic, caching_disabled, default_cache_dir
+
+# Bump when the key inputs or the entry layout change
+CACHE_FORMAT = 1
+DEFAULT_TTL = 7 * 86400
+DEFAULT_MAX_BYTES = 256 << 20
+DEFAULT_MAX_ENTRIES = 200_000
+
+
+class RunCache:
+    """Recorded run results, one JSON file per key."""
+
+    def __init__(self, directory: Path, ttl: float = DEFAULT_TTL,
+                 max_bytes: int = DEFAULT_MAX_BYTES, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _entry(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the result recorded under ``key``, or None.
+
+        Expired entries and entries whose log no longer matches are removed.
+        """
+        entry = self._entry(key)
+        try:
+            data = json.loads(entry.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        log = data.get("log", {})
+        try:
+            st = os.stat(log["path"])
+            valid = (
+                data.get("format") == CACHE_FORMAT
+                and time.time() - data["created"] <= self.ttl
+                and (st.st_size, st.st_mtime_ns) == (log["size"], log["mtime_ns"])
+            )
+        except (OSError, KeyError, TypeError):
+            valid = False
+        if not valid:
+            try:
+                entry.unlink()
+            except OSError:
+                pass
+            return None
+        os.utime(entry)
+        return data["result"]
+
+    def put(self, key: str, result: dict, log_file: str) -> None:
+        """Record ``result`` under ``key``; ``log_file`` must exist.
+
+        Entries are not evicted here; call :meth:`evict` after a batch.
+        """
+        st = os.stat(log_file)
+        data = {
+            "format": CACHE_FORMAT,
+            "created": time.time(),
+            "log": {"path": str(log_file), "size": st.st_size, "mtime_ns": st.st_mtime_ns},
+            "result": result,
+        }
+        _write_atomic(self._entry(key), json.dumps(data, separators=(",", ":")))
+
+    def evict(self) -> None:
+        """Drop entries unused for ``ttl`` seconds, then the least recently used over the limits."""
+        expiry = time.time_ns() - int(self.ttl * 1e9)
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for e in it:
+                try:
+                    st = e.stat()
+                except OSError:
+                    continue
+                if st.st_mtime_ns < expiry:
+                    try:
+                        os.unlink(e.path)
+                    except OSError:
+                        pass
+                    continue
+                entries.append((st.st_mtime_ns, st.st_size, e.path))
+                total += st.st_size
+        if total <= self.max_bytes and len(entries) <= self.max_entries:
+            return
+        entries.sort()
+        count = len(entries)
+        for _, size, entry_path in entries:
+            if total <= self.max_bytes and count <= self.max_entries:
+                break
+            try:
+                os.unlink(entry_path)
+            except OSError:
+                continue
+            total -= size
+            count -= 1
+
+
+def default_run_cache(ttl: float = DEFAULT_TTL,
+                      max_bytes: int = DEFAULT_MAX_BYTES) -> Optional[RunCache]:
+    """Return the user's run cache, or None if caching is off or unavailable."""
+    if caching_disabled():
+        return None
+    try:
+        return RunCache(default_cache_dir() / "runs", ttl, max_bytes)
+    except OSError:
+        return None
@@ -0,0 +1,233 @@
+"""Long-lived generator daemon (``uvm-tbgen serve``).
+
+The daemon keeps everything that a fresh ``python -m uvm_tbgen`` process
+would have to rebuild: the imported modules, the Jinja2 environment with
+its compiled templates, the parse cache and the simulator detection
+result. It answers JSON-RPC 2.0 requests from :mod:`uvm_tbgen.client`
+on a Unix domain socket, one JSON object per line:
+
+``generate``
+    Keyword arguments of :class:`TBGenerator`; returns the summary and
+    the generator's log messages.
+``parse``
+    ``dut``, ``top_module``, ``params``; returns the parsed ports.
+``analyze``
+    ``logs``, ``context``, ``use_mmap``, ``jobs``; returns log summaries.
+``detect``
+    ``refresh``, ``search_path``; returns the installed simulators.
+``ping`` / ``shutdown``
+
+Requests are served on threads; generations into the same output
+directory are serialized.
+"""
+import json
+import os
+from pathlib import Path
+import socketserver
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from . import __version__
+from .client import (
+    INVALID_PARAMS, INVALID_REQUEST, METHOD_NOT_FOUND, PARSE_ERROR, SERVER_ERROR,
+    VERSION_MISMATCH, DaemonUnavailable, call, socket_path,
+)
+from .generator import TEMPLATE_DIR, TBGenerator, precompile_templates
+from .logscan import analyze_logs, summary_to_json
+from .simulators import detect_simulators
+from .uvm_tbgen.parser import parse_dut
+
+
+class _RPCError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+class _RecordingGenerator(TBGenerator):
+    """TBGenerator that keeps its log messages for the client to print."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.messages = []
+
+    def _log(self, message: str) -> None:
+        self.messages.append(message)
+
+
+class GeneratorDaemon:
+    """Dispatches JSON-RPC requests against warm generator state."""
+
+    def __init__(self, template_dir: Path = TEMPLATE_DIR):
+        self.template_dir = template_dir
+        self.started = time.time()
+        self.requests = 0
+        self.last_request = time.monotonic()
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self.stop: Callable[[], None] = lambda: None
+        self.methods: Dict[str, Callable[..., Any]] = {
+            "generate": self.generate,
+            "parse": self.parse,
+            "analyze": self.analyze,
+            "detect": self.detect,
+            "ping": self.ping,
+            "shutdown": self.shutdown,
+        }
+
+    def warm(self) -> None:
+        """Compile every template and detect simulators up front."""
+        precompile_templates(self.template_dir)
+        self.detect()
+
+    def _outdir_lock(self, outdir: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(os.path.abspath(outdir), threading.Lock())
+
+    def generate(self, dut: str, outdir: str = "generated_tb", topname: str = "my_dut_tb",
+                 **options) -> Dict[str, Any]:
+        gen = _RecordingGenerator(dut_path=dut, outdir=outdir, topname=topname, **options)
+        gen.template_dir = self.template_dir
+        with self._outdir_lock(outdir):
+            summary = gen.generate()
+        return {
+            "module": summary.module,
+            "written": summary.written,
+            "skipped": summary.skipped,
+            "failed": [f._asdict() for f in summary.failed],
+            "log": gen.messages,
+        }
+
+    def parse(self, dut: str, top_module: Optional[str] = None,
+              params: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        return parse_dut(dut, top_module, params=params)
+
+    def analyze(self, logs, context: int = 5, use_mmap: bool = False,
+                jobs: Optional[int] = None):
+        return [summary_to_json(s) for s in analyze_logs(logs, jobs, context, use_mmap)]
+
+    def detect(self, refresh: bool = False, search_path: Optional[str] = None
+               ) -> Dict[str, Any]:
+        # Revalidating the detection cache costs a few stat calls
+        found = detect_simulators(refresh=refresh, search_path=search_path)
+        return {sim: info._asdict() for sim, info in found.items()}
+
+    def ping(self) -> Dict[str, Any]:
+        return {
+            "version": __version__, "pid": os.getpid(),
+            "uptime": time.time() - self.started, "requests": self.requests,
+        }
+
+    def shutdown(self) -> bool:
+        self.stop()
+        return True
+
+    def dispatch(self, line: bytes) -> Dict[str, Any]:
+        """Handle one request line and return the response object."""
+        self.requests += 1
+        self.last_request = time.monotonic()
+        request_id = None
+        try:
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                raise _RPCError(PARSE_ERROR, f"Parse error: {e}") from None
+            if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+                raise _RPCError(INVALID_REQUEST, "Invalid request")
+            request_id = request.get("id")
+            params = dict(request.get("params") or {})
+            client_version = params.pop("client_version", __version__)
+            if client_version != __version__:
+                raise _RPCError(
+                    VERSION_MISMATCH,
+                    f"daemon runs uvm_tbgen {__version__}, client is {client_version}",
+                )
+            method = self.methods.get(request["method"])
+            if method is None:
+                raise _RPCError(METHOD_NOT_FOUND, f"Method not found: {request['method']}")
+            try:
+                result = method(**params)
+            except TypeError as e:
+                raise _RPCError(INVALID_PARAMS, f"Invalid params: {e}") from None
+            except Exception as e:
+                raise _RPCError(SERVER_ERROR, f"{type(e).__name__}: {e}") from None
+            return {"jsonrpc": "2.0", "id": request_id, "result": result}
+        except _RPCError as e:
+            return {
+                "jsonrpc": "2.0", "id": request_id,
+                "error": {"code": e.code, "message": str(e)},
+            }
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            response = self.server.daemon.dispatch(line)
+            self.wfile.write(json.dumps(response, default=str).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+def _claim_socket(path: str) -> None:
+    """Remove a stale socket file; raise if a daemon is already listening."""
+    if not os.path.exists(path):
+        return
+    try:
+        call("ping", path=path, timeout=2)
+    except DaemonUnavailable:
+        os.unlink(path)
+        return
+    raise RuntimeError(f"A daemon is already listening on {path}")
+
+
+def serve(path: Optional[str] = None, idle_timeout: Optional[float] = None,
+          template_dir: Path = TEMPLATE_DIR, ready: Optional[threading.Event] = None,
+          log: Callable[[str], None] = lambda message: print(f"[uvm_tbgen] {message}", flush=True)
+          ) -> None:
+    """Serve requests on ``path`` until shut down or idle for ``idle_timeout`` seconds.
+
+    The socket is only accessible to the current user. ``ready`` is set
+    once the daemon accepts connections.
+    """
+    if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+        raise RuntimeError("uvm-tbgen serve needs Unix domain sockets")
+    path = path or socket_path()
+    _claim_socket(path)
+    daemon = GeneratorDaemon(template_dir)
+    daemon.warm()
+
+    old_umask = os.umask(0o077)
+    try:
+        server = socketserver.ThreadingUnixStreamServer(path, _Handler)
+    finally:
+        os.umask(old_umask)
+    server.daemon_threads = True
+    server.daemon = daemon
+    daemon.stop = lambda: threading.Thread(target=server.shutdown, daemon=True).start()
+
+    if idle_timeout:
+        def watch_idle():
+            while True:
+                time.sleep(min(idle_timeout, 1.0))
+                if time.monotonic() - daemon.last_request > idle_timeout:
+                    log(f"Idle for {idle_timeout:g}s; shutting down")
+                    server.shutdown()
+                    return
+        threading.Thread(target=watch_idle, daemon=True).start()
+
+    log(f"Serving on {path} (pid {os.getpid()})")
+    if ready is not None:
+        ready.set()
+    try:
+        server.serve_forever(poll_interval=0.2)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        log("Daemon stopped")
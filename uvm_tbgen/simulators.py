@@ -0,0 +1,191 @@
+"""Detection of installed HDL simulators.
+
+Executables are resolved on ``PATH`` in-process and each simulator found is
+asked for its version once. The result is cached on disk per ``PATH`` value
+and revalidated with a few ``stat`` calls: it is reused while the
+modification times of the ``PATH`` directories and of the detected
+executables are unchanged, so installing, removing or upgrading a simulator
+invalidates it. ``uvm-tbgen detect`` warms the cache; pointing
+``UVM_TBGEN_CACHE_DIR`` at a shared directory shares it between CI jobs.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+from typing import Dict, List, NamedTuple, Optional
+
+from .cache import _write_atomic, caching_disabled, default_cache_dir
+
+SIMULATORS = {
+    "vcs": {
+        "name": "VCS (Synopsys)",
+        "commands": ["vcs", "vlogan"],
+        "compile_cmd": "vcs",
+        "run_cmd": "./simv",
+        "elaboration_flag": "-elaborate",
+        "top_flag": "-top",
+        "source_flag": None,  # Sources listed as arguments
+        "compile_flags": ["-full64", "-sverilog", "-assert", "svaext", "-timescale=1ns/1ps", "+v2k"],
+        "version_cmd": ["vcs", "-ID"],
+    },
+    "modelsim": {
+        "name": "Modelsim (Mentor)",
+        "commands": ["vlog", "vsim", "vcom"],
+        "compile_cmd": "vlog",
+        "run_cmd": "vsim",
+        "elaboration_flag": None,
+        "top_flag": None,
+        "source_flag": None,
+        "compile_flags": ["-sv"],
+        "version_cmd": ["vlog", "-version"],
+    },
+    "xcelium": {
+        "name": "Xcelium (Cadence)",
+        "commands": ["xrun", "xvlog"],
+        "compile_cmd": "xrun",
+        "run_cmd": "xrun",
+        "elaboration_flag": None,
+        "top_flag": "-top",
+        "source_flag": "-sv",
+        "compile_flags": ["-64bit", "-sv", "-timescale", "1ns/1ps"],
+        "version_cmd": ["xrun", "-version"],
+    },
+    "vivado": {
+        "name": "Vivado Simulator (Xilinx)",
+        "commands": ["xvlog", "xsim", "vivado"],
+        "compile_cmd": "xvlog",
+        "run_cmd": "xsim",
+        "elaboration_flag": None,
+        "top_flag": None,
+        "source_flag": "-sv",
+        "compile_flags": ["-sv"],
+        "version_cmd": ["xvlog", "--version"],
+    },
+}
+
+# Bump when the cached detection layout changes
+DETECT_FORMAT = 1
+# Seconds allowed for one version query
+VERSION_TIMEOUT = 30
+
+
+class SimulatorInfo(NamedTuple):
+    """A simulator found on PATH."""
+    simulator: str  # key into SIMULATORS, e.g. "xcelium"
+    name: str
+    commands: Dict[str, str]  # command -> resolved executable
+    version: str  # first line of the version banner, or "unknown"
+
+
+def _mtime(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return -1
+
+
+def _path_dirs(search_path: str) -> List[str]:
+    return list(dict.fromkeys(d for d in search_path.split(os.pathsep) if d))
+
+
+def probe_version(cmd: List[str], timeout: float = VERSION_TIMEOUT) -> str:
+    """Run a version command and return the first line it prints ("unknown" on failure)."""
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+    for stream in (result.stdout, result.stderr):
+        for line in stream.splitlines():
+            if line.strip():
+                return line.strip()
+    return "unknown"
+
+
+def _detect(search_path: str) -> Dict[str, SimulatorInfo]:
+    found = {}
+    version_cmds = {}
+    for sim, config in SIMULATORS.items():
+        commands = {}
+        for cmd in config["commands"]:
+            resolved = shutil.which(cmd, path=search_path)
+            if resolved:
+                commands[cmd] = resolved
+        if not commands:
+            continue
+        found[sim] = commands
+        tool = config["version_cmd"][0]
+        exe = commands.get(tool) or shutil.which(tool, path=search_path)
+        if exe:
+            version_cmds[sim] = [exe] + config["version_cmd"][1:]
+
+    # Version banners are slow to print, so the tools are asked concurrently
+    with ThreadPoolExecutor(max_workers=max(1, len(version_cmds))) as pool:
+        versions = dict(zip(version_cmds, pool.map(probe_version, version_cmds.values())))
+    return {
+        sim: SimulatorInfo(sim, SIMULATORS[sim]["name"], commands, versions.get(sim, "unknown"))
+        for sim, commands in found.items()
+    }
+
+
+def _cache_file(search_path: str):
+    key = hashlib.sha256(f"{DETECT_FORMAT}\0{search_path}".encode("utf-8")).hexdigest()[:16]
+    return default_cache_dir() / "simulators" / f"{key}.json"
+
+
+def _load(path, search_path: str) -> Optional[Dict[str, SimulatorInfo]]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if data.get("format") != DETECT_FORMAT or data.get("path") != search_path:
+        return None
+    stamps = data.get("mtimes", {})
+    if any(_mtime(p) != mtime for p, mtime in stamps.items()):
+        return None
+    return {
+        sim: SimulatorInfo(sim, entry["name"], entry["commands"], entry["version"])
+        for sim, entry in data.get("simulators", {}).items()
+    }
+
+
+def _to_json(found: Dict[str, SimulatorInfo], search_path: str) -> dict:
+    stamps = {d: _mtime(d) for d in _path_dirs(search_path)}
+    for info in found.values():
+        for exe in info.commands.values():
+            stamps[exe] = _mtime(exe)
+    return {
+        "format": DETECT_FORMAT,
+        "path": search_path,
+        "mtimes": stamps,
+        "simulators": {
+            sim: {"name": info.name, "commands": info.commands, "version": info.version}
+            for sim, info in found.items()
+        },
+    }
+
+
+def detect_simulators(refresh: bool = False, search_path: Optional[str] = None
+                      ) -> Dict[str, SimulatorInfo]:
+    """Return the simulators installed on ``search_path`` (default: ``$PATH``).
+
+    Results come from the on-disk cache when it is still valid; ``refresh``
+    forces a new detection.
+    """
+    if search_path is None:
+        search_path = os.environ.get("PATH", os.defpath)
+    use_cache = not caching_disabled()
+    cache_file = _cache_file(search_path)
+    if use_cache and not refresh:
+        found = _load(cache_file, search_path)
+        if found is not None:
+            return found
+    found = _detect(search_path)
+    if use_cache:
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            _write_atomic(cache_file, json.dumps(_to_json(found, search_path), indent=1))
+        except OSError:
+            pass
+    return found
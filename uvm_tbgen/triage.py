@@ -0,0 +1,199 @@
+"""Group failing simulation runs by failure signature.
+
+:func:`triage` takes the logs of a regression (``seed_*/run.log`` as
+written by ``run_simulation.py``), finds the first UVM_ERROR, UVM_FATAL,
+assertion or simulator error in each, reduces it to a
+:func:`~.logscan.failure_signature` and groups the runs by signature. Each
+cluster names a representative run to debug: the one that failed fastest.
+
+Logs are scanned on a process pool. A run whose ``result.json`` says it
+passed is skipped without opening its log, and a log is only read up to
+its first failure: the scan jumps between lines that could be a failure
+(found with ``bytes.find`` over a memory map, much faster than a regular
+expression) and only feeds those lines to :class:`~.logscan.LogWatcher`.
+Scanning also stops at the UVM report summary.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import json
+import mmap
+import os
+from pathlib import Path
+import re
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
+from .logscan import LogWatcher, failure_signature
+
+# Console log of each run_simulation.py run
+RUN_LOG = "run.log"
+
+# Every line that can start a failure for LogWatcher contains one of these
+# (ERROR/Error/error, FATAL, fail/FAIL, *E,), and so does the report summary
+_MARKERS = (b"rror", b"RROR", b"FATAL", b"ail", b"AIL", b"*E,", b"Report Summary")
+# Bytes searched for markers at a time, so a log is read only up to its first failure
+_WINDOW = 1 << 16
+_SEED_DIR_RE = re.compile(r"^seed_(\d+)$")
+
+
+class Failure(NamedTuple):
+    """The first failure of one run."""
+    log: str
+    seed: Optional[int]
+    elapsed: Optional[float]  # run time from result.json, if known
+    message: str
+    signature: str
+
+
+class Cluster(NamedTuple):
+    """Runs failing with the same signature, fastest first."""
+    signature: str
+    runs: List[Failure]
+
+    @property
+    def representative(self) -> Failure:
+        return self.runs[0]
+
+
+def _marker_offsets(data) -> Iterator[int]:
+    """Yield the offsets of all markers in ``data`` in order, one window at a time."""
+    size = len(data)
+    for start in range(0, size, _WINDOW):
+        end = min(size, start + _WINDOW)
+        hits = []
+        for marker in _MARKERS:
+            # Markers starting in this window, including ones crossing its end
+            stop = end + len(marker) - 1
+            at = data.find(marker, start, stop)
+            while at >= 0:
+                hits.append(at)
+                at = data.find(marker, at + 1, stop)
+        yield from sorted(hits)
+
+
+def first_failure(path) -> str:
+    """Return the first failure message in a log ('' if there is none)."""
+    with open(path, "rb") as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return ""
+    watcher = LogWatcher()
+    pos, size = 0, len(data)
+    try:
+        markers = _marker_offsets(data)
+        while not watcher.failure and not watcher.finished and pos < size:
+            if not watcher.waiting:
+                at = next((at for at in markers if at >= pos), -1)
+                if at < 0:
+                    break
+                pos = data.rfind(b"\n", 0, at) + 1
+            end = data.find(b"\n", pos)
+            end = size if end < 0 else end + 1
+            watcher.feed(data[pos:end].decode("latin-1"))
+            pos = end
+    finally:
+        data.close()
+    watcher.close()
+    return watcher.failure
+
+
+def scan_run(log: str) -> Optional[Failure]:
+    """Return the failure of the run that wrote ``log``, or None if it passed.
+
+    Seed, status and run time come from the ``result.json`` next to the
+    log when there is one; the seed otherwise from a ``seed_<N>`` directory.
+    A failed run without a failure message in its log (a timeout or a
+    non-zero exit status) is described by the reason in ``result.json``.
+    """
+    path = Path(log)
+    try:
+        result = json.loads((path.parent / "result.json").read_text())
+    except (OSError, ValueError):
+        result = {}
+    if result.get("status") == "PASS":
+        return None
+    seed = result.get("seed")
+    if seed is None:
+        m = _SEED_DIR_RE.match(path.parent.name)
+        seed = int(m.group(1)) if m else None
+    try:
+        message = first_failure(path)
+    except OSError as e:
+        message = f"cannot read log: {e.strerror}"
+    if not message:
+        message = result.get("reason", "")
+        if not message:
+            return None
+    return Failure(str(log), seed, result.get("elapsed"), message, failure_signature(message))
+
+
+def find_logs(paths: Iterable) -> List[str]:
+    """Expand directories into the run logs below them; files are kept as given.
+
+    A directory holding ``run.log`` contributes that; otherwise its
+    ``*_simulation.log`` files are used.
+    """
+    logs: List[str] = []
+    for p in map(Path, paths):
+        if not p.is_dir():
+            logs.append(str(p))
+            continue
+        for directory, _, files in sorted(os.walk(p)):
+            if RUN_LOG in files:
+                logs.append(os.path.join(directory, RUN_LOG))
+            else:
+                logs.extend(
+                    os.path.join(directory, name) for name in sorted(files)
+                    if name.endswith("_simulation.log")
+                )
+    return logs
+
+
+def cluster(failures: Iterable[Failure]) -> List[Cluster]:
+    """Group failures by signature; the largest clusters come first."""
+    groups: Dict[str, List[Failure]] = {}
+    for failure in failures:
+        groups.setdefault(failure.signature, []).append(failure)
+    clusters = [
+        Cluster(sig, sorted(runs, key=lambda r: (r.elapsed is None, r.elapsed or 0.0, r.log)))
+        for sig, runs in groups.items()
+    ]
+    clusters.sort(key=lambda c: (-len(c.runs), c.signature))
+    return clusters
+
+
+def triage(logs: Sequence[str], jobs: Optional[int] = None) -> List[Cluster]:
+    """Scan ``logs`` on up to ``jobs`` processes and cluster the failing runs."""
+    logs = [str(p) for p in logs]
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(logs) or 1))
+    if jobs == 1:
+        failures = [scan_run(log) for log in logs]
+    else:
+        # Large chunks keep the per-task overhead small next to a sub-millisecond scan
+        chunksize = max(1, len(logs) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            failures = list(pool.map(scan_run, logs, chunksize=chunksize))
+    return cluster(f for f in failures if f is not None)
+
+
+def clusters_to_json(clusters: Sequence[Cluster]) -> List[dict]:
+    return [
+        dict(
+            signature=c.signature, count=len(c.runs),
+            representative=c.representative._asdict(),
+            seeds=[r.seed for r in c.runs],
+        )
+        for c in clusters
+    ]
+
+
+def print_clusters(clusters: Sequence[Cluster], show_all: bool = False) -> None:
+    """Print every cluster with its representative run."""
+    for i, c in enumerate(clusters, 1):
+        rep = c.representative
+        print(f"  [{i}] {len(c.runs)} run{'s' if len(c.runs) != 1 else ''}  {c.signature}")
+        took = f", {rep.elapsed:.1f}s" if rep.elapsed is not None else ""
+        print(f"      representative: seed {rep.seed}{took}  {rep.log}")
+        print(f"      {rep.message}")
+        if show_all and len(c.runs) > 1:
+            print(f"      seeds: {', '.join(str(r.seed) for r in c.runs)}")
@@ -1,25 +1,32 @@
-import re
-from typing import List, Dict
+from typing import Dict, Mapping, Optional
 
-PORT_RE = re.compile(r'\b(input|output|inout)\b\s*(?:reg|wire)?\s*(?:\[(.*?)\])?\s*(\w+)', re.IGNORECASE)
-MODULE_RE = re.compile(r'\bmodule\s+(\w+)\s*\((.*?)\)\s*;', re.S)
+from uvm_tbgen.cache import default_parse_cache
+from uvm_tbgen.params import fold_module
+from uvm_tbgen.verilog import parse_file
 
-def parse_dut(file_path: str) -> Dict:
-    text = open(file_path, 'r', errors='ignore').read()
-    m = MODULE_RE.search(text)
-    if not m:
-        raise ValueError("No module declaration found")
-    module_name = m.group(1)
-    port_block = m.group(2)
-    ports = []
-    # split by commas but keep balanced parentheses (simple approach)
-    tokens = re.split(r',\s*(?![^()]*\))', port_block)
-    for t in tokens:
-        t = t.strip()
-        pm = PORT_RE.search(t)
-        if pm:
-            direction = pm.group(1)
-            width = pm.group(2) or ''
-            name = pm.group(3)
-            ports.append({'name': name, 'dir': direction, 'width': width})
-    return {'module': module_name, 'ports': ports}
\ No newline at end of file
+
+def parse_dut(
+    file_path: str, top_module: Optional[str] = None, use_cache: bool = True,
+    params: Optional[Mapping[str, str]] = None
+) -> Dict:
+    """Return ``{'module', 'params', 'ports': [{'name', 'dir', 'width', 'bits'}]}`` for a DUT.
+
+    The file is memory-mapped and only scanned up to the selected module's
+    ``endmodule``; ``top_module`` picks a module from files holding several.
+    ``width`` is the raw packed range text (e.g. ``'DATA_W-1:0'``), empty for
+    scalars; ``bits`` is the width folded with the parameter values, which
+    ``params`` may override. ``params`` in the result maps each parameter
+    that could be folded to its value.
+    Results are served from the on-disk parse cache unless ``use_cache`` is False.
+    """
+    cache = default_parse_cache() if use_cache else None
+    if cache is not None:
+        module = cache.parse(file_path, top_module)
+    else:
+        module = parse_file(file_path, top_module)
+    folded = fold_module(module, params)
+    ports = [
+        {'name': p.name, 'dir': p.direction, 'width': p.range, 'bits': p.width}
+        for p in folded.module.ports
+    ]
+    return {'module': module.name, 'params': dict(folded.values), 'ports': ports}
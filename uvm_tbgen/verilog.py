@@ -0,0 +1,491 @@
+"""Single-pass Verilog/SystemVerilog module header parser.
+
+The source is split into tokens by one compiled regex (comments, strings and
+compiler directives are dropped on the way; of each `` `ifdef`` only the
+first branch is kept), and a small state machine walks the tokens once.
+Both ANSI headers (``module m(input [7:0] a, ...)``) and non-ANSI headers
+(``module m(a, b); input [7:0] a; ...``) are supported, as are
+``reg``/``wire``/``logic`` and other data types, and several modules per
+file. Parameter declarations (``#(parameter ...)`` lists and ``parameter`` /
+``localparam`` items in the body) are recorded with their default value
+expressions; :mod:`uvm_tbgen.params` folds them into concrete port widths.
+Parsing of a module stops at its ``endmodule``, so declarations from later
+modules never leak in, and ports are indexed by name in a dict so the cost
+stays linear in the number of ports.
+
+:func:`parse_file` memory-maps the source and tokenizes it in place, so only
+the part of the file up to the selected module's ``endmodule`` is ever read
+and memory stays bounded for multi-gigabyte netlists.
+"""
+import contextlib
+import itertools
+import mmap
+import os
+import re
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from .ports import Port, PortTable
+
+# Bump whenever parse results change, to invalidate cached parses.
+PARSER_VERSION = 4
+
+DIRECTIONS = ("input", "output", "inout")
+
+# Net types, data types and qualifiers that may appear between a port's
+# direction and its range or name.
+_TYPE_WORDS = frozenset((
+    "wire", "reg", "logic", "bit", "byte", "shortint", "int", "longint",
+    "integer", "time", "real", "realtime", "shortreal", "string", "signed",
+    "unsigned", "var", "tri", "tri0", "tri1", "triand", "trior", "trireg",
+    "wand", "wor", "uwire", "supply0", "supply1", "interconnect", "const",
+))
+
+# Constructs inside a module body whose contents must not be mistaken for
+# port declarations, mapped to the keyword that closes them.
+_SKIP_BLOCKS = {
+    "function": "endfunction",
+    "task": "endtask",
+    "class": "endclass",
+    "covergroup": "endgroup",
+    "property": "endproperty",
+    "sequence": "endsequence",
+    "clocking": "endclocking",
+}
+
+# Keywords that end the current module whatever state the parser is in.
+_MODULE_KEYWORDS = frozenset(("module", "macromodule", "endmodule"))
+
+# Keywords after which ``property``/``sequence`` start a statement rather
+# than a declaration block.
+_ASSERTION_VERBS = frozenset(("assert", "assume", "cover", "restrict", "expect"))
+
+_TOKEN_PATTERN = r"""
+    (?P<skip>
+        //[^\n]*
+      | /\*.*?\*/
+      | "(?:\\.|[^"\\\n])*"
+      | `(?:define|undef|include|timescale|default_nettype|line|pragma)\b(?:\\\n|[^\n])*
+      | `(?:resetall|celldefine|endcelldefine)\b
+    )
+  | (?P<cond>`(?:ifdef|ifndef|elsif)\s+\w+|`(?:else|endif)\b)
+  | (?P<number>\d[\d_]*(?:\s*'[sS]?[bBoOdDhH]\s*[\dA-Fa-fXxZz?_]+)?|'[sS]?[bBoOdDhH]\s*[\dA-Fa-fXxZz?_]+)
+  | (?P<ident>[A-Za-z_][\w$]*|\\\S+|\$[A-Za-z_]\w*|`\w+)
+  | (?P<op>\*\*|<<<|>>>|<<|>>|::|[+-]:|[^\s\w])
+"""
+_TOKEN_RE = re.compile(_TOKEN_PATTERN, re.S | re.X)
+# Same grammar over raw bytes, for memory-mapped files
+_TOKEN_RE_BYTES = re.compile(_TOKEN_PATTERN.encode("ascii"), re.S | re.X)
+
+
+class Param(NamedTuple):
+    """A module parameter and the source text of its default value."""
+    name: str
+    default: str
+    local: bool = False  # localparam, or a body parameter of a module with a #() list
+
+
+class Module(NamedTuple):
+    """A parsed module header: its name, ports and parameters in source order."""
+    name: str
+    ports: PortTable
+    params: Tuple[Param, ...] = ()
+
+
+def tokenize(text: Union[str, bytes, mmap.mmap]) -> Iterator[str]:
+    """Yield the significant tokens of ``text`` in order.
+
+    ``text`` may also be a bytes-like object such as an ``mmap``; tokens are
+    then decoded one at a time, so the buffer itself is never copied.
+    Of each `` `ifdef``/`` `ifndef`` only the tokens up to the first
+    `` `elsif``/`` `else`` are kept, so a header written out once per
+    configuration is still seen as one balanced header.
+    """
+    # Conditional nesting depth, and the depth of the branch being dropped (0: none)
+    state = (0, 0)
+    if isinstance(text, str):
+        for m in _TOKEN_RE.finditer(text):
+            kind = m.lastgroup
+            if kind == "cond":
+                state = _conditional(state, m.group())
+            elif kind != "skip" and not state[1]:
+                yield m.group()
+        return
+    for m in _TOKEN_RE_BYTES.finditer(text):
+        kind = m.lastgroup
+        if kind == "cond":
+            state = _conditional(state, m.group().decode("latin-1"))
+        elif kind != "skip" and not state[1]:
+            yield m.group().decode("latin-1")
+
+
+def _conditional(state: Tuple[int, int], directive: str) -> Tuple[int, int]:
+    """Return the (depth, dropping) state of :func:`tokenize` after ``directive``."""
+    depth, dropping = state
+    if directive.startswith("`if"):
+        return depth + 1, dropping
+    if directive == "`endif":
+        return max(0, depth - 1), 0 if dropping == depth else dropping
+    # `elsif or `else: the first branch is over
+    return depth, dropping or depth
+
+
+def _int_literal(tokens: List[str]) -> Optional[int]:
+    """Return the value of a single plain or sized decimal literal."""
+    if len(tokens) != 1:
+        return None
+    tok = tokens[0].replace("_", "")
+    if tok.isdigit():
+        return int(tok)
+    m = re.fullmatch(r"\d*\s*'[sS]?([bBoOdDhH])\s*([\dA-Fa-f]+)", tok)
+    if m:
+        base = {"b": 2, "o": 8, "d": 10, "h": 16}[m.group(1).lower()]
+        return int(m.group(2), base)
+    return None
+
+
+def _split_top(tokens: List[str], sep: str) -> List[List[str]]:
+    """Split tokens on ``sep`` where it is not nested in brackets."""
+    parts: List[List[str]] = [[]]
+    depth = 0
+    for tok in tokens:
+        if tok in "([{":
+            depth += 1
+        elif tok in ")]}":
+            depth = max(0, depth - 1)
+        if tok == sep and depth == 0:
+            parts.append([])
+        else:
+            parts[-1].append(tok)
+    return parts
+
+
+def _range_info(dims: List[List[str]]) -> Tuple[int, str]:
+    """Return (width, range text) for the packed dimensions of a port."""
+    if not dims:
+        return 1, ""
+    width = 1
+    for dim in dims:
+        bounds = _split_top(dim, ":")
+        if len(bounds) != 2:
+            # [N] or [a+:w] forms: keep the text, width stays unknown
+            width = None
+            break
+        msb, lsb = _int_literal(bounds[0]), _int_literal(bounds[1])
+        if msb is None or lsb is None:
+            width = None
+            break
+        width *= abs(msb - lsb) + 1
+    text = "][".join("".join(dim) for dim in dims)
+    return (width or 1), text
+
+
+class _Decl(NamedTuple):
+    direction: Optional[str]
+    typed: bool
+    dims: List[List[str]]
+    name: Optional[str]
+
+
+def _parse_item(tokens: List[str]) -> Optional[_Decl]:
+    """Parse one comma-separated port item or declaration.
+
+    Returns None for items that are not plain ports (interface ports,
+    concatenations), which are skipped.
+    """
+    if not tokens:
+        return None
+    if tokens[0] == ".":
+        # Explicit non-ANSI port: .name(expr)
+        return _Decl(None, False, [], tokens[1]) if len(tokens) > 1 else None
+    i = 0
+    direction = None
+    if tokens[0] in DIRECTIONS:
+        direction = tokens[0]
+        i = 1
+    typed = False
+    dims: List[List[str]] = []  # dimensions since the last identifier
+    packed: List[List[str]] = []
+    name = None
+    n = len(tokens)
+    while i < n:
+        tok = tokens[i]
+        if tok in _TYPE_WORDS:
+            typed = True
+        elif tok == "[":
+            depth, j = 1, i + 1
+            while j < n and depth:
+                if tokens[j] == "[":
+                    depth += 1
+                elif tokens[j] == "]":
+                    depth -= 1
+                j += 1
+            dims.append(tokens[i + 1:j - 1])
+            i = j
+            continue
+        elif tok == "=":
+            break
+        elif tok in (".", "{"):
+            return None
+        elif tok == "::":
+            typed = True
+        elif tok[0].isalpha() or tok[0] in "_\\":
+            if name is not None:
+                # The previous identifier was a user-defined type
+                typed = True
+            name = tok
+            packed, dims = dims, []
+        i += 1
+    if name is None:
+        return None
+    return _Decl(direction, typed, packed, name)
+
+
+def _parse_params(tokens: List[str], local: bool = False) -> List[Param]:
+    """Parse a parameter port list or a ``parameter``/``localparam`` statement.
+
+    Items without a keyword inherit the previous one; type parameters are
+    skipped.
+    """
+    params: List[Param] = []
+    is_type = False
+    for item in _split_top(tokens, ","):
+        if not item:
+            continue
+        if item[0] in ("parameter", "localparam"):
+            local = local or item[0] == "localparam"
+            is_type = False
+            item = item[1:]
+        if item and item[0] == "type":
+            is_type = True
+        if is_type:
+            continue
+        lhs = _split_top(item, "=")
+        depth = 0
+        name = None
+        for tok in lhs[0]:
+            if tok in "([{":
+                depth += 1
+            elif tok in ")]}":
+                depth -= 1
+            elif depth == 0 and (tok[0].isalpha() or tok[0] in "_\\") and tok not in _TYPE_WORDS:
+                name = tok
+        if name is not None:
+            default = "".join(tok for part in lhs[1:2] for tok in part)
+            params.append(Param(name, default, local))
+    return params
+
+
+class _ModuleParser:
+    """Walk a token stream and build :class:`Module` records."""
+
+    def __init__(self, tokens: Iterable[str]):
+        self._tokens = iter(tokens)
+
+    def _next(self) -> Optional[str]:
+        return next(self._tokens, None)
+
+    def _push_back(self, tok: str) -> None:
+        """Make ``tok``, read too far, the next token again."""
+        self._tokens = itertools.chain((tok,), self._tokens)
+
+    def _collect(self, closer: str) -> List[str]:
+        """Collect tokens up to ``closer`` at nesting depth zero.
+
+        A ``;`` or a module keyword also ends the collection, whatever the
+        nesting depth, and is left to be read again unless it is ``closer``.
+        """
+        out: List[str] = []
+        depth = 0
+        while True:
+            tok = self._next()
+            if tok is None:
+                return out
+            if tok == ";" or tok in _MODULE_KEYWORDS:
+                if tok != closer:
+                    self._push_back(tok)
+                return out
+            if tok == closer and depth == 0:
+                return out
+            if tok in "([{":
+                depth += 1
+            elif tok in ")]}":
+                depth = max(0, depth - 1)
+            out.append(tok)
+
+    def _skip_block(self, end: str) -> None:
+        while True:
+            tok = self._next()
+            if tok is None or tok == end:
+                return
+            if tok in _MODULE_KEYWORDS:
+                self._push_back(tok)
+                return
+
+    def modules(self) -> Iterator[Module]:
+        while True:
+            tok = self._next()
+            if tok is None:
+                return
+            if tok in ("module", "macromodule"):
+                module = self._module()
+                if module is not None:
+                    yield module
+
+    def _module(self) -> Optional[Module]:
+        name = self._next()
+        if name in ("static", "automatic"):
+            name = self._next()
+        if name is None:
+            return None
+
+        ports = PortTable()
+        params: List[Param] = []
+        index: Dict[str, int] = {}
+        undeclared = set()
+
+        def add(decl: _Decl, direction: str, dims: List[List[str]]) -> None:
+            width, range_text = _range_info(dims)
+            pos = index.get(decl.name)
+            if pos is None:
+                index[decl.name] = len(ports)
+                ports.append(decl.name, direction, width, range_text)
+            elif decl.name in undeclared:
+                undeclared.discard(decl.name)
+                ports[pos] = Port(decl.name, direction, width, range_text)
+
+        tok = self._next()
+        while tok == "import":
+            self._collect(";")
+            tok = self._next()
+        has_param_list = False
+        if tok == "#":
+            if self._next() == "(":
+                params.extend(_parse_params(self._collect(")")))
+                has_param_list = True
+            tok = self._next()
+        if tok == "(":
+            self._header(self._collect(")"), add, undeclared)
+            tok = self._next()
+        if tok != ";":
+            # Not a well-formed header; resynchronise on the next statement
+            while tok is not None and tok != ";":
+                if tok in _MODULE_KEYWORDS:
+                    self._push_back(tok)
+                    break
+                tok = self._next()
+
+        # With a #() list, body parameters cannot be overridden
+        self._body(add, params, has_param_list)
+        return Module(name, ports, tuple(params))
+
+    def _header(self, tokens: List[str], add, undeclared) -> None:
+        direction = "input"
+        dims: List[List[str]] = []
+        ansi = None
+        for item in _split_top(tokens, ","):
+            decl = _parse_item(item)
+            if decl is None:
+                continue
+            if ansi is None:
+                ansi = decl.direction is not None or decl.typed or bool(decl.dims)
+            if not ansi:
+                undeclared.add(decl.name)
+                add(decl, "input", [])
+                continue
+            if decl.direction is not None:
+                direction = decl.direction
+                dims = decl.dims
+            elif decl.typed or decl.dims:
+                dims = decl.dims
+            add(decl, direction, dims)
+
+    def _body(self, add, params: List[Param], local_params: bool) -> None:
+        tok = None
+        while True:
+            prev, tok = tok, self._next()
+            if tok is None or tok == "endmodule":
+                return
+            if tok in _MODULE_KEYWORDS:
+                # A module without its endmodule
+                self._push_back(tok)
+                return
+            if tok in DIRECTIONS:
+                items = _split_top([tok] + self._collect(";"), ",")
+                dims: List[List[str]] = []
+                for item in items:
+                    decl = _parse_item(item)
+                    if decl is None:
+                        continue
+                    if decl.direction is not None or decl.typed or decl.dims:
+                        dims = decl.dims
+                    add(decl, tok, dims)
+            elif tok in ("parameter", "localparam"):
+                params.extend(_parse_params([tok] + self._collect(";"), local_params))
+            elif tok in _SKIP_BLOCKS and prev not in _ASSERTION_VERBS:
+                # ``default clocking name;`` names a block declared elsewhere
+                if tok != "clocking" or "@" in self._collect(";"):
+                    self._skip_block(_SKIP_BLOCKS[tok])
+            elif tok in ("import", "export"):
+                self._collect(";")
+
+
+def iter_modules(tokens: Iterable[str]) -> Iterator[Module]:
+    """Yield every module found in a token stream, in source order."""
+    return _ModuleParser(tokens).modules()
+
+
+def parse_modules(text: str) -> List[Module]:
+    """Return every module declared in ``text``."""
+    return list(iter_modules(tokenize(text)))
+
+
+def find_module(tokens: Iterable[str], top: Optional[str] = None) -> Module:
+    """Return the module named ``top``, or the first module if ``top`` is None.
+
+    Raises ValueError if no matching module is found.
+    """
+    for module in iter_modules(tokens):
+        if top is None or module.name == top:
+            return module
+    if top is None:
+        raise ValueError("No module header found")
+    raise ValueError(f"Module '{top}' not found")
+
+
+def parse_module(text: str, top: Optional[str] = None) -> Module:
+    """Parse ``text`` and return the requested module (see :func:`find_module`)."""
+    return find_module(tokenize(text), top)
+
+
+@contextlib.contextmanager
+def _mapped(path: Union[str, os.PathLike]):
+    """Yield a read-only view of a file, memory-mapped when possible."""
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty files and non-regular files cannot be mapped
+            yield f.read()
+            return
+        try:
+            if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            yield mm
+        finally:
+            mm.close()
+
+
+def parse_file(path: Union[str, os.PathLike], top: Optional[str] = None) -> Module:
+    """Parse a source file and return the requested module.
+
+    The file is scanned through a memory map and scanning stops at the
+    ``endmodule`` of the selected module, so memory use does not grow with
+    the file size. Raises ValueError if no matching module is found.
+    """
+    with _mapped(path) as buf:
+        tokens = tokenize(buf)
+        try:
+            return find_module(tokens, top)
+        finally:
+            # Release match objects that still reference the map
+            tokens.close()
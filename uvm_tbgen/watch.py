@@ -0,0 +1,195 @@
+"""Regenerate testbenches when DUT files or templates change.
+
+:func:`watch` waits for changes to the watched DUT files and to the
+template directory and reruns the affected generators. Change detection
+uses inotify on Linux (through ``ctypes``, no extra dependency) and falls
+back to polling file stats elsewhere. Bursts of events, such as an editor
+writing a file in several steps, are coalesced until the files have been
+quiet for ``debounce`` seconds.
+
+Only outputs whose inputs changed are rendered again (see
+:meth:`TBGenerator.generate`): an edited template re-renders its own
+component, and a DUT edit that keeps the ports and parameters only
+refreshes the copied DUT.
+"""
+import ctypes
+import ctypes.util
+import os
+from pathlib import Path
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .generator import GenerationSummary, TBGenerator
+
+# inotify(7) flags
+_IN_MODIFY = 0x002
+_IN_ATTRIB = 0x004
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (
+    _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO
+    | _IN_CREATE | _IN_DELETE
+)
+_EVENT = struct.Struct("iIII")
+
+
+class _Inotify:
+    """Directory watches through the Linux inotify API."""
+
+    def __init__(self, dirs: Iterable[Path]):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: Dict[int, Path] = {}
+        for d in dirs:
+            wd = libc.inotify_add_watch(self._fd, os.fsencode(str(d)), _WATCH_MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                os.close(self._fd)
+                raise OSError(err, f"cannot watch {d}: {os.strerror(err)}")
+            self._dirs[wd] = d
+
+    def wait(self, timeout: float) -> Set[Path]:
+        """Return the paths changed within ``timeout`` seconds (empty if none)."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed = set()
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, _, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if wd in self._dirs and name:
+                    changed.add(self._dirs[wd] / os.fsdecode(name))
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class _Poller:
+    """Portable fallback that compares file stats every ``interval`` seconds."""
+
+    def __init__(self, dirs: Iterable[Path], interval: float = 0.5):
+        self._dirs = list(dirs)
+        self.interval = interval
+        self._stats = self._scan()
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        stats = {}
+        for d in self._dirs:
+            try:
+                entries = list(os.scandir(d))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                stats[Path(entry.path)] = (st.st_mtime_ns, st.st_size)
+        return stats
+
+    def wait(self, timeout: float) -> Set[Path]:
+        deadline = time.monotonic() + timeout
+        while True:
+            stats = self._scan()
+            changed = {p for p in stats.keys() | self._stats.keys()
+                       if stats.get(p) != self._stats.get(p)}
+            self._stats = stats
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.interval, remaining))
+
+    def close(self) -> None:
+        pass
+
+
+def make_watcher(dirs: Iterable[Path], poll: bool = False, interval: float = 0.5):
+    """Return an inotify watcher for ``dirs``, or a poller if unavailable or ``poll``."""
+    dirs = list(dict.fromkeys(Path(d).resolve() for d in dirs))
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return _Inotify(dirs)
+        except (OSError, AttributeError):
+            pass
+    return _Poller(dirs, interval)
+
+
+def _affected(
+    generators: Sequence[TBGenerator], changed: Set[Path]
+) -> List[TBGenerator]:
+    """Return the generators whose DUT or templates are among ``changed``."""
+    affected = []
+    for gen in generators:
+        template_dir = Path(gen.template_dir).resolve()
+        dut = Path(gen.dut_path).resolve()
+        if any(p == dut or (p.parent == template_dir and p.suffix == ".j2") for p in changed):
+            affected.append(gen)
+    return affected
+
+
+def watch(
+    generators: Sequence[TBGenerator], debounce: float = 0.2, poll: bool = False,
+    interval: float = 0.5, stop: Optional[threading.Event] = None,
+    on_generate: Optional[Callable[[TBGenerator, GenerationSummary], None]] = None,
+    log: Callable[[str], None] = lambda message: print(f"[uvm_tbgen] {message}", flush=True),
+) -> None:
+    """Generate once, then regenerate whenever a DUT or template changes.
+
+    Runs until ``stop`` is set (or forever). ``on_generate`` is called
+    after every generation. Errors, e.g. a DUT saved half-way through an
+    edit, are logged and the watch continues.
+    """
+    stop = stop or threading.Event()
+
+    def run(gens: Sequence[TBGenerator]) -> None:
+        for gen in gens:
+            try:
+                summary = gen.generate()
+            except Exception as e:
+                log(f"Error: {gen.dut_path}: {e}")
+                continue
+            if on_generate is not None:
+                on_generate(gen, summary)
+
+    dirs = [Path(g.dut_path).resolve().parent for g in generators]
+    dirs += [Path(g.template_dir) for g in generators]
+    watcher = make_watcher(dirs, poll, interval)
+    try:
+        run(generators)
+        log(f"Watching {len(generators)} DUT(s) and their templates for changes")
+        while not stop.is_set():
+            changed = watcher.wait(interval)
+            if not changed:
+                continue
+            # Wait for the burst of events to settle
+            while True:
+                more = watcher.wait(debounce)
+                if not more:
+                    break
+                changed |= more
+            affected = _affected(generators, {p.resolve() for p in changed})
+            if affected:
+                names = ", ".join(sorted({p.name for p in changed}))
+                log(f"Change detected: {names}")
+                run(affected)
+    finally:
+        watcher.close()